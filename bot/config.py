@@ -30,7 +30,13 @@ class Settings(BaseSettings):
     url_telegraph_deposit: str = ""
     url_telegraph_support: str = ""
     url_telegraph_faq: str = ""
-    webapp_base_url: str = ""  # e.g. https://yourdomain.com for Flet WebApp (?user_id= appended)
+    webapp_base_url: str = ""  # e.g. https://yourdomain.com: WebApp page opened by the "View statistics" button
+    webapp_host: str = "127.0.0.1"  # embedded stats API (GET /api/stats), put behind the HTTPS reverse proxy
+    webapp_port: int = 0  # 0 = API disabled
+    metrics_token: str = ""  # bearer token for GET /api/metrics; empty = endpoint disabled
+    idempotency_backend: str = "memory"  # memory | sqlite (shared across restarts and workers)
+    idempotency_ttl_seconds: int = 86400
+    idempotency_max_keys: int = 50000
 
     @field_validator("admin_ids", mode="before")
     @classmethod
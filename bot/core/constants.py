@@ -13,10 +13,25 @@ TEXTS_DIR = TEMPLATES_DIR / "texts"
 MAX_DUMPS_KEEP = 3
 GAME_HISTORY_DAYS = 30
 PAYMENT_REQUESTS_DAYS = 14
+# Per-player rollup rows (unique players, leaderboards); hourly/daily aggregates are never purged
+ROLLUP_PLAYERS_DAYS = 35
+# Stats -> Game history: games per page
+HISTORY_PAGE_SIZE = 10
+
+# History export: Telegram Bot API upload limit for documents
+EXPORT_MAX_BYTES = 50 * 1024 * 1024
 
 # Demo restore: next restore allowed after this many seconds
 DEMO_RESTORE_INTERVAL_SECONDS = 24 * 3600
 
+# Auto-play: round count presets and stop-loss / take-profit presets (multiples of the bet, 0 = no limit)
+AUTOPLAY_ROUNDS = (10, 25, 50)
+AUTOPLAY_LIMIT_MULTIPLIERS = (0, 5, 10)
+
+# Game exit cleanup: Telegram only lets bots delete messages younger than 48h, older entries are useless
+EXIT_CLEANUP_TTL_SECONDS = 48 * 3600
+EXIT_CLEANUP_MAX_ENTRIES = 50000
+
 # Locale and display
 DEFAULT_LANGUAGE = "en"
 CURRENCY = "₽"
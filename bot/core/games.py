@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import Dict, List, Optional, Union
 
-# Game id (1-8) -> config. Coefficients can be overridden from DB (settings).
+# Game id (1-8) -> config. Seed data for the games_catalog table; at runtime read bot.services.catalog.get_catalog().
 # Values: name (str), outcomes (list[str]), ratios (list[float]), win_outcome_value, all_outcomes_num (int).
 GAME_LIST: Dict[int, Dict[str, Union[str, List[str], List[float], Optional[List], int]]] = {
     1: {
@@ -6,8 +6,10 @@ import asyncio
 import os
 import sqlite3
 import sys
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Iterator, Optional
 
 import aiosqlite
 
@@ -17,6 +19,26 @@ from bot.utils.logger import get_logger
 log = get_logger(__name__)
 
 _connection: Optional[aiosqlite.Connection] = None
+# Read-only connection that get_connection() returns instead, inside use_connection() (current task only)
+_override: ContextVar[Optional[aiosqlite.Connection]] = ContextVar("db_connection_override", default=None)
+
+WAL_SIZE_LIMIT_BYTES = 64 * 1024 * 1024
+
+# Migrations after 001_initial (which creates schema_version itself): (version, file)
+_MIGRATIONS = [
+    (2, "002_user_contact.sql"),
+    (3, "003_idempotency.sql"),
+    (4, "004_games_catalog.sql"),
+    (5, "005_games_rollups.sql"),
+    (6, "006_user_stats_counters.sql"),
+    (7, "007_rollup_biggest_win.sql"),
+    (8, "008_games_history_index.sql"),
+    (9, "009_active_users_hll.sql"),
+    (10, "010_analytics_cache.sql"),
+    (11, "011_scheduler_jobs.sql"),
+    (12, "012_balance_ledger.sql"),
+    (13, "013_scheduler_failures.sql"),
+]
 
 
 def _get_database_path(db_path: Optional[str] = None) -> str:
@@ -35,15 +57,44 @@ def _get_database_path(db_path: Optional[str] = None) -> str:
 
 
 async def get_connection() -> aiosqlite.Connection:
-    """Return the global DB connection. Call init_db() first."""
+    """Return the global DB connection (or the use_connection() override). Call init_db() first."""
+    override = _override.get()
+    if override is not None:
+        return override
     if _connection is None:
         raise RuntimeError("Database not initialized. Call init_db() first.")
     return _connection
 
 
+@contextmanager
+def use_connection(conn: aiosqlite.Connection) -> Iterator[None]:
+    """Route the queries of the current task to conn (e.g. the read replica); only reads belong in this block."""
+    token = _override.set(conn)
+    try:
+        yield
+    finally:
+        _override.reset(token)
+
+
+@asynccontextmanager
+async def dedicated_connection(db_path: Optional[str] = None) -> AsyncIterator[aiosqlite.Connection]:
+    """
+    Own connection for background jobs with multi-statement transactions (purge, archive): their commits and
+    rollbacks never mix with statements that handlers have pending on the shared connection.
+    """
+    conn = await aiosqlite.connect(_get_database_path(db_path), timeout=30)
+    conn.row_factory = aiosqlite.Row
+    try:
+        await conn.execute("PRAGMA foreign_keys = ON")
+        await conn.execute("PRAGMA wal_autocheckpoint = 0")
+        yield conn
+    finally:
+        await conn.close()
+
+
 async def init_db(db_path: Optional[str] = None) -> None:
     """
-    Open database, run migrations (001_initial.sql), insert default settings if missing.
+    Open database, run migrations (001_initial.sql, then _MIGRATIONS), insert default settings if missing.
     Sets global _connection.
     """
     global _connection
@@ -63,15 +114,35 @@ async def init_db(db_path: Optional[str] = None) -> None:
 
     migrations_dir = BOT_DIR / "database" / "migrations"
     version = await _get_schema_version()
+    if version < 1:
+        # Only takes effect on an empty file (before the WAL switch writes the header); older DBs are converted by the vacuum job
+        await _connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    # WAL: readers (exports, backups, analytics) do not block the bot's writes; checkpoints run from the scheduler
+    await _connection.execute("PRAGMA journal_mode = WAL")
+    # Checkpoints belong to the WAL archiver only (bot/utils/wal_archive.py): it copies the frames first, and
+    # commits skip the checkpoint work. The size limit shrinks the WAL file back whenever the log restarts.
+    await _connection.execute("PRAGMA wal_autocheckpoint = 0")
+    await _connection.execute(f"PRAGMA journal_size_limit = {WAL_SIZE_LIMIT_BYTES}")
     if version < 1:
         await _run_initial_sql(migrations_dir / "001_initial.sql")
         await _insert_default_settings()
         log.info("Applied migration 001_initial, inserted default settings")
-    if version < 2:
-        await _run_initial_sql(migrations_dir / "002_user_contact.sql")
-        await _connection.execute("INSERT INTO schema_version (version, applied_at) VALUES (2, datetime('now'))")
-        await _connection.commit()
-        log.info("Applied migration 002_user_contact")
+    for mig_version, mig_file in _MIGRATIONS:
+        if version < mig_version:
+            await _run_initial_sql(migrations_dir / mig_file)
+            await _connection.execute("INSERT INTO schema_version (version, applied_at) VALUES (?, datetime('now'))", (mig_version,))
+            await _connection.commit()
+            log.info("Applied migration {}", mig_file.removesuffix(".sql"))
+    await _run_pending_backfills()
+
+
+async def _run_pending_backfills() -> None:
+    """Data backfills registered by migrations in data_backfills (chunked, resumable)."""
+    from bot.database.queries.user_stats import backfill_user_counters
+
+    processed = await backfill_user_counters()
+    if processed:
+        log.info("Backfilled user_stats counters for {} users", processed)
 
 
 async def _get_schema_version() -> int:
@@ -86,10 +157,8 @@ async def _get_schema_version() -> int:
 
 
 async def _run_initial_sql(file_path: Path) -> None:
-    sql = file_path.read_text(encoding="utf-8")
-    statements = [s.strip() for s in sql.split(";") if s.strip()]
-    for stmt in statements:
-        await _connection.execute(stmt)
+    # executescript parses the file itself (comments and string literals may contain ';')
+    await _connection.executescript(file_path.read_text(encoding="utf-8"))
     await _connection.commit()
 
 
@@ -0,0 +1,8 @@
+-- Idempotency keys for double-tap protection (shared across restarts and worker processes)
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    chat_id INTEGER NOT NULL,
+    message_id INTEGER NOT NULL,
+    expires_at INTEGER NOT NULL,
+    PRIMARY KEY (chat_id, message_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires ON idempotency_keys(expires_at);
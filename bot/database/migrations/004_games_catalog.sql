@@ -0,0 +1,19 @@
+-- Game catalog (seeded from bot.core.games.GAME_LIST on first start). JSON columns: outcome_keys, ratios, win_outcome_value.
+CREATE TABLE IF NOT EXISTS games_catalog (
+    game_id INTEGER PRIMARY KEY,
+    emoji_type TEXT NOT NULL,
+    image_screen TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    outcome_keys TEXT NOT NULL,
+    ratios TEXT NOT NULL,
+    win_outcome_value TEXT NOT NULL,
+    all_outcomes_num INTEGER NOT NULL,
+    is_active INTEGER NOT NULL DEFAULT 1,
+    updated_at TEXT NOT NULL
+);
+-- Single row, bumped on every catalog edit so other workers reload their snapshot
+CREATE TABLE IF NOT EXISTS games_catalog_version (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO games_catalog_version (id, version) VALUES (1, 0);
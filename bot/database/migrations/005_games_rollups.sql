@@ -0,0 +1,59 @@
+-- Game rollups for admin stats, maintained in the same transaction as the games insert.
+-- Not touched by the GAME_HISTORY_DAYS purge of games. bucket: 'YYYY-MM-DDTHH' (hourly) or 'YYYY-MM-DD' (daily), UTC.
+CREATE TABLE IF NOT EXISTS games_rollup_hourly (
+    bucket TEXT NOT NULL,
+    game_id INTEGER NOT NULL,
+    is_demo INTEGER NOT NULL,
+    rounds INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    turnover INTEGER NOT NULL DEFAULT 0,
+    payouts INTEGER NOT NULL DEFAULT 0,
+    players INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (bucket, game_id, is_demo)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS games_rollup_daily (
+    bucket TEXT NOT NULL,
+    game_id INTEGER NOT NULL,
+    is_demo INTEGER NOT NULL,
+    rounds INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    turnover INTEGER NOT NULL DEFAULT 0,
+    payouts INTEGER NOT NULL DEFAULT 0,
+    players INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (bucket, game_id, is_demo)
+) WITHOUT ROWID;
+-- Per-player daily sums: unique-player counting for games_rollup_daily and leaderboard rebuilds
+CREATE TABLE IF NOT EXISTS games_rollup_players (
+    day TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    game_id INTEGER NOT NULL,
+    is_demo INTEGER NOT NULL,
+    rounds INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    turnover INTEGER NOT NULL DEFAULT 0,
+    payouts INTEGER NOT NULL DEFAULT 0,
+    best_multiplier REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, game_id, is_demo, user_id)
+) WITHOUT ROWID;
+-- Hourly membership for unique players per hour (pruned together with games_rollup_players)
+CREATE TABLE IF NOT EXISTS games_rollup_hourly_players (
+    bucket TEXT NOT NULL,
+    game_id INTEGER NOT NULL,
+    is_demo INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    PRIMARY KEY (bucket, game_id, is_demo, user_id)
+) WITHOUT ROWID;
+
+-- Backfill from the games still in the table
+INSERT OR IGNORE INTO games_rollup_players (day, user_id, game_id, is_demo, rounds, wins, turnover, payouts, best_multiplier)
+SELECT substr(played_at, 1, 10), user_id, game_id, is_demo, COUNT(*), SUM(is_win), SUM(bet_amount), SUM(win_amount),
+       COALESCE(MAX(CASE WHEN is_win = 1 AND bet_amount > 0 THEN CAST(win_amount AS REAL) / bet_amount END), 0)
+FROM games GROUP BY 1, 2, 3, 4;
+INSERT OR IGNORE INTO games_rollup_hourly_players (bucket, game_id, is_demo, user_id)
+SELECT DISTINCT substr(played_at, 1, 13), game_id, is_demo, user_id FROM games;
+INSERT OR IGNORE INTO games_rollup_daily (bucket, game_id, is_demo, rounds, wins, turnover, payouts, players)
+SELECT substr(played_at, 1, 10), game_id, is_demo, COUNT(*), SUM(is_win), SUM(bet_amount), SUM(win_amount), COUNT(DISTINCT user_id)
+FROM games GROUP BY 1, 2, 3;
+INSERT OR IGNORE INTO games_rollup_hourly (bucket, game_id, is_demo, rounds, wins, turnover, payouts, players)
+SELECT substr(played_at, 1, 13), game_id, is_demo, COUNT(*), SUM(is_win), SUM(bet_amount), SUM(win_amount), COUNT(DISTINCT user_id)
+FROM games GROUP BY 1, 2, 3;
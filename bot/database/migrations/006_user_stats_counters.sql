@@ -0,0 +1,31 @@
+-- Incremental user counters, maintained in the same transaction as the games insert.
+-- current_streak: +N after N wins in a row, -N after N losses in a row.
+ALTER TABLE user_stats ADD COLUMN total_bet INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE user_stats ADD COLUMN biggest_win INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE user_stats ADD COLUMN current_streak INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE user_stats ADD COLUMN longest_win_streak INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE user_stats ADD COLUMN longest_loss_streak INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE user_stats ADD COLUMN real_games INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE user_stats ADD COLUMN real_bet INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE user_stats ADD COLUMN real_won INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE user_stats ADD COLUMN demo_games INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE user_stats ADD COLUMN demo_bet INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE user_stats ADD COLUMN demo_won INTEGER NOT NULL DEFAULT 0;
+
+CREATE TABLE IF NOT EXISTS user_game_stats (
+    user_id INTEGER NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+    game_id INTEGER NOT NULL,
+    is_demo INTEGER NOT NULL,
+    games INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    bet INTEGER NOT NULL DEFAULT 0,
+    won INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, game_id, is_demo)
+) WITHOUT ROWID;
+
+-- Resumable backfill cursor: init_db fills the new counters from games in user_id chunks and deletes the row when done
+CREATE TABLE IF NOT EXISTS data_backfills (
+    name TEXT PRIMARY KEY,
+    last_key INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO data_backfills (name, last_key) VALUES ('user_stats_counters', 0);
@@ -0,0 +1,8 @@
+-- Biggest single win per player/day/game/mode: leaderboards are rebuilt from games_rollup_players at startup
+ALTER TABLE games_rollup_players ADD COLUMN biggest_win INTEGER NOT NULL DEFAULT 0;
+UPDATE games_rollup_players SET biggest_win = COALESCE((
+    SELECT MAX(g.win_amount) FROM games g
+    WHERE g.user_id = games_rollup_players.user_id
+      AND g.played_at >= games_rollup_players.day AND g.played_at < games_rollup_players.day || 'U'
+      AND g.game_id = games_rollup_players.game_id AND g.is_demo = games_rollup_players.is_demo
+), 0);
@@ -0,0 +1,2 @@
+-- Keyset pagination of a user's history on (user_id, id): covers every column the history screen shows
+CREATE INDEX IF NOT EXISTS idx_games_user_id_history ON games(user_id, id, game_type, game_id, bet_amount, outcome, is_win, win_amount, is_demo, played_at);
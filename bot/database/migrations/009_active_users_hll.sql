@@ -0,0 +1,6 @@
+-- Daily unique active users as a HyperLogLog sketch (bot/utils/hll.py): DAU, merged for WAU / MAU
+CREATE TABLE IF NOT EXISTS active_users_hll (
+    day TEXT PRIMARY KEY,
+    sketch BLOB NOT NULL,
+    updated_at TEXT NOT NULL
+);
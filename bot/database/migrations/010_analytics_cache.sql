@@ -0,0 +1,7 @@
+-- Results of the analytics job (bot/services/analytics.py), computed off a snapshot file. payload: JSON
+CREATE TABLE IF NOT EXISTS analytics_cache (
+    name TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    snapshot_at TEXT NOT NULL,
+    computed_at TEXT NOT NULL
+);
@@ -0,0 +1,10 @@
+-- Maintenance scheduler (bot/services/scheduler.py): last run per job and a lease so one worker runs it at a time
+CREATE TABLE IF NOT EXISTS scheduler_jobs (
+    name TEXT PRIMARY KEY,
+    last_run_at TEXT,
+    last_status TEXT,
+    last_error TEXT,
+    last_duration REAL,
+    lease_owner TEXT,
+    lease_until TEXT
+);
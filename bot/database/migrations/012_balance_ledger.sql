@@ -0,0 +1,17 @@
+-- Balance movements summed per user, account (real/demo) and reason (bet, win, deposit, ...). Written in the same
+-- transaction as every user_balances update; the integrity monitor checks that each account's sum equals the balance.
+CREATE TABLE IF NOT EXISTS balance_ledger (
+    user_id INTEGER NOT NULL,
+    account TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    amount INTEGER NOT NULL DEFAULT 0,
+    movements INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (user_id, account, reason)
+) WITHOUT ROWID;
+
+-- Balances from before the ledger existed
+INSERT OR IGNORE INTO balance_ledger (user_id, account, reason, amount, movements, updated_at)
+SELECT user_id, 'real', 'opening', real_balance, 0, strftime('%Y-%m-%dT%H:%M:%SZ', 'now') FROM user_balances WHERE real_balance != 0;
+INSERT OR IGNORE INTO balance_ledger (user_id, account, reason, amount, movements, updated_at)
+SELECT user_id, 'demo', 'opening', demo_balance, 0, strftime('%Y-%m-%dT%H:%M:%SZ', 'now') FROM user_balances WHERE demo_balance != 0;
@@ -0,0 +1,3 @@
+-- Failed runs no longer count as runs: last_run_at is the last success, failures / retry_at drive the retry backoff
+ALTER TABLE scheduler_jobs ADD COLUMN failures INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE scheduler_jobs ADD COLUMN retry_at TEXT;
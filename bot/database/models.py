@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -111,3 +111,41 @@ class UserStats(BaseModel):
     total_won: int = 0
     total_lost: int = 0
     last_updated: str
+    total_bet: int = 0
+    biggest_win: int = 0
+    current_streak: int = 0
+    longest_win_streak: int = 0
+    longest_loss_streak: int = 0
+    real_games: int = 0
+    real_bet: int = 0
+    real_won: int = 0
+    demo_games: int = 0
+    demo_bet: int = 0
+    demo_won: int = 0
+
+
+class UserGameStats(BaseModel):
+    """Row from user_game_stats (per user, game and mode)."""
+
+    user_id: int
+    game_id: int
+    is_demo: bool
+    games: int = 0
+    wins: int = 0
+    bet: int = 0
+    won: int = 0
+
+
+class GameCatalogEntry(BaseModel):
+    """Row from games_catalog (JSON columns decoded)."""
+
+    game_id: int
+    emoji_type: str
+    image_screen: str
+    name_key: str
+    outcome_keys: List[str]
+    ratios: List[float]
+    win_outcome_value: List[Optional[List[int]]]
+    all_outcomes_num: int
+    is_active: int = 1
+    updated_at: str
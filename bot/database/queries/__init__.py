@@ -1,11 +1,12 @@
 """Database queries by entity."""
 
 from bot.database.queries.demo_accounts import get_demo_account, upsert_demo_reset
-from bot.database.queries.games import get_games_count, get_last_games_by_user, save_game
+from bot.database.queries.games import get_games_count, get_last_games_by_user, save_game, save_games
+from bot.database.queries.games_catalog import get_catalog_entries, get_catalog_version, set_outcome_ratio
 from bot.database.queries.payments import create_payment_request, get_payment_request, get_pending_requests, get_requests_by_user, set_payment_status
 from bot.database.queries.referrals import add_referral, count_referrals_by_referrer, get_referrer_by_user, referral_exists, set_bonus_credited
 from bot.database.queries.settings import get_settings, update_settings
-from bot.database.queries.user_stats import get_or_create_stats, update_stats_after_game, update_stats_after_payment
+from bot.database.queries.user_stats import get_or_create_stats, get_user_game_stats, update_stats_after_game, update_stats_after_payment, update_stats_after_series
 from bot.database.queries.users import create_user, get_language, get_user, set_block, set_fast_mode, set_notifications, update_balance, update_user
 
 __all__ = [
@@ -20,8 +21,12 @@ __all__ = [
     "get_settings",
     "update_settings",
     "save_game",
+    "save_games",
     "get_last_games_by_user",
     "get_games_count",
+    "get_catalog_entries",
+    "get_catalog_version",
+    "set_outcome_ratio",
     "create_payment_request",
     "get_pending_requests",
     "get_requests_by_user",
@@ -35,6 +40,8 @@ __all__ = [
     "get_demo_account",
     "upsert_demo_reset",
     "get_or_create_stats",
+    "get_user_game_stats",
     "update_stats_after_game",
     "update_stats_after_payment",
+    "update_stats_after_series",
 ]
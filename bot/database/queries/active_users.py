@@ -0,0 +1,37 @@
+"""active_users_hll queries: one HyperLogLog sketch per UTC day."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from bot.database.connection import get_connection
+
+
+async def get_sketch(day: str) -> Optional[bytes]:
+    """Stored sketch of one day, or None."""
+    conn = await get_connection()
+    cursor = await conn.execute("SELECT sketch FROM active_users_hll WHERE day = ?", (day,))
+    row = await cursor.fetchone()
+    await cursor.close()
+    return bytes(row[0]) if row else None
+
+
+async def get_sketches(since_day: str) -> List[Tuple[str, bytes]]:
+    """(day, sketch) for days >= since_day."""
+    conn = await get_connection()
+    cursor = await conn.execute("SELECT day, sketch FROM active_users_hll WHERE day >= ? ORDER BY day", (since_day,))
+    rows = await cursor.fetchall()
+    await cursor.close()
+    return [(r[0], bytes(r[1])) for r in rows]
+
+
+async def save_sketch(day: str, sketch: bytes) -> None:
+    """Insert or replace the sketch of one day."""
+    conn = await get_connection()
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    await conn.execute(
+        "INSERT INTO active_users_hll (day, sketch, updated_at) VALUES (?, ?, ?) ON CONFLICT(day) DO UPDATE SET sketch = excluded.sketch, updated_at = excluded.updated_at",
+        (day, sketch, now),
+    )
+    await conn.commit()
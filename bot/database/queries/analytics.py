@@ -0,0 +1,31 @@
+"""analytics_cache queries: JSON results of the analytics job by name."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+from typing import Any, Optional, Tuple
+
+from bot.database.connection import get_connection
+
+
+async def save_result(name: str, payload: Any, snapshot_at: str) -> None:
+    conn = await get_connection()
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    await conn.execute(
+        """
+        INSERT INTO analytics_cache (name, payload, snapshot_at, computed_at) VALUES (?, ?, ?, ?)
+        ON CONFLICT(name) DO UPDATE SET payload = excluded.payload, snapshot_at = excluded.snapshot_at, computed_at = excluded.computed_at
+        """,
+        (name, json.dumps(payload, ensure_ascii=False), snapshot_at, now),
+    )
+    await conn.commit()
+
+
+async def get_result(name: str) -> Optional[Tuple[Any, str]]:
+    """(payload, snapshot_at) or None if the job has not run yet."""
+    conn = await get_connection()
+    cursor = await conn.execute("SELECT payload, snapshot_at FROM analytics_cache WHERE name = ?", (name,))
+    row = await cursor.fetchone()
+    await cursor.close()
+    return (json.loads(row[0]), row[1]) if row else None
@@ -2,10 +2,15 @@
 
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional, Sequence, Tuple
+
+import aiosqlite
 
 from bot.database.connection import get_connection
 from bot.database.models import Game
+from bot.database.queries.rollups import apply_game_rollups
+from bot.database.queries.user_stats import apply_series_stats, apply_user_counters
+from bot.database.queries.users import apply_balance_update
 
 
 async def save_game(
@@ -19,7 +24,7 @@ async def save_game(
     is_demo: bool,
     played_at: str,
 ) -> None:
-    """Insert one game record."""
+    """Insert one game record and add it to the rollups and user counters (one commit)."""
     conn = await get_connection()
     await conn.execute(
         """
@@ -38,36 +43,103 @@ async def save_game(
             played_at,
         ),
     )
+    row = (user_id, game_type, game_id, bet_amount, outcome, is_win, win_amount, is_demo, played_at)
+    await apply_game_rollups(conn, [row])
+    await apply_user_counters(conn, [row])
     await conn.commit()
 
 
-async def get_last_games_by_user(user_id: int, limit: int = 10) -> List[Game]:
-    """Return last `limit` games for user (by played_at DESC)."""
+async def save_games(rows: Sequence[Tuple[int, str, int, int, str, bool, int, bool, str]]) -> None:
+    """Insert many game records, their rollups and user counters with one commit (auto-play series).
+    Row: (user_id, game_type, game_id, bet_amount, outcome, is_win, win_amount, is_demo, played_at)."""
+    if not rows:
+        return
     conn = await get_connection()
-    cursor = await conn.execute(
+    await _insert_games(conn, rows)
+    await conn.commit()
+
+
+async def _insert_games(conn: aiosqlite.Connection, rows: Sequence[tuple]) -> None:
+    await conn.executemany(
         """
-        SELECT id, user_id, game_type, game_id, bet_amount, outcome, is_win, win_amount, is_demo, played_at
-        FROM games WHERE user_id = ? ORDER BY played_at DESC LIMIT ?
+        INSERT INTO games (user_id, game_type, game_id, bet_amount, outcome, is_win, win_amount, is_demo, played_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
         """,
-        (user_id, limit),
+        [(r[0], r[1], r[2], r[3], r[4], 1 if r[5] else 0, r[6], 1 if r[7] else 0, r[8]) for r in rows],
     )
+    await apply_game_rollups(conn, rows)
+    await apply_user_counters(conn, rows)
+
+
+async def settle_series(user_id: int, is_demo: bool, reserve: int, payout: int, rows: Sequence[tuple], won: int, lost: int) -> bool:
+    """
+    Settle an auto-play series in one transaction: debit the reserve (ledger reason bet), credit payout (winnings
+    plus unplayed stakes, reason win), insert the games with their rollups and counters, update user_stats.
+    Nothing is written (False) if the balance does not cover the reserve; any error rolls the whole series back.
+    """
+    conn = await get_connection()
+    column = "demo_balance" if is_demo else "real_balance"
+    try:
+        cursor = await conn.execute(f"SELECT {column} FROM user_balances WHERE user_id = ?", (user_id,))
+        row = await cursor.fetchone()
+        await cursor.close()
+        if row is None or row[0] < reserve:
+            return False
+        await apply_balance_update(conn, user_id, reason="bet", **{column: row[0] - reserve})
+        if payout:
+            await apply_balance_update(conn, user_id, reason="win", **{column: row[0] - reserve + payout})
+        await _insert_games(conn, rows)
+        wins = sum(1 for r in rows if r[5])
+        await apply_series_stats(conn, user_id, wins, len(rows) - wins, won, lost)
+    except Exception:
+        await conn.rollback()
+        raise
+    await conn.commit()
+    return True
+
+
+async def get_last_games_by_user(user_id: int, limit: int = 10) -> List[Game]:
+    """Return last `limit` games for user (newest first by id; played_at may repeat within a second)."""
+    games, _ = await get_games_page(user_id, limit=limit)
+    return games
+
+
+async def get_games_page(user_id: int, limit: int = 10, before_id: Optional[int] = None, after_id: Optional[int] = None) -> Tuple[List[Game], bool]:
+    """
+    One page of a user's history, newest first, by keyset on (user_id, id) (idx_games_user_id_history, no OFFSET).
+    before_id: page of older games (id < before_id); after_id: page of newer games (id > after_id); neither: newest page.
+    Returns (games, more) where more tells whether another page exists in the requested direction.
+    """
+    conn = await get_connection()
+    columns = "id, user_id, game_type, game_id, bet_amount, outcome, is_win, win_amount, is_demo, played_at"
+    if after_id is not None:
+        cursor = await conn.execute(f"SELECT {columns} FROM games WHERE user_id = ? AND id > ? ORDER BY id ASC LIMIT ?", (user_id, after_id, limit + 1))
+    elif before_id is not None:
+        cursor = await conn.execute(f"SELECT {columns} FROM games WHERE user_id = ? AND id < ? ORDER BY id DESC LIMIT ?", (user_id, before_id, limit + 1))
+    else:
+        cursor = await conn.execute(f"SELECT {columns} FROM games WHERE user_id = ? ORDER BY id DESC LIMIT ?", (user_id, limit + 1))
     rows = await cursor.fetchall()
     await cursor.close()
-    return [
-        Game(
-            id=r[0],
-            user_id=r[1],
-            game_type=r[2],
-            game_id=r[3],
-            bet_amount=r[4],
-            outcome=r[5],
-            is_win=bool(r[6]),
-            win_amount=r[7],
-            is_demo=bool(r[8]),
-            played_at=r[9],
-        )
-        for r in rows
-    ]
+    more = len(rows) > limit
+    rows = rows[:limit]
+    if after_id is not None:
+        rows.reverse()
+    return [_row_to_game(r) for r in rows], more
+
+
+def _row_to_game(r: tuple) -> Game:
+    return Game(
+        id=r[0],
+        user_id=r[1],
+        game_type=r[2],
+        game_id=r[3],
+        bet_amount=r[4],
+        outcome=r[5],
+        is_win=bool(r[6]),
+        win_amount=r[7],
+        is_demo=bool(r[8]),
+        played_at=r[9],
+    )
 
 
 async def get_games_count(user_id: int | None = None) -> int:
@@ -80,15 +152,3 @@ async def get_games_count(user_id: int | None = None) -> int:
     row = await cursor.fetchone()
     await cursor.close()
     return int(row[0]) if row else 0
-
-
-async def get_total_bet_by_user(user_id: int) -> int:
-    """Get sum of all bet amounts for a user."""
-    conn = await get_connection()
-    cursor = await conn.execute(
-        "SELECT COALESCE(SUM(bet_amount), 0) FROM games WHERE user_id = ?",
-        (user_id,),
-    )
-    row = await cursor.fetchone()
-    await cursor.close()
-    return int(row[0]) if row else 0
@@ -0,0 +1,98 @@
+"""games_catalog and games_catalog_version queries."""
+
+from __future__ import annotations
+
+import json
+from typing import Iterable, List
+
+from bot.database.connection import get_connection
+from bot.database.models import GameCatalogEntry
+
+
+async def get_catalog_version() -> int:
+    """Return the catalog version counter (single-row PK read)."""
+    conn = await get_connection()
+    cursor = await conn.execute("SELECT version FROM games_catalog_version WHERE id = 1")
+    row = await cursor.fetchone()
+    await cursor.close()
+    return int(row[0]) if row else 0
+
+
+async def get_catalog_entries() -> List[GameCatalogEntry]:
+    """Return all catalog rows ordered by game_id."""
+    conn = await get_connection()
+    cursor = await conn.execute(
+        """
+        SELECT game_id, emoji_type, image_screen, name_key, outcome_keys, ratios, win_outcome_value, all_outcomes_num, is_active, updated_at
+        FROM games_catalog ORDER BY game_id
+        """
+    )
+    rows = await cursor.fetchall()
+    await cursor.close()
+    return [
+        GameCatalogEntry(
+            game_id=r[0],
+            emoji_type=r[1],
+            image_screen=r[2],
+            name_key=r[3],
+            outcome_keys=json.loads(r[4]),
+            ratios=json.loads(r[5]),
+            win_outcome_value=json.loads(r[6]),
+            all_outcomes_num=r[7],
+            is_active=r[8],
+            updated_at=r[9],
+        )
+        for r in rows
+    ]
+
+
+async def seed_catalog(entries: Iterable[GameCatalogEntry]) -> int:
+    """Insert entries whose game_id is not in the table yet (existing rows keep admin edits). Returns rows inserted."""
+    conn = await get_connection()
+    inserted = 0
+    for e in entries:
+        cursor = await conn.execute(
+            """
+            INSERT OR IGNORE INTO games_catalog (
+                game_id, emoji_type, image_screen, name_key, outcome_keys, ratios,
+                win_outcome_value, all_outcomes_num, is_active, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
+            """,
+            (
+                e.game_id,
+                e.emoji_type,
+                e.image_screen,
+                e.name_key,
+                json.dumps(e.outcome_keys),
+                json.dumps(e.ratios),
+                json.dumps(e.win_outcome_value),
+                e.all_outcomes_num,
+                e.is_active,
+            ),
+        )
+        inserted += cursor.rowcount
+        await cursor.close()
+    if inserted:
+        await conn.execute("UPDATE games_catalog_version SET version = version + 1 WHERE id = 1")
+    await conn.commit()
+    return inserted
+
+
+async def set_outcome_ratio(game_id: int, outcome_index: int, ratio: float) -> int:
+    """Set ratios[outcome_index] of a game and bump the version in one transaction. Returns the new version (0 if no such game/outcome)."""
+    conn = await get_connection()
+    cursor = await conn.execute(
+        """
+        UPDATE games_catalog SET ratios = json_set(ratios, '$[' || ? || ']', ?), updated_at = datetime('now')
+        WHERE game_id = ? AND ? BETWEEN 0 AND json_array_length(ratios) - 1
+        """,
+        (outcome_index, ratio, game_id, outcome_index),
+    )
+    changed = cursor.rowcount
+    await cursor.close()
+    if not changed:
+        await conn.rollback()
+        return 0
+    await conn.execute("UPDATE games_catalog_version SET version = version + 1 WHERE id = 1")
+    await conn.commit()
+    return await get_catalog_version()
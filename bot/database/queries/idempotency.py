@@ -0,0 +1,42 @@
+"""Idempotency keys table queries (double-tap protection)."""
+
+from __future__ import annotations
+
+from bot.database.connection import get_connection
+
+
+async def claim_key(chat_id: int, message_id: int, now: int, expires_at: int) -> bool:
+    """
+    Atomically claim (chat_id, message_id). Returns True if the key was free or its previous claim expired,
+    False if another claim is still live. Safe across processes sharing the database file.
+    """
+    conn = await get_connection()
+    cursor = await conn.execute(
+        """
+        INSERT INTO idempotency_keys (chat_id, message_id, expires_at) VALUES (?, ?, ?)
+        ON CONFLICT(chat_id, message_id) DO UPDATE SET expires_at = excluded.expires_at
+        WHERE idempotency_keys.expires_at <= ?
+        """,
+        (chat_id, message_id, expires_at, now),
+    )
+    claimed = cursor.rowcount > 0
+    await cursor.close()
+    await conn.commit()
+    return claimed
+
+
+async def release_key(chat_id: int, message_id: int) -> None:
+    """Delete a claim so the action can be retried (e.g. bet failed before anything was charged)."""
+    conn = await get_connection()
+    await conn.execute("DELETE FROM idempotency_keys WHERE chat_id = ? AND message_id = ?", (chat_id, message_id))
+    await conn.commit()
+
+
+async def purge_expired_keys(now: int) -> int:
+    """Delete expired claims (uses idx_idempotency_keys_expires). Returns number of deleted rows."""
+    conn = await get_connection()
+    cursor = await conn.execute("DELETE FROM idempotency_keys WHERE expires_at <= ?", (now,))
+    deleted = cursor.rowcount
+    await cursor.close()
+    await conn.commit()
+    return deleted
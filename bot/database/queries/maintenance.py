@@ -0,0 +1,16 @@
+"""Storage pragmas of the bot's DB (read on the shared connection, cheap)."""
+
+from __future__ import annotations
+
+from bot.database.connection import get_connection
+
+
+async def get_storage_pragmas() -> dict:
+    """page_size, page_count, freelist_count, journal_mode and auto_vacuum (0 none, 1 full, 2 incremental)."""
+    conn = await get_connection()
+    result = {}
+    for name in ("page_size", "page_count", "freelist_count", "journal_mode", "auto_vacuum"):
+        cursor = await conn.execute(f"PRAGMA {name}")
+        result[name] = (await cursor.fetchone())[0]
+        await cursor.close()
+    return result
@@ -0,0 +1,151 @@
+"""Game rollup tables: hourly/daily aggregates and per-player daily sums (no commit in apply_game_rollups)."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+import aiosqlite
+
+from bot.database.connection import get_connection
+
+# Row layout shared with games_queries.save_games:
+# (user_id, game_type, game_id, bet_amount, outcome, is_win, win_amount, is_demo, played_at)
+GameRow = Tuple[int, str, int, int, str, bool, int, bool, str]
+
+
+async def apply_game_rollups(conn: aiosqlite.Connection, rows: Sequence[GameRow]) -> None:
+    """
+    Add settled rounds to games_rollup_* inside the caller's transaction (caller commits together with the games insert).
+    Rows are pre-aggregated per bucket, so an auto-play series costs a handful of statements.
+    """
+    players: Dict[tuple, List[float]] = defaultdict(lambda: [0, 0, 0, 0, 0.0, 0])
+    hourly_members = set()
+    for user_id, _game_type, game_id, bet, _outcome, is_win, win_amount, is_demo, played_at in rows:
+        demo = 1 if is_demo else 0
+        p = players[(played_at[:10], user_id, game_id, demo)]
+        p[0] += 1
+        p[1] += 1 if is_win else 0
+        p[2] += bet
+        p[3] += win_amount
+        if is_win and bet > 0:
+            p[4] = max(p[4], win_amount / bet)
+        p[5] = max(p[5], win_amount)
+        hourly_members.add((played_at[:13], game_id, demo, user_id))
+
+    daily: Dict[tuple, List[int]] = defaultdict(lambda: [0, 0, 0, 0, 0])
+    for (day, user_id, game_id, demo), (n, wins, turnover, payouts, best, biggest) in players.items():
+        cursor = await conn.execute(
+            "INSERT OR IGNORE INTO games_rollup_players (day, user_id, game_id, is_demo) VALUES (?, ?, ?, ?)",
+            (day, user_id, game_id, demo),
+        )
+        is_new = cursor.rowcount > 0
+        await cursor.close()
+        await conn.execute(
+            """
+            UPDATE games_rollup_players SET rounds = rounds + ?, wins = wins + ?, turnover = turnover + ?,
+                payouts = payouts + ?, best_multiplier = MAX(best_multiplier, ?), biggest_win = MAX(biggest_win, ?)
+            WHERE day = ? AND game_id = ? AND is_demo = ? AND user_id = ?
+            """,
+            (n, wins, turnover, payouts, best, biggest, day, game_id, demo, user_id),
+        )
+        d = daily[(day, game_id, demo)]
+        d[0] += n
+        d[1] += wins
+        d[2] += turnover
+        d[3] += payouts
+        d[4] += 1 if is_new else 0
+
+    hourly: Dict[tuple, List[int]] = defaultdict(lambda: [0, 0, 0, 0, 0])
+    for user_id, _game_type, game_id, bet, _outcome, is_win, win_amount, is_demo, played_at in rows:
+        h = hourly[(played_at[:13], game_id, 1 if is_demo else 0)]
+        h[0] += 1
+        h[1] += 1 if is_win else 0
+        h[2] += bet
+        h[3] += win_amount
+    for bucket, game_id, demo, user_id in hourly_members:
+        cursor = await conn.execute(
+            "INSERT OR IGNORE INTO games_rollup_hourly_players (bucket, game_id, is_demo, user_id) VALUES (?, ?, ?, ?)",
+            (bucket, game_id, demo, user_id),
+        )
+        if cursor.rowcount > 0:
+            hourly[(bucket, game_id, demo)][4] += 1
+        await cursor.close()
+
+    for table, data in (("games_rollup_daily", daily), ("games_rollup_hourly", hourly)):
+        await conn.executemany(
+            f"""
+            INSERT INTO {table} (bucket, game_id, is_demo, rounds, wins, turnover, payouts, players)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(bucket, game_id, is_demo) DO UPDATE SET
+                rounds = rounds + excluded.rounds,
+                wins = wins + excluded.wins,
+                turnover = turnover + excluded.turnover,
+                payouts = payouts + excluded.payouts,
+                players = players + excluded.players
+            """,
+            [(*key, *vals) for key, vals in data.items()],
+        )
+
+
+async def get_rollup_totals(table: str, since_bucket: str, is_demo: int) -> Tuple[int, int, int, int]:
+    """Return (rounds, wins, turnover, payouts) summed over buckets >= since_bucket ('' = all time)."""
+    if table not in ("games_rollup_hourly", "games_rollup_daily"):
+        raise ValueError(table)
+    conn = await get_connection()
+    cursor = await conn.execute(
+        f"""
+        SELECT COALESCE(SUM(rounds), 0), COALESCE(SUM(wins), 0), COALESCE(SUM(turnover), 0), COALESCE(SUM(payouts), 0)
+        FROM {table} WHERE bucket >= ? AND is_demo = ?
+        """,
+        (since_bucket, is_demo),
+    )
+    row = await cursor.fetchone()
+    await cursor.close()
+    return (int(row[0]), int(row[1]), int(row[2]), int(row[3])) if row else (0, 0, 0, 0)
+
+
+async def get_total_rounds() -> int:
+    """All-time rounds (real + demo) from games_rollup_daily; keeps counting after games are purged."""
+    conn = await get_connection()
+    cursor = await conn.execute("SELECT COALESCE(SUM(rounds), 0) FROM games_rollup_daily")
+    row = await cursor.fetchone()
+    await cursor.close()
+    return int(row[0]) if row else 0
+
+
+async def get_unique_players(day: str) -> int:
+    """Distinct players of one UTC day across all games and modes."""
+    conn = await get_connection()
+    cursor = await conn.execute("SELECT COUNT(DISTINCT user_id) FROM games_rollup_players WHERE day = ?", (day,))
+    row = await cursor.fetchone()
+    await cursor.close()
+    return int(row[0]) if row else 0
+
+
+async def prune_player_rollups(before_day: str) -> int:
+    """Delete per-player rows older than before_day (aggregate hourly/daily rows are kept). Returns rows deleted."""
+    conn = await get_connection()
+    cursor = await conn.execute("DELETE FROM games_rollup_players WHERE day < ?", (before_day,))
+    deleted = cursor.rowcount
+    await cursor.close()
+    cursor = await conn.execute("DELETE FROM games_rollup_hourly_players WHERE bucket < ?", (before_day,))
+    deleted += cursor.rowcount
+    await cursor.close()
+    await conn.commit()
+    return deleted
+
+
+async def get_period_player_bests(since_day: str) -> List[Tuple[str, int, int, int, float]]:
+    """Per (day, user, mode) best single win and best multiplier since since_day, for leaderboard rebuilds."""
+    conn = await get_connection()
+    cursor = await conn.execute(
+        """
+        SELECT day, user_id, is_demo, MAX(biggest_win), MAX(best_multiplier)
+        FROM games_rollup_players WHERE day >= ? GROUP BY day, user_id, is_demo
+        """,
+        (since_day,),
+    )
+    rows = await cursor.fetchall()
+    await cursor.close()
+    return [(r[0], int(r[1]), int(r[2]), int(r[3]), float(r[4])) for r in rows]
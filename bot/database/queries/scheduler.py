@@ -0,0 +1,86 @@
+"""scheduler_jobs queries: last-run bookkeeping and the single-runner lease."""
+
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+from bot.database.connection import get_connection
+
+
+async def get_jobs() -> Dict[str, dict]:
+    """name -> {last_run_at, last_status, last_error, last_duration, lease_owner, lease_until, failures, retry_at}"""
+    conn = await get_connection()
+    cursor = await conn.execute("SELECT name, last_run_at, last_status, last_error, last_duration, lease_owner, lease_until, failures, retry_at FROM scheduler_jobs")
+    rows = await cursor.fetchall()
+    await cursor.close()
+    keys = ("last_run_at", "last_status", "last_error", "last_duration", "lease_owner", "lease_until", "failures", "retry_at")
+    return {r[0]: dict(zip(keys, r[1:])) for r in rows}
+
+
+async def register_job(name: str, now: str) -> None:
+    """First sighting of a job: count it as run now, so a fresh install does not fire every job at startup."""
+    conn = await get_connection()
+    await conn.execute("INSERT OR IGNORE INTO scheduler_jobs (name, last_run_at, last_status) VALUES (?, ?, 'registered')", (name, now))
+    await conn.commit()
+
+
+async def acquire_lease(name: str, owner: str, seen_last_run_at: Optional[str], now: str, until: str) -> bool:
+    """
+    Take the job's lease unless another owner holds an unexpired one, and only if the job has not run since the
+    caller read seen_last_run_at (otherwise a worker with a stale read would repeat a run that just finished) and
+    its retry backoff after a failure has passed.
+    """
+    conn = await get_connection()
+    cursor = await conn.execute(
+        """
+        UPDATE scheduler_jobs SET lease_owner = ?, lease_until = ?
+        WHERE name = ? AND last_run_at IS ? AND (retry_at IS NULL OR retry_at <= ?) AND (lease_until IS NULL OR lease_until < ? OR lease_owner = ?)
+        """,
+        (owner, until, name, seen_last_run_at, now, now, owner),
+    )
+    acquired = cursor.rowcount == 1
+    await cursor.close()
+    await conn.commit()
+    return acquired
+
+
+async def finish_run(name: str, owner: str, run_at: str, status: str, error: Optional[str], duration: float) -> None:
+    """Record the run and release the lease."""
+    conn = await get_connection()
+    await conn.execute(
+        """
+        UPDATE scheduler_jobs SET last_run_at = ?, last_status = ?, last_error = ?, last_duration = ?, failures = 0, retry_at = NULL,
+            lease_owner = NULL, lease_until = NULL
+        WHERE name = ? AND lease_owner = ?
+        """,
+        (run_at, status, error, duration, name, owner),
+    )
+    await conn.commit()
+
+
+async def record_failure(name: str, owner: str, error: str, duration: float, retry_at: str) -> int:
+    """
+    Record a failed run without touching last_run_at (the slot stays due), set when it may be retried and release
+    the lease. Returns the number of failures in a row.
+    """
+    conn = await get_connection()
+    await conn.execute(
+        """
+        UPDATE scheduler_jobs SET last_status = 'error', last_error = ?, last_duration = ?, failures = failures + 1, retry_at = ?,
+            lease_owner = NULL, lease_until = NULL
+        WHERE name = ? AND lease_owner = ?
+        """,
+        (error, duration, retry_at, name, owner),
+    )
+    await conn.commit()
+    cursor = await conn.execute("SELECT failures FROM scheduler_jobs WHERE name = ?", (name,))
+    row = await cursor.fetchone()
+    await cursor.close()
+    return row[0] if row else 0
+
+
+async def release_lease(name: str, owner: str) -> None:
+    """Drop the lease without recording a run (cancelled at shutdown: the run is due again on the next start)."""
+    conn = await get_connection()
+    await conn.execute("UPDATE scheduler_jobs SET lease_owner = NULL, lease_until = NULL WHERE name = ? AND lease_owner = ?", (name, owner))
+    await conn.commit()
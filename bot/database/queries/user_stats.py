@@ -2,34 +2,56 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections import defaultdict
 from datetime import datetime, timezone
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import aiosqlite
 
 from bot.database.connection import get_connection
-from bot.database.models import UserStats
+from bot.database.models import UserGameStats, UserStats
+from bot.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+_STATS_FIELDS = (
+    "user_id",
+    "total_games",
+    "total_wins",
+    "total_losses",
+    "total_deposited",
+    "total_withdrawn",
+    "total_won",
+    "total_lost",
+    "last_updated",
+    "total_bet",
+    "biggest_win",
+    "current_streak",
+    "longest_win_streak",
+    "longest_loss_streak",
+    "real_games",
+    "real_bet",
+    "real_won",
+    "demo_games",
+    "demo_bet",
+    "demo_won",
+)
+_STATS_COLUMNS = ", ".join(_STATS_FIELDS)
+
+# Users per backfill transaction (games of those users are streamed with fetchmany)
+BACKFILL_CHUNK_USERS = 200
+_BACKFILL_FETCH_ROWS = 1000
 
 
 async def get_or_create_stats(user_id: int) -> UserStats:
     """Return user_stats row; insert with zeros if missing."""
     conn = await get_connection()
-    cursor = await conn.execute(
-        "SELECT user_id, total_games, total_wins, total_losses, total_deposited, total_withdrawn, total_won, total_lost, last_updated " "FROM user_stats WHERE user_id = ?",
-        (user_id,),
-    )
+    cursor = await conn.execute(f"SELECT {_STATS_COLUMNS} FROM user_stats WHERE user_id = ?", (user_id,))
     row = await cursor.fetchone()
     await cursor.close()
     if row:
-        return UserStats(
-            user_id=row[0],
-            total_games=row[1],
-            total_wins=row[2],
-            total_losses=row[3],
-            total_deposited=row[4],
-            total_withdrawn=row[5],
-            total_won=row[6],
-            total_lost=row[7],
-            last_updated=row[8],
-        )
+        return UserStats(**dict(zip(_STATS_FIELDS, row)))
     now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
     await conn.execute(
         "INSERT INTO user_stats (user_id, last_updated) VALUES (?, ?)",
@@ -71,6 +93,37 @@ async def update_stats_after_game(
     await conn.commit()
 
 
+async def update_stats_after_series(
+    user_id: int,
+    wins: int,
+    losses: int,
+    won: int,
+    lost: int,
+) -> None:
+    """Apply a whole auto-play series in one UPDATE: total_games += wins + losses, plus win/loss sums."""
+    conn = await get_connection()
+    await apply_series_stats(conn, user_id, wins, losses, won, lost)
+    await conn.commit()
+
+
+async def apply_series_stats(conn: aiosqlite.Connection, user_id: int, wins: int, losses: int, won: int, lost: int) -> None:
+    """update_stats_after_series inside the caller's transaction (no commit)."""
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    await conn.execute(
+        """
+        UPDATE user_stats SET
+            total_games = total_games + ?,
+            total_wins = total_wins + ?,
+            total_losses = total_losses + ?,
+            total_won = total_won + ?,
+            total_lost = total_lost + ?,
+            last_updated = ?
+        WHERE user_id = ?
+        """,
+        (wins + losses, wins, losses, won, lost, now, user_id),
+    )
+
+
 async def update_stats_after_payment(user_id: int, request_type: str, amount: int) -> None:
     """For approved payment: increase total_deposited or total_withdrawn."""
     conn = await get_connection()
@@ -100,22 +153,161 @@ async def get_aggregate_totals() -> Tuple[int, int]:
 async def get_user_stats(user_id: int) -> Optional[UserStats]:
     """Get user stats by user_id. Returns None if not found."""
     conn = await get_connection()
+    cursor = await conn.execute(f"SELECT {_STATS_COLUMNS} FROM user_stats WHERE user_id = ?", (user_id,))
+    row = await cursor.fetchone()
+    await cursor.close()
+    if row:
+        return UserStats(**dict(zip(_STATS_FIELDS, row)))
+    return None
+
+
+def _streak_params(results: List[bool]) -> Tuple[int, int, int, int, int, int]:
+    """
+    Summarise a win/loss sequence for one UPDATE: (first_sign, first_run, all_same, last_signed_run, max_win_run, max_loss_run).
+    The max runs exclude the first run, which is merged with the stored current_streak in SQL.
+    """
+    runs: List[int] = []
+    for is_win in results:
+        sign = 1 if is_win else -1
+        if runs and (runs[-1] > 0) == is_win:
+            runs[-1] += sign
+        else:
+            runs.append(sign)
+    first = runs[0]
+    rest = runs[1:]
+    max_win = max((r for r in rest if r > 0), default=0)
+    max_loss = max((-r for r in rest if r < 0), default=0)
+    return (1 if first > 0 else -1, abs(first), 1 if not rest else 0, runs[-1], max_win, max_loss)
+
+
+async def apply_user_counters(conn: aiosqlite.Connection, rows: Sequence[tuple]) -> None:
+    """
+    Add rounds to the incremental user_stats counters and user_game_stats inside the caller's transaction.
+    Rows use the games_queries.save_games layout and must be in play order (streaks depend on it).
+    total_games / wins / won / lost stay with update_stats_after_game and update_stats_after_series.
+    """
+    per_user: Dict[int, List[tuple]] = defaultdict(list)
+    per_game: Dict[tuple, List[int]] = defaultdict(lambda: [0, 0, 0, 0])
+    for row in rows:
+        per_user[row[0]].append(row)
+        g = per_game[(row[0], row[2], 1 if row[7] else 0)]
+        g[0] += 1
+        g[1] += 1 if row[5] else 0
+        g[2] += row[3]
+        g[3] += row[6]
+
+    for user_id, user_rows in per_user.items():
+        real = [r for r in user_rows if not r[7]]
+        demo = [r for r in user_rows if r[7]]
+        s0, n0, all_same, last_run, max_win, max_loss = _streak_params([bool(r[5]) for r in user_rows])
+        await conn.execute(
+            """
+            UPDATE user_stats SET
+                total_bet = total_bet + ?,
+                biggest_win = MAX(biggest_win, ?),
+                current_streak = CASE WHEN ? THEN
+                    ? * (CASE WHEN current_streak * ? > 0 THEN ABS(current_streak) ELSE 0 END + ?)
+                    ELSE ? END,
+                longest_win_streak = MAX(longest_win_streak, ?,
+                    CASE WHEN ? > 0 THEN (CASE WHEN current_streak > 0 THEN current_streak ELSE 0 END) + ? ELSE 0 END),
+                longest_loss_streak = MAX(longest_loss_streak, ?,
+                    CASE WHEN ? < 0 THEN (CASE WHEN current_streak < 0 THEN -current_streak ELSE 0 END) + ? ELSE 0 END),
+                real_games = real_games + ?, real_bet = real_bet + ?, real_won = real_won + ?,
+                demo_games = demo_games + ?, demo_bet = demo_bet + ?, demo_won = demo_won + ?
+            WHERE user_id = ?
+            """,
+            (
+                sum(r[3] for r in user_rows),
+                max(r[6] for r in user_rows),
+                all_same,
+                s0,
+                s0,
+                n0,
+                last_run,
+                max_win,
+                s0,
+                n0,
+                max_loss,
+                s0,
+                n0,
+                len(real),
+                sum(r[3] for r in real),
+                sum(r[6] for r in real),
+                len(demo),
+                sum(r[3] for r in demo),
+                sum(r[6] for r in demo),
+                user_id,
+            ),
+        )
+
+    await conn.executemany(
+        """
+        INSERT INTO user_game_stats (user_id, game_id, is_demo, games, wins, bet, won) VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(user_id, game_id, is_demo) DO UPDATE SET
+            games = games + excluded.games, wins = wins + excluded.wins, bet = bet + excluded.bet, won = won + excluded.won
+        """,
+        [(*key, *vals) for key, vals in per_game.items()],
+    )
+
+
+async def get_user_game_stats(user_id: int) -> List[UserGameStats]:
+    """Per-game counters of one user (primary-key range read)."""
+    conn = await get_connection()
     cursor = await conn.execute(
-        "SELECT user_id, total_games, total_wins, total_losses, total_deposited, total_withdrawn, total_won, total_lost, last_updated " "FROM user_stats WHERE user_id = ?",
+        "SELECT user_id, game_id, is_demo, games, wins, bet, won FROM user_game_stats WHERE user_id = ? ORDER BY game_id, is_demo",
         (user_id,),
     )
+    rows = await cursor.fetchall()
+    await cursor.close()
+    return [UserGameStats(user_id=r[0], game_id=r[1], is_demo=bool(r[2]), games=r[3], wins=r[4], bet=r[5], won=r[6]) for r in rows]
+
+
+async def backfill_user_counters(chunk_users: int = BACKFILL_CHUNK_USERS) -> int:
+    """
+    Fill the migration-006 counters from the games still in the table, BACKFILL_CHUNK_USERS users per transaction.
+    Progress is kept in data_backfills, so an interrupted run resumes after the last committed chunk; the row is
+    deleted when done. Runs from init_db before polling starts. Returns the number of users processed.
+    """
+    conn = await get_connection()
+    cursor = await conn.execute("SELECT last_key FROM data_backfills WHERE name = 'user_stats_counters'")
     row = await cursor.fetchone()
     await cursor.close()
-    if row:
-        return UserStats(
-            user_id=row[0],
-            total_games=row[1],
-            total_wins=row[2],
-            total_losses=row[3],
-            total_deposited=row[4],
-            total_withdrawn=row[5],
-            total_won=row[6],
-            total_lost=row[7],
-            last_updated=row[8],
+    if row is None:
+        return 0
+    last_user_id = int(row[0])
+    processed = 0
+    while True:
+        cursor = await conn.execute("SELECT user_id FROM user_stats WHERE user_id > ? ORDER BY user_id LIMIT ?", (last_user_id, chunk_users))
+        user_ids = [r[0] for r in await cursor.fetchall()]
+        await cursor.close()
+        if not user_ids:
+            break
+        first, last = user_ids[0], user_ids[-1]
+        await conn.execute(
+            """
+            UPDATE user_stats SET total_bet = 0, biggest_win = 0, current_streak = 0, longest_win_streak = 0, longest_loss_streak = 0,
+                real_games = 0, real_bet = 0, real_won = 0, demo_games = 0, demo_bet = 0, demo_won = 0
+            WHERE user_id BETWEEN ? AND ?
+            """,
+            (first, last),
         )
-    return None
+        await conn.execute("DELETE FROM user_game_stats WHERE user_id BETWEEN ? AND ?", (first, last))
+        games = await conn.execute(
+            """
+            SELECT user_id, game_type, game_id, bet_amount, outcome, is_win, win_amount, is_demo, played_at
+            FROM games WHERE user_id BETWEEN ? AND ? ORDER BY user_id, played_at, id
+            """,
+            (first, last),
+        )
+        while batch := await games.fetchmany(_BACKFILL_FETCH_ROWS):
+            await apply_user_counters(conn, [tuple(r) for r in batch])
+        await games.close()
+        await conn.execute("UPDATE data_backfills SET last_key = ? WHERE name = 'user_stats_counters'", (last,))
+        await conn.commit()
+        processed += len(user_ids)
+        last_user_id = last
+        log.info("Backfill user_stats counters: {} users done (last user_id {})", processed, last)
+        await asyncio.sleep(0)
+    await conn.execute("DELETE FROM data_backfills WHERE name = 'user_stats_counters'")
+    await conn.commit()
+    return processed
@@ -5,6 +5,8 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import List, Optional
 
+import aiosqlite
+
 from bot.database.connection import get_connection
 from bot.database.models import User, UserBalance
 
@@ -131,9 +133,39 @@ async def update_balance(
     real_balance: Optional[int] = None,
     demo_balance: Optional[int] = None,
     demo_mode: Optional[int] = None,
+    reason: str = "other",
 ) -> None:
-    """Update user_balances: only provided fields are updated."""
+    """
+    Update user_balances: only provided fields are updated. Each balance change is added to balance_ledger under
+    reason (bet, win, deposit, withdraw, referral, admin, demo_restore) in the same transaction.
+    """
     conn = await get_connection()
+    await apply_balance_update(conn, user_id, real_balance, demo_balance, demo_mode, reason)
+    await conn.commit()
+
+
+async def apply_balance_update(
+    conn: aiosqlite.Connection,
+    user_id: int,
+    real_balance: Optional[int] = None,
+    demo_balance: Optional[int] = None,
+    demo_mode: Optional[int] = None,
+    reason: str = "other",
+) -> None:
+    """update_balance inside the caller's transaction (no commit)."""
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    for account, value in (("real", real_balance), ("demo", demo_balance)):
+        if value is None:
+            continue
+        await conn.execute(
+            f"""
+            INSERT INTO balance_ledger (user_id, account, reason, amount, movements, updated_at)
+            SELECT user_id, ?, ?, ? - {account}_balance, 1, ? FROM user_balances WHERE user_id = ?
+            ON CONFLICT (user_id, account, reason) DO UPDATE SET
+                amount = amount + excluded.amount, movements = movements + 1, updated_at = excluded.updated_at
+            """,
+            (account, reason, value, now, user_id),
+        )
     sets = []
     values = []
     if real_balance is not None:
@@ -152,7 +184,6 @@ async def update_balance(
         f"UPDATE user_balances SET {', '.join(sets)} WHERE user_id = ?",
         tuple(values),
     )
-    await conn.commit()
 
 
 async def set_block(user_id: int, is_blocked: bool, block_type: Optional[str] = None) -> None:
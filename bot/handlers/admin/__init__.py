@@ -1,18 +1,28 @@
-"""Admin: panel, users, settings, payments, stats, broadcast."""
+"""Admin: panel, users, settings, game catalog, payments, stats, dashboard, export, analytics, broadcast, system."""
 
 from aiogram import Router
 
+from bot.handlers.admin.analytics import router as analytics_router
 from bot.handlers.admin.broadcast import router as broadcast_router
+from bot.handlers.admin.catalog import router as catalog_router
+from bot.handlers.admin.dashboard import router as dashboard_router
+from bot.handlers.admin.export import router as export_router
 from bot.handlers.admin.panel import router as panel_router
 from bot.handlers.admin.payments import router as payments_router
 from bot.handlers.admin.settings import router as settings_router
 from bot.handlers.admin.stats import router as stats_router
+from bot.handlers.admin.system import router as system_router
 from bot.handlers.admin.users import router as users_router
 
 router = Router(name="admin")
 router.include_router(panel_router)
 router.include_router(users_router)
 router.include_router(settings_router)
+router.include_router(catalog_router)
 router.include_router(payments_router)
 router.include_router(stats_router)
+router.include_router(dashboard_router)
+router.include_router(export_router)
+router.include_router(analytics_router)
 router.include_router(broadcast_router)
+router.include_router(system_router)
@@ -0,0 +1,73 @@
+"""Admin: cohort / referrer retention screen, read from analytics_cache (computed by the analytics job)."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from aiogram import Router
+from aiogram.types import CallbackQuery
+
+from bot.config import get_config
+from bot.database.queries import analytics as analytics_queries
+from bot.database.queries import users as users_queries
+from bot.handlers.admin.utils import admin_edit_screen
+from bot.keyboards.inline import admin_analytics_keyboard
+from bot.services.analytics import run_analytics_job
+from bot.templates.texts import get_text
+from bot.utils.logger import get_logger
+
+log = get_logger(__name__)
+router = Router(name="admin_analytics")
+
+_SHOW_COHORTS = 8
+
+
+def _pct(pair: list) -> str:
+    eligible, retained = pair
+    return f"{round(retained * 100 / eligible)}%" if eligible else "—"
+
+
+def _line(label: str, row: dict) -> str:
+    conversion = f"{round(row['depositors'] * 100 / row['users'])}%" if row["users"] else "—"
+    return f"{label}: {row['users']} · D1 {_pct(row['d1'])} · D7 {_pct(row['d7'])} · D30 {_pct(row['d30'])} · dep {conversion}"
+
+
+async def build_analytics_caption(lang: str) -> str:
+    cohorts = await analytics_queries.get_result("cohorts")
+    referrers = await analytics_queries.get_result("referrers")
+    if cohorts is None or referrers is None:
+        return get_text("admin_analytics_empty", lang)
+    lines = [get_text("admin_analytics_caption", lang, snapshot_at=cohorts[1])]
+    lines += [_line(row["cohort"], row) for row in cohorts[0][:_SHOW_COHORTS]]
+    lines.append("")
+    lines.append(get_text("admin_analytics_referrers", lang))
+    organic = get_text("admin_analytics_organic", lang)
+    lines += [_line(str(row["referrer_id"]) if row["referrer_id"] is not None else organic, row) for row in referrers[0]]
+    return "\n".join(lines)
+
+
+async def _run_job_in_background() -> None:
+    db_path = get_config().database_path
+    try:
+        await run_analytics_job(db_path, Path(db_path).resolve().parent / "analytics")
+    except Exception as e:
+        log.exception("Analytics job (admin request) failed: {}", e)
+
+
+@router.callback_query(lambda c: c.data in ("admin:analytics", "admin:analytics:run"))
+async def cb_admin_analytics(callback: CallbackQuery) -> None:
+    """Show cached cohorts; admin:analytics:run starts a recompute in the background (result on the next open)."""
+    if not callback.from_user or callback.from_user.id not in get_config().get_admin_ids():
+        await callback.answer()
+        return
+    user = await users_queries.get_user(callback.from_user.id)
+    lang = user.language if user else "ru"
+    if callback.data == "admin:analytics:run":
+        asyncio.create_task(_run_job_in_background())
+        await callback.answer(get_text("admin_analytics_started", lang))
+        return
+    if callback.message:
+        caption = await build_analytics_caption(lang)
+        await admin_edit_screen(callback.bot, callback.message.chat.id, callback.message.message_id, caption, admin_analytics_keyboard(lang), lang)
+    await callback.answer()
@@ -0,0 +1,152 @@
+"""Admin: edit per-outcome game ratios in games_catalog (applied to all workers without restart)."""
+
+from __future__ import annotations
+
+from aiogram import F, Router
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State, StatesGroup
+from aiogram.types import CallbackQuery, Message
+
+from bot.config import get_config
+from bot.database.queries import users as users_queries
+from bot.handlers.admin.utils import admin_edit_screen
+from bot.keyboards.inline import admin_back_to_panel, admin_catalog_games, admin_catalog_outcomes
+from bot.services.catalog import get_catalog, set_ratio
+from bot.services.game import get_game_info
+from bot.templates.texts import get_text
+from bot.utils.logger import get_logger
+
+log = get_logger(__name__)
+router = Router(name="admin_catalog")
+
+# Accepted ratio range for admin input
+MIN_RATIO = 1.01
+MAX_RATIO = 100.0
+
+
+class AdminCatalogStates(StatesGroup):
+    waiting_ratio = State()
+
+
+def _is_admin(user_id: int) -> bool:
+    return user_id in get_config().get_admin_ids()
+
+
+async def _admin_lang(admin_id: int) -> str:
+    u = await users_queries.get_user(admin_id)
+    return u.language if u else "ru"
+
+
+def _game_screen(game_id: int, lang: str):
+    info = get_game_info(game_id, lang)
+    outcomes = [f"{o} (x{r})" for o, r in zip(info["outcomes"], info["ratios"])]
+    return get_text("admin_catalog_game_caption", lang, name=info["name"]), admin_catalog_outcomes(game_id, outcomes, lang)
+
+
+@router.callback_query(lambda c: c.data == "admin:catalog")
+async def cb_admin_catalog(callback: CallbackQuery, state: FSMContext) -> None:
+    """List games of the current catalog snapshot."""
+    if not callback.from_user or not _is_admin(callback.from_user.id):
+        await callback.answer()
+        return
+    await state.clear()
+    lang = await _admin_lang(callback.from_user.id)
+    catalog = get_catalog()
+    games = [(gid, get_text(spec.name_key, lang)) for gid, spec in sorted(catalog.games.items())]
+    text = get_text("admin_catalog_caption", lang, version=catalog.version)
+    if callback.message:
+        await admin_edit_screen(callback.bot, callback.message.chat.id, callback.message.message_id, text, admin_catalog_games(games, lang), lang)
+    await callback.answer()
+
+
+@router.callback_query(lambda c: c.data and c.data.startswith("admin:catalog:") and c.data.count(":") == 2)
+async def cb_admin_catalog_game(callback: CallbackQuery, state: FSMContext) -> None:
+    """Show outcomes with current ratios for one game."""
+    if not callback.from_user or not _is_admin(callback.from_user.id) or not callback.data:
+        await callback.answer()
+        return
+    await state.clear()
+    try:
+        game_id = int(callback.data.split(":")[2])
+    except ValueError:
+        await callback.answer()
+        return
+    if game_id not in get_catalog().games:
+        await callback.answer()
+        return
+    lang = await _admin_lang(callback.from_user.id)
+    text, kb = _game_screen(game_id, lang)
+    if callback.message:
+        await admin_edit_screen(callback.bot, callback.message.chat.id, callback.message.message_id, text, kb, lang)
+    await callback.answer()
+
+
+@router.callback_query(lambda c: c.data and c.data.startswith("admin:catalog:") and c.data.count(":") == 3)
+async def cb_admin_catalog_outcome(callback: CallbackQuery, state: FSMContext) -> None:
+    """Ask for a new ratio: admin:catalog:GID:OID."""
+    if not callback.from_user or not _is_admin(callback.from_user.id) or not callback.data or not callback.message:
+        await callback.answer()
+        return
+    parts = callback.data.split(":")
+    try:
+        game_id = int(parts[2])
+        outcome_index = int(parts[3])
+    except ValueError:
+        await callback.answer()
+        return
+    lang = await _admin_lang(callback.from_user.id)
+    if game_id not in get_catalog().games:
+        await callback.answer()
+        return
+    info = get_game_info(game_id, lang)
+    if outcome_index < 0 or outcome_index >= len(info["outcomes"]):
+        await callback.answer()
+        return
+    await state.set_state(AdminCatalogStates.waiting_ratio)
+    await state.update_data(
+        admin_catalog_game_id=game_id,
+        admin_catalog_outcome_index=outcome_index,
+        admin_chat_id=callback.message.chat.id,
+        admin_message_id=callback.message.message_id,
+    )
+    text = get_text(
+        "admin_catalog_ratio_prompt",
+        lang,
+        name=info["name"],
+        outcome=info["outcomes"][outcome_index],
+        ratio=info["ratios"][outcome_index],
+    )
+    await admin_edit_screen(callback.bot, callback.message.chat.id, callback.message.message_id, text, admin_back_to_panel(lang), lang)
+    await callback.answer()
+
+
+@router.message(AdminCatalogStates.waiting_ratio, F.text)
+async def msg_admin_catalog_ratio(message: Message, state: FSMContext) -> None:
+    """Persist the ratio, swap the snapshot and return to the game screen."""
+    if not message.from_user or not _is_admin(message.from_user.id):
+        return
+    lang = await _admin_lang(message.from_user.id)
+    try:
+        ratio = round(float((message.text or "").strip().replace(",", ".")), 2)
+    except ValueError:
+        ratio = 0.0
+    if not MIN_RATIO <= ratio <= MAX_RATIO:
+        await message.answer(get_text("admin_catalog_ratio_invalid", lang))
+        return
+    data = await state.get_data()
+    await state.clear()
+    game_id = data.get("admin_catalog_game_id")
+    outcome_index = data.get("admin_catalog_outcome_index")
+    if game_id is None or outcome_index is None or not await set_ratio(int(game_id), int(outcome_index), ratio):
+        await message.answer("Error. Start from admin panel.")
+        return
+    log.info("Admin {} set ratio game={} outcome={} -> {}", message.from_user.id, game_id, outcome_index, ratio)
+    info = get_game_info(int(game_id), lang)
+    text, kb = _game_screen(int(game_id), lang)
+    text = get_text("admin_catalog_ratio_ok", lang, outcome=info["outcomes"][int(outcome_index)], ratio=ratio, version=get_catalog().version) + "\n\n" + text
+    chat_id = data.get("admin_chat_id")
+    message_id = data.get("admin_message_id")
+    if chat_id is not None and message_id is not None:
+        await admin_edit_screen(message.bot, int(chat_id), int(message_id), text, kb, lang)
+    else:
+        await message.answer(text, reply_markup=kb)
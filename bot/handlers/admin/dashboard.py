@@ -0,0 +1,70 @@
+"""Admin: stats screen — renders the in-memory dashboard snapshot (bot/services/dashboard.py)."""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+from aiogram import Router
+from aiogram.types import CallbackQuery
+
+from bot.config import get_config
+from bot.database.queries import users as users_queries
+from bot.handlers.admin.utils import admin_edit_screen
+from bot.keyboards.inline import admin_stats_keyboard
+from bot.services.dashboard import DashboardSnapshot, get_dashboard
+from bot.templates.texts import get_text
+from bot.utils.logger import get_logger
+
+log = get_logger(__name__)
+router = Router(name="admin_dashboard")
+
+
+def _period_block(lang: str, title_key: str, figures: Tuple[int, int, int, int], demo_rounds: int) -> str:
+    """Real-money figures for one period; demo shown as rounds only."""
+    rounds, wins, turnover, payouts = figures
+    return get_text(
+        "admin_stats_games",
+        lang,
+        title=get_text(title_key, lang),
+        rounds=rounds,
+        wins=wins,
+        turnover=turnover,
+        payouts=payouts,
+        ggr=turnover - payouts,
+        demo_rounds=demo_rounds,
+    )
+
+
+def build_admin_stats_caption(snap: DashboardSnapshot, lang: str) -> str:
+    """Render a dashboard snapshot (no DB access)."""
+    sections = [
+        get_text(
+            "admin_stats_caption",
+            lang,
+            users_count=snap.users_count,
+            games_count=snap.games_count,
+            total_deposited=snap.total_deposited,
+            total_withdrawn=snap.total_withdrawn,
+            pending_count=snap.pending_count,
+        ),
+        _period_block(lang, "admin_stats_today", snap.today, snap.today_demo_rounds),
+        _period_block(lang, "admin_stats_24h", snap.last_24h, snap.last_24h_demo_rounds),
+        get_text("admin_stats_players", lang, players=snap.players_today),
+        get_text("admin_stats_active", lang, **snap.active),
+        get_text("admin_stats_updated", lang, computed_at=snap.computed_at),
+    ]
+    return "\n\n".join(sections)
+
+
+@router.callback_query(lambda c: c.data == "admin:stats")
+async def cb_admin_stats(callback: CallbackQuery) -> None:
+    """Show admin stats."""
+    if not callback.from_user or callback.from_user.id not in get_config().get_admin_ids():
+        await callback.answer()
+        return
+    user = await users_queries.get_user(callback.from_user.id)
+    lang = user.language if user else "ru"
+    caption = build_admin_stats_caption(await get_dashboard().get(), lang)
+    if callback.message:
+        await admin_edit_screen(callback.bot, callback.message.chat.id, callback.message.message_id, caption, admin_stats_keyboard(lang), lang)
+    await callback.answer()
@@ -0,0 +1,146 @@
+"""Admin: export games and payment requests (one user's history or a date range) as gzip CSV / NDJSON documents."""
+
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+from aiogram import F, Router
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State, StatesGroup
+from aiogram.types import CallbackQuery, FSInputFile, Message
+
+from bot.config import get_config
+from bot.core.constants import EXPORT_MAX_BYTES
+from bot.database.queries import users as users_queries
+from bot.handlers.admin.utils import admin_edit_screen
+from bot.keyboards.inline import admin_back_to_panel, admin_export_formats
+from bot.services.export import EXPORT_FORMATS, ExportFilter, export_history
+from bot.services.replica import get_replica
+from bot.templates.texts import get_text
+from bot.utils.logger import get_logger
+
+log = get_logger(__name__)
+router = Router(name="admin_export")
+
+
+class AdminExportStates(StatesGroup):
+    date_range = State()
+
+
+def _is_admin(user_id: int) -> bool:
+    return user_id in get_config().get_admin_ids()
+
+
+async def _admin_lang(admin_id: int) -> str:
+    u = await users_queries.get_user(admin_id)
+    return u.language if u else "ru"
+
+
+def _parse_range(text: str) -> tuple[str, str] | None:
+    """'YYYY-MM-DD YYYY-MM-DD' -> (from, to) with from <= to, else None."""
+    parts = text.split()
+    if len(parts) != 2:
+        return None
+    try:
+        start, end = date.fromisoformat(parts[0]), date.fromisoformat(parts[1])
+    except ValueError:
+        return None
+    if start > end:
+        return None
+    return start.isoformat(), end.isoformat()
+
+
+@router.callback_query(lambda c: c.data and c.data.startswith("admin:user:") and c.data.endswith(":export"))
+async def cb_admin_user_export(callback: CallbackQuery) -> None:
+    """User profile -> format choice for the user's full history."""
+    if not callback.from_user or not _is_admin(callback.from_user.id) or not callback.data:
+        await callback.answer()
+        return
+    user_id = callback.data.split(":")[2]
+    lang = await _admin_lang(callback.from_user.id)
+    if callback.message:
+        caption = get_text("admin_export_format", lang, scope=user_id)
+        kb = admin_export_formats(f"user:{user_id}", f"admin:user:{user_id}", lang)
+        await admin_edit_screen(callback.bot, callback.message.chat.id, callback.message.message_id, caption, kb, lang)
+    await callback.answer()
+
+
+@router.callback_query(lambda c: c.data == "admin:export:range")
+async def cb_admin_export_range(callback: CallbackQuery, state: FSMContext) -> None:
+    """Admin stats -> ask for a date range."""
+    if not callback.from_user or not _is_admin(callback.from_user.id) or not callback.message:
+        await callback.answer()
+        return
+    await state.set_state(AdminExportStates.date_range)
+    await state.update_data(admin_chat_id=callback.message.chat.id, admin_message_id=callback.message.message_id)
+    lang = await _admin_lang(callback.from_user.id)
+    await admin_edit_screen(callback.bot, callback.message.chat.id, callback.message.message_id, get_text("admin_export_range_prompt", lang), admin_back_to_panel(lang), lang)
+    await callback.answer()
+
+
+@router.message(AdminExportStates.date_range, F.text)
+async def msg_admin_export_range(message: Message, state: FSMContext) -> None:
+    """Validate the range, then show the format choice on the admin message."""
+    if not message.from_user or not _is_admin(message.from_user.id):
+        return
+    lang = await _admin_lang(message.from_user.id)
+    data = await state.get_data()
+    chat_id, message_id = data.get("admin_chat_id"), data.get("admin_message_id")
+    parsed = _parse_range(message.text or "")
+    if parsed is None:
+        await message.answer(get_text("admin_export_range_invalid", lang))
+        return
+    await state.clear()
+    date_from, date_to = parsed
+    caption = get_text("admin_export_format", lang, scope=f"{date_from} — {date_to}")
+    kb = admin_export_formats(f"range:{date_from}:{date_to}", "admin:stats", lang)
+    if chat_id is not None and message_id is not None:
+        await admin_edit_screen(message.bot, int(chat_id), int(message_id), caption, kb, lang)
+    else:
+        await message.answer(caption, reply_markup=kb)
+
+
+@router.callback_query(lambda c: c.data and c.data.startswith("admin:export:") and c.data.rsplit(":", 1)[-1] in EXPORT_FORMATS)
+async def cb_admin_export_run(callback: CallbackQuery) -> None:
+    """
+    admin:export:user:ID:FMT or admin:export:range:FROM:TO:FMT. Each table is written by a worker thread
+    (constant memory, event loop stays free) and sent as a separate document; temp files are removed afterwards.
+    """
+    if not callback.from_user or not _is_admin(callback.from_user.id) or not callback.data or not callback.message:
+        await callback.answer()
+        return
+    parts = callback.data.split(":")
+    fmt = parts[-1]
+    try:
+        if parts[2] == "user" and len(parts) == 5:
+            flt = ExportFilter(user_id=int(parts[3]))
+        elif parts[2] == "range" and len(parts) == 6:
+            flt = ExportFilter(date_from=parts[3], date_to=parts[4])
+        else:
+            raise ValueError(callback.data)
+    except ValueError:
+        await callback.answer()
+        return
+    lang = await _admin_lang(callback.from_user.id)
+    await callback.answer(get_text("admin_export_started", lang))
+
+    db_path = get_config().database_path
+    out_dir = Path(db_path).resolve().parent / "exports"
+    chat_id = callback.message.chat.id
+    for kind in ("games", "payments"):
+        path, count = None, 0
+        try:
+            async with get_replica().read_path() as source_path:
+                path, count = await export_history(db_path, kind, fmt, out_dir, flt, source_path)
+            size = path.stat().st_size
+            if size > EXPORT_MAX_BYTES:
+                await callback.bot.send_message(chat_id, get_text("admin_export_too_large", lang, kind=kind, count=count, mib=round(size / 2**20, 1)))
+                continue
+            await callback.bot.send_document(chat_id, FSInputFile(path), caption=get_text("admin_export_done", lang, kind=kind, count=count))
+            log.info("Admin {} exported {} {} rows ({})", callback.from_user.id, count, kind, fmt)
+        except Exception as e:
+            log.error("Export {} failed: {}", kind, e)
+        finally:
+            if path is not None:
+                path.unlink(missing_ok=True)
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Optional
+
 from aiogram import Router
 from aiogram.types import CallbackQuery
 
@@ -12,13 +14,27 @@ from bot.database.queries import users as users_queries
 from bot.handlers.admin.utils import admin_edit_screen
 from bot.keyboards.inline import admin_back_to_panel, admin_payment_actions, admin_payments_list_keyboard
 from bot.services.balance import credit_deposit, deduct_withdraw
+from bot.services.dashboard import get_dashboard
 from bot.templates.texts import get_text
+from bot.utils.locks import user_lane
 from bot.utils.logger import get_logger
 
 log = get_logger(__name__)
 router = Router(name="admin_payments")
 
 
+async def _request_owner_lane(callback: CallbackQuery, **kwargs) -> Optional[int]:
+    """Lane key for approve/reject: the request owner, so approval never interleaves with their bets. No lane for non-admins."""
+    if not callback.from_user or callback.from_user.id not in get_config().get_admin_ids():
+        return None
+    try:
+        request_id = int((callback.data or "").split(":")[-1])
+    except ValueError:
+        return None
+    req = await payments_queries.get_payment_request(request_id)
+    return req.user_id if req else None
+
+
 @router.callback_query(lambda c: c.data == "admin:payments")
 async def cb_admin_payments(callback: CallbackQuery) -> None:
     """Show list of pending requests."""
@@ -72,6 +88,7 @@ async def cb_admin_payment_view(callback: CallbackQuery) -> None:
 
 
 @router.callback_query(lambda c: c.data and c.data.startswith("admin:pay:approve:"))
+@user_lane(_request_owner_lane)
 async def cb_admin_payment_approve(callback: CallbackQuery) -> None:
     """Approve request: credit/deduct balance, update user_stats, set status."""
     if not callback.from_user or callback.from_user.id not in get_config().get_admin_ids() or not callback.data:
@@ -94,6 +111,7 @@ async def cb_admin_payment_approve(callback: CallbackQuery) -> None:
         await deduct_withdraw(req.user_id, req.amount)
         await user_stats_queries.update_stats_after_payment(req.user_id, "withdraw", req.amount)
     await payments_queries.set_payment_status(request_id, "approved", processed_by=admin_id)
+    get_dashboard().invalidate()
     user = await users_queries.get_user(callback.from_user.id)
     lang = user.language if user else "ru"
     pending = await payments_queries.get_pending_requests()
@@ -123,6 +141,7 @@ async def cb_admin_payment_dismiss(callback: CallbackQuery) -> None:
 
 
 @router.callback_query(lambda c: c.data and c.data.startswith("admin:pay:reject:"))
+@user_lane(_request_owner_lane)
 async def cb_admin_payment_reject(callback: CallbackQuery) -> None:
     """Reject request: only set status."""
     if not callback.from_user or callback.from_user.id not in get_config().get_admin_ids() or not callback.data:
@@ -139,6 +158,7 @@ async def cb_admin_payment_reject(callback: CallbackQuery) -> None:
         return
     admin_id = callback.from_user.id
     await payments_queries.set_payment_status(request_id, "rejected", processed_by=admin_id)
+    get_dashboard().invalidate()
     user = await users_queries.get_user(callback.from_user.id)
     lang = user.language if user else "ru"
     pending = await payments_queries.get_pending_requests()
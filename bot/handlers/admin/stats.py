@@ -1,14 +1,16 @@
-"""Stats menu: View simple text statistics (8 indicators) with Reset (UI only) and Back buttons."""
+"""Stats menu: View simple text statistics (10 indicators) with Game history, Reset (UI only) and Back buttons."""
 
 from __future__ import annotations
 
 from aiogram import F, Router
 from aiogram.types import CallbackQuery, FSInputFile, InputMediaPhoto
 
+from bot.core.constants import GAME_HISTORY_DAYS, HISTORY_PAGE_SIZE
 from bot.database.queries import games as games_queries
 from bot.database.queries import user_stats as stats_queries
 from bot.database.queries import users as users_queries
-from bot.keyboards.inline import stats_menu
+from bot.keyboards.inline import history_page_keyboard, stats_menu
+from bot.services.catalog import get_catalog
 from bot.templates.texts import get_text
 from bot.utils.helpers import format_amount, get_image_path
 from bot.utils.logger import get_logger
@@ -64,12 +66,9 @@ async def cb_stats(callback: CallbackQuery) -> None:
     user = await users_queries.get_user(user_id)
     lang = user.language if user else "en"
 
-    # Get statistics using the correct function
+    # All counters (including total_bet) are maintained in user_stats: one primary-key read
     stats = await stats_queries.get_user_stats(user_id)
 
-    # Get total bet amount for average calculation using the correct function
-    total_bet = await games_queries.get_total_bet_by_user(user_id)
-
     # Extract values (handle case when stats is None)
     if stats:
         total_games = stats.total_games
@@ -77,12 +76,18 @@ async def cb_stats(callback: CallbackQuery) -> None:
         total_losses = stats.total_losses
         total_won = stats.total_won
         total_lost = stats.total_lost
+        total_bet = stats.total_bet
+        biggest_win = stats.biggest_win
+        longest_win_streak = stats.longest_win_streak
     else:
         total_games = 0
         total_wins = 0
         total_losses = 0
         total_won = 0
         total_lost = 0
+        total_bet = 0
+        biggest_win = 0
+        longest_win_streak = 0
 
     # Calculate derived values
     winrate = _calculate_winrate(total_wins, total_games)
@@ -92,7 +97,7 @@ async def cb_stats(callback: CallbackQuery) -> None:
     # Determine sign for net profit
     profit_sign = "+" if net_profit > 0 else ("−" if net_profit < 0 else "")
 
-    # Build caption (8 indicators as plain text)
+    # Build caption (10 indicators as plain text)
     caption_lines = [
         "📊 **СТАТИСТИКА**",
         "",
@@ -104,6 +109,8 @@ async def cb_stats(callback: CallbackQuery) -> None:
         f"💸 Проигрыш на: {format_amount(total_lost)}",
         f"💵 Чистый профит: {profit_sign}{format_amount(abs(net_profit)) if net_profit != 0 else '0'}",
         f"📊 Средняя ставка: {format_amount(avg_bet)}",
+        f"🏆 Крупнейший выигрыш: {format_amount(biggest_win)}",
+        f"🔥 Лучшая серия побед: {longest_win_streak}",
     ]
 
     caption = "\n".join(caption_lines)
@@ -139,3 +146,62 @@ async def cb_stats_reset(callback: CallbackQuery) -> None:
 
     # For simplicity, we'll just keep them on the same screen
     # and they can refresh by clicking Back and then Stats again
+
+
+def _history_line(game, lang: str) -> str:
+    spec = get_catalog().games.get(game.game_id)
+    result = f"+{game.win_amount}" if game.is_win else f"−{game.bet_amount}"
+    return get_text(
+        "history_line",
+        lang,
+        when=f"{game.played_at[8:10]}.{game.played_at[5:7]} {game.played_at[11:16]}",
+        game=get_text(spec.name_key, lang) if spec else game.game_type,
+        bet=game.bet_amount,
+        result=result,
+        demo=get_text("history_demo_mark", lang) if game.is_demo else "",
+    )
+
+
+@router.callback_query(F.data.startswith("stats:h"))
+async def cb_stats_history(callback: CallbackQuery) -> None:
+    """
+    Game history, HISTORY_PAGE_SIZE per page. Cursor in callback data: stats:h (newest page),
+    stats:h:n:<id> (older than id), stats:h:p:<id> (newer than id). Each page is one range read of idx_games_user_id_history.
+    """
+    if not callback.from_user or not callback.data:
+        return
+    parts = callback.data.split(":")
+    direction, cursor_id = None, None
+    if len(parts) == 4 and parts[2] in ("n", "p") and parts[3].isdigit():
+        direction, cursor_id = parts[2], int(parts[3])
+    elif len(parts) != 2:
+        await callback.answer()
+        return
+
+    user_id = callback.from_user.id
+    user = await users_queries.get_user(user_id)
+    lang = user.language if user else "en"
+
+    if direction == "n":
+        games, more = await games_queries.get_games_page(user_id, HISTORY_PAGE_SIZE, before_id=cursor_id)
+        has_older, has_newer = more, True
+    elif direction == "p":
+        games, more = await games_queries.get_games_page(user_id, HISTORY_PAGE_SIZE, after_id=cursor_id)
+        has_older, has_newer = True, more
+    else:
+        games, more = await games_queries.get_games_page(user_id, HISTORY_PAGE_SIZE)
+        has_older, has_newer = more, False
+    if not games and direction is not None:
+        # Cursor points past the end (games purged meanwhile): start over from the newest page
+        games, more = await games_queries.get_games_page(user_id, HISTORY_PAGE_SIZE)
+        has_older, has_newer = more, False
+
+    lines = "\n".join(_history_line(g, lang) for g in games) if games else get_text("history_empty", lang)
+    caption = get_text("history_caption", lang, days=GAME_HISTORY_DAYS, lines=lines)
+    kb = history_page_keyboard(
+        lang,
+        newer_than=games[0].id if games and has_newer else None,
+        older_than=games[-1].id if games and has_older else None,
+    )
+    await _edit_or_answer(callback, caption, kb, get_image_path("stats", lang))
+    await callback.answer()
@@ -0,0 +1,86 @@
+"""Admin: system screen — runtime counters (memory, user lanes, double-tap store, exit cache, live GGR, DB / WAL size, replica lag)."""
+
+from __future__ import annotations
+
+from aiogram import Router
+from aiogram.types import CallbackQuery
+
+from bot.config import get_config
+from bot.database.queries import maintenance as maintenance_queries
+from bot.database.queries import users as users_queries
+from bot.handlers.admin.utils import admin_edit_screen
+from bot.keyboards.inline import admin_back_to_panel
+from bot.services.exit_cleanup import exit_cleanup_cache
+from bot.services.idempotency import get_idempotency_store
+from bot.services.metrics import get_metrics
+from bot.services.replica import get_replica
+from bot.templates.texts import get_text
+from bot.utils.helpers import process_rss_bytes
+from bot.utils.locks import user_lanes
+from bot.utils.logger import get_logger
+from bot.utils.maintenance import AUTO_VACUUM_NAMES, file_sizes
+
+log = get_logger(__name__)
+router = Router(name="admin_system")
+
+
+def _metrics_section(lang: str) -> str:
+    """Real-money totals for each live window (per-game figures are on /api/metrics)."""
+    snapshot = get_metrics().snapshot()
+    lines = [get_text("admin_system_metrics", lang)]
+    for window, data in snapshot.items():
+        lines.append(get_text("admin_system_metrics_window", lang, window=window, **data["total"]))
+    return "\n".join(lines)
+
+
+async def _storage_section(lang: str) -> str:
+    """File sizes on disk plus free pages inside the DB (reclaimed by the vacuum job)."""
+    db_bytes, wal_bytes = file_sizes(get_config().database_path)
+    pragmas = await maintenance_queries.get_storage_pragmas()
+    return get_text(
+        "admin_system_storage",
+        lang,
+        db_mib=round(db_bytes / 2**20, 1),
+        wal_mib=round(wal_bytes / 2**20, 1),
+        free_mib=round(pragmas["freelist_count"] * pragmas["page_size"] / 2**20, 1),
+        journal_mode=pragmas["journal_mode"],
+        auto_vacuum=AUTO_VACUUM_NAMES.get(pragmas["auto_vacuum"], pragmas["auto_vacuum"]),
+    )
+
+
+def _replica_section(lang: str) -> str:
+    """Freshness of the read replica and where the heavy reads go right now."""
+    replica = get_replica()
+    lag = replica.lag_seconds()
+    if lag is None:
+        return get_text("admin_system_replica_none", lang)
+    target = get_text("admin_system_replica_target_replica" if replica.is_fresh() else "admin_system_replica_target_primary", lang, max_lag=int(replica.max_lag))
+    return get_text("admin_system_replica", lang, as_of=replica.current["as_of"], lag=int(lag), mode=replica.current["mode"], target=target)
+
+
+async def build_system_caption(lang: str) -> str:
+    """One block per subsystem, separated by blank lines."""
+    sections = [
+        get_text("admin_system_caption", lang),
+        get_text("admin_system_memory", lang, rss_mib=round(process_rss_bytes() / 2**20, 1)),
+        get_text("admin_system_lanes", lang, **user_lanes.stats()),
+        get_text("admin_system_idempotency", lang, **get_idempotency_store().stats()),
+        get_text("admin_system_exit_cache", lang, **exit_cleanup_cache.stats()),
+        _metrics_section(lang),
+        await _storage_section(lang),
+        _replica_section(lang),
+    ]
+    return "\n\n".join(sections)
+
+
+@router.callback_query(lambda c: c.data == "admin:system")
+async def cb_admin_system(callback: CallbackQuery) -> None:
+    """Show system counters (snapshot at the moment of the tap)."""
+    if not callback.from_user or callback.from_user.id not in get_config().get_admin_ids():
+        await callback.answer()
+        return
+    user = await users_queries.get_user(callback.from_user.id)
+    lang = user.language if user else "ru"
+    if callback.message:
+        await admin_edit_screen(callback.bot, callback.message.chat.id, callback.message.message_id, await build_system_caption(lang), admin_back_to_panel(lang), lang)
+    await callback.answer()
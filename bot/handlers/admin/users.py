@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Optional
+
 from aiogram import F, Router
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
@@ -13,6 +15,7 @@ from bot.handlers.admin.utils import admin_edit_screen
 from bot.keyboards.inline import admin_back_to_panel, admin_balance_type_choice, admin_block_type_choice, admin_confirm_danger, admin_user_actions
 from bot.services.stats import get_user_stats_display  # ← исправлено: правильный импорт
 from bot.templates.texts import get_text
+from bot.utils.locks import user_lane
 from bot.utils.logger import get_logger
 
 log = get_logger(__name__)
@@ -33,6 +36,13 @@ async def _admin_lang(admin_id: int) -> str:
     return u.language if u else "ru"
 
 
+async def _balance_target_lane(message: Message, state: FSMContext, **kwargs) -> Optional[int]:
+    """Lane key for balance edit: the user whose balance is being set (from FSM data)."""
+    data = await state.get_data()
+    user_id = data.get("admin_balance_user_id")
+    return int(user_id) if user_id is not None else None
+
+
 @router.callback_query(lambda c: c.data == "admin:users")
 async def cb_admin_users(callback: CallbackQuery, state: FSMContext) -> None:
     """Show search prompt: edit same admin message."""
@@ -365,6 +375,7 @@ async def cb_admin_balance_enter(callback: CallbackQuery, state: FSMContext) ->
 
 
 @router.message(AdminUserStates.balance_amount, F.text)
+@user_lane(_balance_target_lane)
 async def msg_admin_balance_amount(message: Message, state: FSMContext) -> None:
     """Apply new balance and edit admin message to show user profile."""
     if not message.from_user or message.from_user.id not in get_config().get_admin_ids():
@@ -386,9 +397,9 @@ async def msg_admin_balance_amount(message: Message, state: FSMContext) -> None:
         await message.answer("Invalid number. Send an integer.")
         return
     if balance_type == "real":
-        await users_queries.update_balance(user_id, real_balance=amount)
+        await users_queries.update_balance(user_id, real_balance=amount, reason="admin")
     else:
-        await users_queries.update_balance(user_id, demo_balance=amount)
+        await users_queries.update_balance(user_id, demo_balance=amount, reason="admin")
     user = await users_queries.get_user(user_id)
     if not user:
         await message.answer("Done.")
@@ -488,7 +499,11 @@ async def cb_admin_user_stats(callback: CallbackQuery) -> None:
         f"Win rate: {stats['win_rate']}%",
         f"Deposited: {stats['total_deposited']}₽ Withdrawn: {stats['total_withdrawn']}₽",
         f"Won: {stats['total_won']}₽ Lost: {stats['total_lost']}₽",
+        f"Bet: {stats['total_bet']}₽ Biggest win: {stats['biggest_win']}₽",
+        f"Real/demo games: {stats['real_games']}/{stats['demo_games']}",
+        f"Streak: {stats['current_streak']:+d} (best {stats['longest_win_streak']}W / {stats['longest_loss_streak']}L)",
     ]
+    lines += [f"#{g.game_id}{' demo' if g.is_demo else ''}: {g.games} games, {g.wins} wins, {g.bet}₽ → {g.won}₽" for g in stats["per_game"]]
     caption = "Статистика пользователя:\n" + "\n".join(lines) if lang == "ru" else "User stats:\n" + "\n".join(lines)
     kb = admin_user_actions(user_id, lang)
     if callback.message:
@@ -7,10 +7,10 @@ from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.types import CallbackQuery, FSInputFile, Message
 
-from bot.core.games import GAME_LIST
 from bot.database.queries import settings as settings_queries
 from bot.database.queries import users as users_queries
 from bot.keyboards.inline import confirm_bet
+from bot.services.catalog import get_catalog
 from bot.services.game import calculate_win_amount, get_game_info, get_probability
 from bot.templates.texts import get_text
 from bot.utils.helpers import get_image_path
@@ -37,7 +37,7 @@ async def cb_game_custom_amount(callback: CallbackQuery, state: FSMContext) -> N
         outcome_index = int(parts[3])
     except ValueError:
         return
-    if game_id not in GAME_LIST:
+    if game_id not in get_catalog().games:
         return
     info = get_game_info(game_id)
     if outcome_index < 0 or outcome_index >= len(info["outcomes"]):
@@ -80,7 +80,7 @@ async def msg_bet_amount(message: Message, state: FSMContext) -> None:
     game_id = data.get("game_id")
     outcome_index = data.get("outcome_index")
     await state.clear()
-    if game_id is None or outcome_index is None or game_id not in GAME_LIST:
+    if game_id is None or outcome_index is None or game_id not in get_catalog().games:
         await message.answer(get_text("btn_cancel", lang))
         return
     info = get_game_info(game_id)
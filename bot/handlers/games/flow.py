@@ -4,34 +4,36 @@ from __future__ import annotations
 
 import asyncio
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Optional, Tuple
 
 from aiogram import Router
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, FSInputFile, InputMediaPhoto
 
-from bot.core.games import GAME_ID_TO_EMOJI, GAME_ID_TO_IMAGE_SCREEN, GAME_LIST
+from bot.core.constants import AUTOPLAY_LIMIT_MULTIPLIERS, AUTOPLAY_ROUNDS
+from bot.core.exceptions import InsufficientFunds
 from bot.database.queries import games as games_queries
 from bot.database.queries import settings as settings_queries
 from bot.database.queries import user_stats as user_stats_queries
 from bot.database.queries import users as users_queries
-from bot.keyboards.inline import confirm_bet, game_bet_amounts, game_description_keyboard, game_outcomes, game_result_actions, main_menu
+from bot.keyboards.inline import autoplay_limits, autoplay_rounds, autoplay_summary_actions, confirm_bet, game_bet_amounts, game_description_keyboard, game_outcomes, game_result_actions, main_menu
+from bot.services.autoplay import run_autoplay
 from bot.services.balance import check_sufficient, credit_win, deduct_bet
+from bot.services.catalog import get_catalog
+from bot.services.exit_cleanup import exit_cleanup_cache
 from bot.services.game import calculate_win_amount, get_game_info, get_probability, resolve_outcome
+from bot.services.idempotency import get_idempotency_store
+from bot.services.leaderboard import get_leaderboards
+from bot.services.metrics import get_metrics
 from bot.templates.texts import get_text
 from bot.utils.currency import format_currency_rub, format_currency_usd
 from bot.utils.helpers import get_image_path
+from bot.utils.locks import user_lane
 from bot.utils.logger import get_logger
 
 log = get_logger(__name__)
 router = Router(name="games_flow")
 
-# Double-tap protection: (chat_id, message_id) of confirmation messages already processed
-_played_confirm_ids: Set[Tuple[int, int]] = set()
-
-# Exit cleanup: (chat_id, result_message_id) -> (confirm_msg_id, dice_msg_ids) for reliable delete
-_exit_cleanup_cache: Dict[Tuple[int, int], Tuple[int, List[int]]] = {}
-
 # Telegram dice emoji characters
 _DICE_EMOJI: dict[str, str] = {
     "dice": "🎲",
@@ -117,7 +119,7 @@ async def cb_game_description(callback: CallbackQuery) -> None:
         game_id = int(parts[1])
     except ValueError:
         return
-    if game_id not in GAME_LIST:
+    if game_id not in get_catalog().games:
         await callback.answer()
         return
 
@@ -138,7 +140,7 @@ async def cb_game_description(callback: CallbackQuery) -> None:
 
     caption = get_text("game_description", lang, name=name, outcomes="\n".join(outcome_texts))
     kb = game_description_keyboard(lang, game_id)
-    screen = GAME_ID_TO_IMAGE_SCREEN.get(game_id, "gamelist")
+    screen = get_catalog().image_screen(game_id)
     path = get_image_path(screen, lang)
     await _edit_or_send(callback, caption, kb, path)
     await callback.answer()
@@ -156,7 +158,7 @@ async def cb_game_outcomes(callback: CallbackQuery) -> None:
         game_id = int(parts[1])
     except ValueError:
         return
-    if game_id not in GAME_LIST:
+    if game_id not in get_catalog().games:
         return
     user = await users_queries.get_user(callback.from_user.id)
     lang = user.language if user else "en"
@@ -173,7 +175,7 @@ async def cb_game_outcomes(callback: CallbackQuery) -> None:
             outcomes_with_ratios.append(outcome)
 
     kb = game_outcomes(lang, game_id, outcomes_with_ratios)
-    screen = GAME_ID_TO_IMAGE_SCREEN.get(game_id, "gamelist")
+    screen = get_catalog().image_screen(game_id)
     path = get_image_path(screen, lang)
     await _edit_or_send(callback, caption, kb, path)
     await callback.answer()
@@ -192,7 +194,7 @@ async def cb_game_amount(callback: CallbackQuery, **kwargs) -> None:
         outcome_index = int(parts[3])
     except ValueError:
         return
-    if game_id not in GAME_LIST:
+    if game_id not in get_catalog().games:
         return
     user = await users_queries.get_user(callback.from_user.id)
     lang = user.language if user else "en"
@@ -242,7 +244,7 @@ async def cb_game_amount(callback: CallbackQuery, **kwargs) -> None:
 
     kb = game_bet_amounts(lang, game_id, outcome_index, settings.min_bet, presets, preset_buttons=preset_buttons)
 
-    screen = GAME_ID_TO_IMAGE_SCREEN.get(game_id, "gamelist")
+    screen = get_catalog().image_screen(game_id)
     path = get_image_path(screen, lang)
     await _edit_or_send(callback, caption, kb, path)
     await callback.answer()
@@ -262,7 +264,7 @@ async def cb_game_confirm(callback: CallbackQuery, **kwargs) -> None:
         amount = int(parts[5])
     except ValueError:
         return
-    if game_id not in GAME_LIST:
+    if game_id not in get_catalog().games:
         return
     settings = await settings_queries.get_settings()
     if amount < settings.min_bet or amount > settings.max_bet:
@@ -321,6 +323,7 @@ async def cb_game_confirm(callback: CallbackQuery, **kwargs) -> None:
 
 
 @router.callback_query(lambda c: c.data and c.data.startswith("game:") and ":place:" in c.data)
+@user_lane()
 async def cb_game_place(callback: CallbackQuery, state: FSMContext) -> None:
     """Execute bet: deduct, send dice, resolve, credit, save, result. Double-tap protection."""
     if not callback.data or not callback.from_user or not callback.message:
@@ -339,25 +342,25 @@ async def cb_game_place(callback: CallbackQuery, state: FSMContext) -> None:
     lang = user.language if user else "en"
     chat_id = callback.message.chat.id
     msg_id = callback.message.message_id
-    key = (chat_id, msg_id)
-    if key in _played_confirm_ids:
+    # Double-tap protection: each confirmation message can be played once
+    idempotency = get_idempotency_store()
+    if not await idempotency.claim(chat_id, msg_id):
         await callback.answer(get_text("game_already_played", lang), show_alert=True)
         return
-    _played_confirm_ids.add(key)
     balance_row = await users_queries.get_user_balance(user_id)
     if not balance_row:
-        _played_confirm_ids.discard(key)
+        await idempotency.release(chat_id, msg_id)
         await callback.answer(get_text("game_bet_insufficient", lang), show_alert=True)
         return
     is_demo = bool(balance_row.demo_mode)
     sufficient = await check_sufficient(user_id, amount, is_demo)
     if not sufficient:
-        _played_confirm_ids.discard(key)
+        await idempotency.release(chat_id, msg_id)
         await callback.answer(get_text("game_bet_insufficient", lang), show_alert=True)
         return
 
     await deduct_bet(user_id, amount, is_demo)
-    game_type = GAME_ID_TO_EMOJI.get(game_id, "dice")
+    game_type = get_catalog().emoji_type(game_id)
     emoji_char = _DICE_EMOJI.get(game_type, "🎲")
     bot = callback.bot
     fast_mode = bool(user.fast_mode) if user else False
@@ -396,6 +399,8 @@ async def cb_game_place(callback: CallbackQuery, state: FSMContext) -> None:
         played_at=now,
     )
     await user_stats_queries.update_stats_after_game(user_id, is_win, amount, win_amount)
+    get_leaderboards().record(user_id, is_demo, amount, win_amount, now)
+    get_metrics().record(game_id, amount, win_amount, is_demo)
 
     await state.update_data(
         game_exit_confirm_chat_id=chat_id,
@@ -438,11 +443,186 @@ async def cb_game_place(callback: CallbackQuery, state: FSMContext) -> None:
             sent = await callback.message.answer_photo(FSInputFile(str(path)), caption=result_caption, reply_markup=kb)
         else:
             sent = await callback.message.answer(result_caption, reply_markup=kb)
-        _exit_cleanup_cache[(chat_id, sent.message_id)] = (msg_id, list(dice_msg_ids))
+        exit_cleanup_cache.set((chat_id, sent.message_id), (msg_id, tuple(dice_msg_ids)))
     except Exception as e:
         log.warning("Result photo send failed ({}), fallback to text: {}", path, e)
         sent = await callback.message.answer(result_caption, reply_markup=kb)
-        _exit_cleanup_cache[(chat_id, sent.message_id)] = (msg_id, list(dice_msg_ids))
+        exit_cleanup_cache.set((chat_id, sent.message_id), (msg_id, tuple(dice_msg_ids)))
+    await callback.answer()
+
+
+async def _autoplay_rounds_screen(user_id: int, game_id: int, outcome_index: int, amount: int, usd_rate: Optional[float]) -> Optional[Tuple[str, object, str]]:
+    """Build (caption, kb, lang) for the auto-play rounds screen or None if params are invalid."""
+    if game_id not in get_catalog().games:
+        return None
+    settings = await settings_queries.get_settings()
+    if amount < settings.min_bet or amount > settings.max_bet:
+        return None
+    user = await users_queries.get_user(user_id)
+    lang = user.language if user else "en"
+    info = get_game_info(game_id, lang)
+    if outcome_index < 0 or outcome_index >= len(info["outcomes"]):
+        return None
+    caption = get_text(
+        "autoplay_rounds_caption",
+        lang,
+        game_name=info["name"],
+        outcome=info["outcomes"][outcome_index],
+        amount=_format_amount_text(amount, lang, usd_rate),
+    )
+    kb = autoplay_rounds(lang, game_id, outcome_index, amount, list(AUTOPLAY_ROUNDS))
+    return caption, kb, lang
+
+
+@router.callback_query(lambda c: c.data and c.data.startswith("game:auto:"))
+async def cb_game_autoplay(callback: CallbackQuery, **kwargs) -> None:
+    """Auto-play setup: game:auto:GID:OID:AMT -> rounds screen; game:auto:GID:OID:AMT:N -> stop-loss/take-profit screen."""
+    if not callback.data or not callback.from_user:
+        return
+    parts = callback.data.split(":")
+    if len(parts) not in (5, 6):
+        await callback.answer()
+        return
+    try:
+        game_id = int(parts[2])
+        outcome_index = int(parts[3])
+        amount = int(parts[4])
+        rounds = int(parts[5]) if len(parts) == 6 else None
+    except ValueError:
+        await callback.answer()
+        return
+    usd_rate = kwargs.get("usd_rate")
+    screen = await _autoplay_rounds_screen(callback.from_user.id, game_id, outcome_index, amount, usd_rate)
+    if screen is None:
+        await callback.answer()
+        return
+    caption, kb, lang = screen
+    if rounds is not None:
+        if rounds not in AUTOPLAY_ROUNDS:
+            await callback.answer()
+            return
+        caption = get_text(
+            "autoplay_limits_caption",
+            lang,
+            rounds=rounds,
+            reserve=_format_amount_text(amount * rounds, lang, usd_rate),
+        )
+        kb = autoplay_limits(lang, game_id, outcome_index, amount, rounds, list(AUTOPLAY_LIMIT_MULTIPLIERS))
+    path = get_image_path("confirm", lang)
+    await _edit_or_send(callback, caption, kb, path)
+    await callback.answer()
+
+
+@router.callback_query(lambda c: c.data and c.data.startswith("game:autostart:"))
+async def cb_game_autoplay_start(callback: CallbackQuery, **kwargs) -> None:
+    """
+    Start auto-play from the confirm screen or repeat it from the summary: drop the source keyboard and send the rounds
+    screen as a new message, so the series gets its own double-tap key (the confirm message key belongs to game:place).
+    """
+    if not callback.data or not callback.from_user or not callback.message:
+        return
+    parts = callback.data.split(":")
+    if len(parts) != 5:
+        await callback.answer()
+        return
+    try:
+        game_id = int(parts[2])
+        outcome_index = int(parts[3])
+        amount = int(parts[4])
+    except ValueError:
+        await callback.answer()
+        return
+    screen = await _autoplay_rounds_screen(callback.from_user.id, game_id, outcome_index, amount, kwargs.get("usd_rate"))
+    if screen is None:
+        await callback.answer()
+        return
+    caption, kb, lang = screen
+    try:
+        await callback.message.edit_reply_markup(reply_markup=None)
+    except Exception as e:
+        log.debug("Autoplay: could not remove source keyboard: {}", e)
+    path = get_image_path("confirm", lang)
+    if path.exists():
+        await callback.message.answer_photo(FSInputFile(str(path)), caption=caption, reply_markup=kb)
+    else:
+        await callback.message.answer(caption, reply_markup=kb)
+    await callback.answer()
+
+
+@router.callback_query(lambda c: c.data and c.data.startswith("game:autorun:"))
+@user_lane()
+async def cb_game_autoplay_run(callback: CallbackQuery, **kwargs) -> None:
+    """Run auto-play series game:autorun:GID:OID:AMT:N:SL:TP server-side, then edit this message into one summary."""
+    if not callback.data or not callback.from_user or not callback.message:
+        return
+    parts = callback.data.split(":")
+    if len(parts) != 8:
+        await callback.answer()
+        return
+    try:
+        game_id, outcome_index, amount, rounds, sl_mult, tp_mult = (int(p) for p in parts[2:])
+    except ValueError:
+        await callback.answer()
+        return
+    if game_id not in get_catalog().games or rounds not in AUTOPLAY_ROUNDS or sl_mult not in AUTOPLAY_LIMIT_MULTIPLIERS or tp_mult not in AUTOPLAY_LIMIT_MULTIPLIERS:
+        await callback.answer()
+        return
+    user_id = callback.from_user.id
+    user = await users_queries.get_user(user_id)
+    lang = user.language if user else "en"
+    info = get_game_info(game_id, lang)
+    settings = await settings_queries.get_settings()
+    if outcome_index < 0 or outcome_index >= len(info["outcomes"]) or amount < settings.min_bet or amount > settings.max_bet:
+        await callback.answer()
+        return
+    chat_id = callback.message.chat.id
+    msg_id = callback.message.message_id
+    idempotency = get_idempotency_store()
+    if not await idempotency.claim(chat_id, msg_id):
+        await callback.answer(get_text("game_already_played", lang), show_alert=True)
+        return
+    balance_row = await users_queries.get_user_balance(user_id)
+    if not balance_row:
+        await idempotency.release(chat_id, msg_id)
+        await callback.answer(get_text("game_bet_insufficient", lang), show_alert=True)
+        return
+    try:
+        summary = await run_autoplay(
+            user_id,
+            game_id,
+            outcome_index,
+            amount,
+            rounds,
+            is_demo=bool(balance_row.demo_mode),
+            stop_loss=amount * sl_mult,
+            take_profit=amount * tp_mult,
+        )
+    except InsufficientFunds:
+        await idempotency.release(chat_id, msg_id)
+        await callback.answer(get_text("game_bet_insufficient", lang), show_alert=True)
+        return
+
+    usd_rate = kwargs.get("usd_rate")
+    net = summary["net"]
+    net_text = ("+" if net > 0 else "−" if net < 0 else "") + _format_amount_text(abs(net), lang, usd_rate)
+    stopped = get_text(f"autoplay_stopped_{summary['stopped_by']}", lang) if summary["stopped_by"] else ""
+    caption = get_text(
+        "autoplay_summary",
+        lang,
+        game_name=info["name"],
+        outcome=info["outcomes"][outcome_index],
+        played=summary["played"],
+        rounds=summary["rounds"],
+        wins=summary["wins"],
+        losses=summary["losses"],
+        staked=_format_amount_text(summary["staked"], lang, usd_rate),
+        won=_format_amount_text(summary["won"], lang, usd_rate),
+        net=net_text,
+        stopped=stopped,
+    )
+    kb = autoplay_summary_actions(lang, game_id, outcome_index, amount)
+    path = get_image_path("win" if net > 0 else "loss", lang)
+    await _edit_or_send(callback, caption, kb, path)
     await callback.answer()
 
 
@@ -479,7 +659,7 @@ async def cb_game_repeat(callback: CallbackQuery, state: FSMContext, **kwargs) -
     except (ValueError, IndexError):
         await callback.answer()
         return
-    if game_id not in GAME_LIST:
+    if game_id not in get_catalog().games:
         return
     user = await users_queries.get_user(callback.from_user.id)
     lang = user.language if user else "en"
@@ -545,8 +725,9 @@ async def cb_game_exit_cleanup(callback: CallbackQuery, state: FSMContext) -> No
     confirm_msg_id = None
     dice_msg_ids: list[int] = []
     cache_key = (result_chat_id, result_msg_id)
-    if cache_key in _exit_cleanup_cache:
-        confirm_msg_id, dice_msg_ids = _exit_cleanup_cache.pop(cache_key)
+    cached = exit_cleanup_cache.pop(cache_key)
+    if cached is not None:
+        confirm_msg_id, dice_msg_ids = cached[0], list(cached[1])
     if confirm_msg_id is None or not dice_msg_ids:
         parts = (callback.data or "").split(":")
         if len(parts) >= 4:
@@ -11,10 +11,12 @@ from bot.database.queries import payments as payments_queries
 from bot.database.queries import settings as settings_queries
 from bot.database.queries import users as users_queries
 from bot.keyboards.inline import deposit_amounts, deposit_confirm_amount, deposit_contact_screen_keyboard, deposit_menu
+from bot.services.dashboard import get_dashboard
 from bot.services.notify_admin import notify_admins_new_payment_request
 from bot.templates.texts import get_text
 from bot.utils.currency import format_currency_rub, format_currency_usd, get_usd_rate
 from bot.utils.helpers import get_image_path
+from bot.utils.locks import user_lane
 from bot.utils.logger import get_logger
 
 log = get_logger(__name__)
@@ -242,6 +244,7 @@ async def msg_deposit_custom_amount(message: Message, state: FSMContext) -> None
 
 
 @router.callback_query(lambda c: c.data and c.data.startswith("deposit:create:"))
+@user_lane()
 async def cb_deposit_create(callback: CallbackQuery) -> None:
     """Create deposit request (status pending), show confirmation. Requires contact sent first."""
     if not callback.from_user or not callback.data:
@@ -266,6 +269,7 @@ async def cb_deposit_create(callback: CallbackQuery) -> None:
         request_type="deposit",
         amount=amount,
     )
+    get_dashboard().invalidate()
     req = await payments_queries.get_payment_request(request_id)
     if req:
         await notify_admins_new_payment_request(
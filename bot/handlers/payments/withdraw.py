@@ -11,10 +11,12 @@ from bot.database.queries import payments as payments_queries
 from bot.database.queries import settings as settings_queries
 from bot.database.queries import users as users_queries
 from bot.keyboards.inline import deposit_menu, withdraw_amounts, withdraw_confirm_amount
+from bot.services.dashboard import get_dashboard
 from bot.services.notify_admin import notify_admins_new_payment_request
 from bot.templates.texts import get_text
 from bot.utils.currency import format_currency_rub, format_currency_usd, get_usd_rate
 from bot.utils.helpers import get_image_path
+from bot.utils.locks import user_lane
 from bot.utils.logger import get_logger
 
 log = get_logger(__name__)
@@ -160,6 +162,7 @@ async def msg_withdraw_custom_amount(message: Message, state: FSMContext) -> Non
 
 
 @router.callback_query(lambda c: c.data and c.data.startswith("withdraw:create:"))
+@user_lane()
 async def cb_withdraw_create(callback: CallbackQuery) -> None:
     """Create withdraw request (status pending), show confirmation. Requires contact sent first."""
     if not callback.from_user or not callback.data:
@@ -195,6 +198,7 @@ async def cb_withdraw_create(callback: CallbackQuery) -> None:
         request_type="withdraw",
         amount=amount,
     )
+    get_dashboard().invalidate()
     req = await payments_queries.get_payment_request(request_id)
     if req:
         await notify_admins_new_payment_request(
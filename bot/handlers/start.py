@@ -8,6 +8,7 @@ from aiogram.types import FSInputFile, Message
 
 from bot.database.queries import users as users_queries
 from bot.keyboards.inline import main_menu
+from bot.services.dashboard import get_dashboard
 from bot.services.notify_referrer import notify_referrer_new_referral
 from bot.services.referral import generate_referral_link, process_referral_bonuses, validate_referral_link
 from bot.templates.texts import get_text
@@ -55,6 +56,7 @@ async def cmd_start(message: Message) -> None:
             full_name=full_name.strip(),
             referral_link=referral_code,  # ← добавляем ссылку
         )
+        get_dashboard().invalidate()
 
         if referrer_id is not None:
             await process_referral_bonuses(user_id, referrer_id)
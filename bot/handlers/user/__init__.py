@@ -1,7 +1,8 @@
-"""User: profile, settings, stats."""
+"""User: profile, settings, stats, leaderboard."""
 
 from aiogram import Router
 
+from bot.handlers.user.leaderboard import router as leaderboard_router
 from bot.handlers.user.profile import router as profile_router
 from bot.handlers.user.settings import router as settings_router
 from bot.handlers.user.stats import router as stats_router
@@ -10,3 +11,4 @@ router = Router(name="user")
 router.include_router(profile_router)
 router.include_router(settings_router)
 router.include_router(stats_router)
+router.include_router(leaderboard_router)
@@ -0,0 +1,98 @@
+"""Leaderboard screen: top players of the day / week by biggest win or multiplier, real or demo."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Dict, Tuple
+
+from aiogram import Router
+from aiogram.types import CallbackQuery, FSInputFile, InputMediaPhoto
+
+from bot.database.queries import users as users_queries
+from bot.keyboards.inline import leaderboard_menu
+from bot.services.leaderboard import METRICS, PERIODS, get_leaderboards
+from bot.templates.texts import get_text
+from bot.utils.helpers import get_image_path
+from bot.utils.logger import get_logger
+
+log = get_logger(__name__)
+router = Router(name="user_leaderboard")
+
+# (period, metric, is_demo, lang) -> (board version, UTC day, caption): names are looked up only when the board changed
+_render_cache: Dict[Tuple[str, str, bool, str], Tuple[int, str, str]] = {}
+
+
+def _display_name(user) -> str:
+    if user and user.username:
+        return f"@{user.username}"
+    if user and user.first_name:
+        return user.first_name
+    return "—"
+
+
+async def render_leaderboard(period: str, metric: str, is_demo: bool, lang: str) -> str:
+    """Caption for one board; cached until the board version or the UTC day changes."""
+    boards = get_leaderboards()
+    today = datetime.now(timezone.utc).date()
+    key = (period, metric, is_demo, lang)
+    version = boards.version(period, metric, is_demo)
+    cached = _render_cache.get(key)
+    if cached and cached[0] == version and cached[1] == today.isoformat():
+        return cached[2]
+    lines = []
+    for place, (user_id, score) in enumerate(boards.top(period, metric, is_demo, today), start=1):
+        user = await users_queries.get_user(user_id)
+        shown = int(score) if metric == "wins" else score
+        lines.append(get_text(f"lb_line_{metric}", lang, place=place, name=_display_name(user), score=shown))
+    caption = get_text(
+        "lb_caption",
+        lang,
+        title=get_text(f"lb_metric_{metric}", lang),
+        period=get_text(f"lb_period_{period}", lang),
+        mode=get_text("lb_mode_demo" if is_demo else "lb_mode_real", lang),
+        lines="\n".join(lines) if lines else get_text("lb_empty", lang),
+    )
+    _render_cache[key] = (version, today.isoformat(), caption)
+    return caption
+
+
+async def _show(callback: CallbackQuery, period: str, metric: str, is_demo: bool) -> None:
+    user = await users_queries.get_user(callback.from_user.id)
+    lang = user.language if user else "en"
+    caption = await render_leaderboard(period, metric, is_demo, lang)
+    kb = leaderboard_menu(lang, period, metric, is_demo)
+    path = get_image_path("stats", lang)
+    try:
+        if path.exists() and callback.message.photo:
+            await callback.message.edit_media(media=InputMediaPhoto(media=FSInputFile(path), caption=caption), reply_markup=kb)
+        elif callback.message.photo:
+            await callback.message.edit_caption(caption=caption, reply_markup=kb)
+        else:
+            await callback.message.edit_text(caption, reply_markup=kb)
+    except Exception as e:
+        # "message is not modified" when the same board is tapped again
+        log.debug("Leaderboard edit skipped: {}", e)
+
+
+@router.callback_query(lambda c: c.data == "menu:leaderboard")
+async def cb_leaderboard(callback: CallbackQuery) -> None:
+    """Open today's biggest wins in the player's current mode."""
+    if not callback.from_user or not callback.message:
+        return
+    balance_row = await users_queries.get_user_balance(callback.from_user.id)
+    is_demo = bool(balance_row.demo_mode) if balance_row else True
+    await _show(callback, "day", "wins", is_demo)
+    await callback.answer()
+
+
+@router.callback_query(lambda c: c.data and c.data.startswith("lb:"))
+async def cb_leaderboard_switch(callback: CallbackQuery) -> None:
+    """lb:<period>:<metric>:<0|1>."""
+    if not callback.from_user or not callback.message or not callback.data:
+        return
+    parts = callback.data.split(":")
+    if len(parts) != 4 or parts[1] not in PERIODS or parts[2] not in METRICS or parts[3] not in ("0", "1"):
+        await callback.answer()
+        return
+    await _show(callback, parts[1], parts[2], parts[3] == "1")
+    await callback.answer()
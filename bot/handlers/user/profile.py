@@ -10,6 +10,7 @@ from bot.keyboards.inline import account_menu, main_menu
 from bot.services import demo as demo_service
 from bot.templates.texts import get_text
 from bot.utils.helpers import get_image_path, seconds_to_hours_minutes
+from bot.utils.locks import user_lane
 from bot.utils.logger import get_logger
 
 log = get_logger(__name__)
@@ -110,6 +111,7 @@ async def cb_back_account(callback: CallbackQuery, **kwargs: object) -> None:
 
 
 @router.callback_query(lambda c: c.data == "demo:restore")
+@user_lane()
 async def cb_demo_restore(callback: CallbackQuery) -> None:
     """Restore demo balance if allowed (24h cooldown); else show next restore in X hours."""
     if not callback.from_user or not callback.message:
@@ -5,7 +5,7 @@ from __future__ import annotations
 from typing import Dict, List
 from urllib.parse import quote
 
-from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup, WebAppInfo
 
 from bot.templates.texts import get_text
 
@@ -36,7 +36,7 @@ def account_menu(
     need_demo_restore: bool = False,
     demo_mode: bool = True,
 ) -> InlineKeyboardMarkup:
-    """Account: Statistics, Settings; Mode, Deposit; Become a referral; [Restore demo]; Back. (Withdraw is in Deposit screen.)"""
+    """Account: Statistics, Settings; Mode, Deposit; Become a referral, Leaderboard; [Restore demo]; Back. (Withdraw is in Deposit screen.)"""
     rows = [
         [
             InlineKeyboardButton(text=get_text("btn_stats", lang), callback_data="menu:stats"),
@@ -48,6 +48,7 @@ def account_menu(
         ],
         [
             InlineKeyboardButton(text=get_text("btn_referral", lang), callback_data="menu:referral"),
+            InlineKeyboardButton(text=get_text("btn_leaderboard", lang), callback_data="menu:leaderboard"),
         ],
     ]
     if need_demo_restore:
@@ -239,27 +240,61 @@ def withdraw_change_amount(lang: str) -> InlineKeyboardMarkup:
 
 
 def stats_menu(lang: str, webapp_url: str | None = None) -> InlineKeyboardMarkup:
-    """Stats menu: Reset (UI only) and Back to account."""
+    """Stats menu: [View statistics (WebApp)], Game history, Reset (UI only) and Back to account."""
+    rows = []
+    if webapp_url:
+        rows.append([InlineKeyboardButton(text=get_text("btn_stats_view", lang), web_app=WebAppInfo(url=webapp_url))])
     return InlineKeyboardMarkup(
-        inline_keyboard=[
+        inline_keyboard=rows
+        + [
+            [InlineKeyboardButton(text=get_text("btn_stats_history", lang), callback_data="stats:h")],
             [InlineKeyboardButton(text=get_text("btn_stats_reset", lang), callback_data="stats:reset")],
             [InlineKeyboardButton(text=get_text("btn_back", lang), callback_data="account:back")],
         ]
     )
 
 
+def history_page_keyboard(lang: str, newer_than: int | None, older_than: int | None) -> InlineKeyboardMarkup:
+    """History page: Newer (stats:h:p:<first id>) / Older (stats:h:n:<last id>) when such pages exist; Back to stats."""
+    nav = []
+    if newer_than is not None:
+        nav.append(InlineKeyboardButton(text=get_text("btn_history_newer", lang), callback_data=f"stats:h:p:{newer_than}"))
+    if older_than is not None:
+        nav.append(InlineKeyboardButton(text=get_text("btn_history_older", lang), callback_data=f"stats:h:n:{older_than}"))
+    rows = [nav] if nav else []
+    rows.append([InlineKeyboardButton(text=get_text("btn_back", lang), callback_data="menu:stats")])
+    return InlineKeyboardMarkup(inline_keyboard=rows)
+
+
+def leaderboard_menu(lang: str, period: str, metric: str, is_demo: bool) -> InlineKeyboardMarkup:
+    """Leaderboard: period (day/week), metric (wins/multiplier), mode (real/demo) switches; current choice marked; Back."""
+
+    def _btn(text_key: str, data: str, selected: bool) -> InlineKeyboardButton:
+        text = get_text(text_key, lang)
+        return InlineKeyboardButton(text=f"• {text}" if selected else text, callback_data=data)
+
+    demo = 1 if is_demo else 0
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [_btn(f"lb_period_{p}", f"lb:{p}:{metric}:{demo}", p == period) for p in ("day", "week")],
+            [_btn(f"lb_metric_{m}", f"lb:{period}:{m}:{demo}", m == metric) for m in ("wins", "multiplier")],
+            [_btn("lb_mode_real", f"lb:{period}:{metric}:0", not is_demo), _btn("lb_mode_demo", f"lb:{period}:{metric}:1", is_demo)],
+            [InlineKeyboardButton(text=get_text("btn_back", lang), callback_data="account:back")],
+        ]
+    )
+
+
 # ----- Games -----
 def games_list(lang: str) -> InlineKeyboardMarkup:
-    """Eight game buttons from GAME_LIST + Back (to main). row_width=2."""
-    from bot.core.games import GAME_LIST
+    """Game buttons from the catalog snapshot (active games) + Back (to main). row_width=2."""
+    from bot.services.catalog import get_catalog
     from bot.templates.texts import get_text
 
     buttons = []
     row = []
-    for gid in sorted(GAME_LIST.keys()):
-        game = GAME_LIST[gid]
-        name_key = game.get("name_key", f"game_name_{gid}")
-        name = get_text(name_key, lang)
+    games = get_catalog().games
+    for gid in sorted(games.keys()):
+        name = get_text(games[gid].name_key, lang)
 
         row.append(InlineKeyboardButton(text=name, callback_data=f"game:{gid}:bet"))
         if len(row) >= 2:
@@ -358,11 +393,64 @@ def confirm_bet(
                     callback_data=f"game:{game_id}:outcomes",
                 ),
             ],
+            [
+                InlineKeyboardButton(
+                    text=get_text("btn_autoplay", lang),
+                    callback_data=f"game:autostart:{game_id}:{outcome_index}:{amount}",
+                ),
+            ],
             [InlineKeyboardButton(text=get_text("btn_cancel", lang), callback_data="game:list")],
         ]
     )
 
 
+def autoplay_rounds(lang: str, game_id: int, outcome_index: int, amount: int, rounds_options: List[int]) -> InlineKeyboardMarkup:
+    """Auto-play round count: game:auto:GID:OID:AMT:N, Back (to confirm)."""
+    row = [
+        InlineKeyboardButton(
+            text=get_text("autoplay_rounds_btn", lang, rounds=n),
+            callback_data=f"game:auto:{game_id}:{outcome_index}:{amount}:{n}",
+        )
+        for n in rounds_options
+    ]
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            row,
+            [InlineKeyboardButton(text=get_text("btn_back", lang), callback_data=f"game:{game_id}:o:{outcome_index}:a:{amount}")],
+        ]
+    )
+
+
+def autoplay_limits(lang: str, game_id: int, outcome_index: int, amount: int, rounds: int, multipliers: List[int]) -> InlineKeyboardMarkup:
+    """Stop-loss x take-profit grid (multiples of bet, 0 = none): game:autorun:GID:OID:AMT:N:SL:TP, Back (to rounds)."""
+    no_limit = get_text("autoplay_no_limit", lang)
+    buttons = []
+    for sl in multipliers:
+        row = []
+        for tp in multipliers:
+            sl_text = f"−{sl}×" if sl else no_limit
+            tp_text = f"+{tp}×" if tp else no_limit
+            row.append(
+                InlineKeyboardButton(
+                    text=f"{sl_text} / {tp_text}",
+                    callback_data=f"game:autorun:{game_id}:{outcome_index}:{amount}:{rounds}:{sl}:{tp}",
+                )
+            )
+        buttons.append(row)
+    buttons.append([InlineKeyboardButton(text=get_text("btn_back", lang), callback_data=f"game:auto:{game_id}:{outcome_index}:{amount}")])
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+
+def autoplay_summary_actions(lang: str, game_id: int, outcome_index: int, amount: int) -> InlineKeyboardMarkup:
+    """Auto-play summary: Repeat (new rounds screen in a new message) and Exit to main menu."""
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [InlineKeyboardButton(text=get_text("btn_repeat", lang), callback_data=f"game:autostart:{game_id}:{outcome_index}:{amount}")],
+            [InlineKeyboardButton(text=get_text("btn_exit", lang), callback_data="menu:back_main")],
+        ]
+    )
+
+
 def game_result_actions(
     lang: str,
     game_id: int | None = None,
@@ -424,7 +512,7 @@ def help_buttons(admin_username: str, start_text: str, lang: str = "en") -> Inli
 
 # ----- Admin -----
 def admin_main_menu(lang: str = "ru") -> InlineKeyboardMarkup:
-    """Admin panel: 2 columns [Users, Settings] [Payments, Stats], then [Broadcast], then [Exit] (deletes message)."""
+    """Admin panel: 2 columns [Users, Settings] [Payments, Stats] [Broadcast, System], then [Exit] (deletes message)."""
     return InlineKeyboardMarkup(
         inline_keyboard=[
             [
@@ -435,7 +523,10 @@ def admin_main_menu(lang: str = "ru") -> InlineKeyboardMarkup:
                 InlineKeyboardButton(text=get_text("admin_btn_payments", lang), callback_data="admin:payments"),
                 InlineKeyboardButton(text=get_text("admin_btn_stats", lang), callback_data="admin:stats"),
             ],
-            [InlineKeyboardButton(text=get_text("admin_btn_broadcast", lang), callback_data="admin:broadcast")],
+            [
+                InlineKeyboardButton(text=get_text("admin_btn_broadcast", lang), callback_data="admin:broadcast"),
+                InlineKeyboardButton(text=get_text("admin_btn_system", lang), callback_data="admin:system"),
+            ],
             [InlineKeyboardButton(text=get_text("admin_btn_exit", lang), callback_data="admin:exit")],
         ]
     )
@@ -450,8 +541,44 @@ def admin_back_to_panel(lang: str = "ru") -> InlineKeyboardMarkup:
     )
 
 
+def admin_stats_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
+    """Admin stats: Retention analytics, Export games by date range, Back to panel."""
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(text=get_text("admin_btn_analytics", lang), callback_data="admin:analytics"),
+                InlineKeyboardButton(text=get_text("admin_btn_export_range", lang), callback_data="admin:export:range"),
+            ],
+            [InlineKeyboardButton(text=get_text("btn_back", lang), callback_data="admin:panel")],
+        ]
+    )
+
+
+def admin_analytics_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
+    """Analytics: Recompute (background job), Back to admin stats."""
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [InlineKeyboardButton(text=get_text("admin_btn_analytics_run", lang), callback_data="admin:analytics:run")],
+            [InlineKeyboardButton(text=get_text("btn_back", lang), callback_data="admin:stats")],
+        ]
+    )
+
+
+def admin_export_formats(scope: str, back_callback: str, lang: str = "ru") -> InlineKeyboardMarkup:
+    """Export format choice: callback admin:export:<scope>:csv|ndjson (scope = user:ID or range:FROM:TO)."""
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(text="CSV", callback_data=f"admin:export:{scope}:csv"),
+                InlineKeyboardButton(text="NDJSON", callback_data=f"admin:export:{scope}:ndjson"),
+            ],
+            [InlineKeyboardButton(text=get_text("btn_back", lang), callback_data=back_callback)],
+        ]
+    )
+
+
 def admin_user_actions(user_id: int, lang: str = "ru") -> InlineKeyboardMarkup:
-    """User actions: Block, Change balance, Stats, Back."""
+    """User actions: Block, Change balance, Stats, Export history, Back."""
     return InlineKeyboardMarkup(
         inline_keyboard=[
             [
@@ -472,6 +599,12 @@ def admin_user_actions(user_id: int, lang: str = "ru") -> InlineKeyboardMarkup:
                     callback_data=f"admin:user:{user_id}:stats",
                 )
             ],
+            [
+                InlineKeyboardButton(
+                    text=get_text("admin_btn_export", lang),
+                    callback_data=f"admin:user:{user_id}:export",
+                )
+            ],
             [InlineKeyboardButton(text=get_text("btn_back", lang), callback_data="admin:users")],
         ]
     )
@@ -618,6 +751,29 @@ def admin_settings_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
                 InlineKeyboardButton(text="tech_demo", callback_data="admin:set:tech_works_demo"),
                 InlineKeyboardButton(text="tech_real", callback_data="admin:set:tech_works_real"),
             ],
+            [InlineKeyboardButton(text=get_text("admin_btn_catalog", lang), callback_data="admin:catalog")],
             [InlineKeyboardButton(text=get_text("btn_back", lang), callback_data="admin:panel")],
         ]
     )
+
+
+def admin_catalog_games(games: list[tuple[int, str]], lang: str = "ru") -> InlineKeyboardMarkup:
+    """Game ratios: one button per game (game_id, name), 2 per row, then Back to settings."""
+    buttons = []
+    row = []
+    for gid, name in games:
+        row.append(InlineKeyboardButton(text=name, callback_data=f"admin:catalog:{gid}"))
+        if len(row) >= 2:
+            buttons.append(row)
+            row = []
+    if row:
+        buttons.append(row)
+    buttons.append([InlineKeyboardButton(text=get_text("btn_back", lang), callback_data="admin:settings")])
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+
+def admin_catalog_outcomes(game_id: int, outcomes_with_ratios: list[str], lang: str = "ru") -> InlineKeyboardMarkup:
+    """One button per outcome (admin:catalog:GID:OID -> enter new ratio), then Back to games."""
+    buttons = [[InlineKeyboardButton(text=text, callback_data=f"admin:catalog:{game_id}:{i}")] for i, text in enumerate(outcomes_with_ratios)]
+    buttons.append([InlineKeyboardButton(text=get_text("btn_back", lang), callback_data="admin:catalog")])
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
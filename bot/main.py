@@ -15,26 +15,21 @@ from bot.config import get_config
 from bot.core.constants import IMAGES_DIR
 from bot.database.connection import close_db, init_db
 from bot.handlers import get_root_router
-from bot.middlewares import BotInjectMiddleware, CurrencyMiddleware, DemoRestoreMiddleware, LoggingMiddleware, TechWorkMiddleware, UserBlockMiddleware
-from bot.utils.backup import run_backup_and_cleanup
+from bot.middlewares import ActivityMiddleware, BotInjectMiddleware, CurrencyMiddleware, DemoRestoreMiddleware, LoggingMiddleware, TechWorkMiddleware, UserBlockMiddleware
+from bot.services.active_users import active_users_flush_loop
+from bot.services.catalog import catalog_watch_loop, load_catalog
+from bot.services.dashboard import get_dashboard
+from bot.services.jobs import maintenance_jobs
+from bot.services.leaderboard import get_leaderboards
+from bot.services.replica import get_replica
+from bot.services.scheduler import Scheduler
+from bot.services.wal_guard import wal_guard_loop
 from bot.utils.logger import get_logger, setup_logger
+from bot.utils.wal_archive import archive_wal, wal_archive_dir_for
+from bot.webapp import start_webapp
 
 log = get_logger(__name__)
 
-BACKUP_INTERVAL_SECONDS = 86400
-
-
-async def _backup_loop(db_path: str, backups_dir: str) -> None:
-    """Every 24h run backup and cleanup."""
-    while True:
-        await asyncio.sleep(BACKUP_INTERVAL_SECONDS)
-        try:
-            await run_backup_and_cleanup(db_path, backups_dir)
-        except asyncio.CancelledError:
-            break
-        except Exception as e:
-            log.exception("Backup task error: %s", e)
-
 
 async def main() -> None:
     """Run bot: load config, setup logger, init DB, create bot and dispatcher, start polling."""
@@ -52,13 +47,21 @@ async def main() -> None:
 
     await init_db()
     db_path = config.database_path
+    get_replica().configure(db_path)
+    await load_catalog()
+    await get_leaderboards().rebuild()
+    catalog_task = asyncio.create_task(catalog_watch_loop())
+    active_users_task = asyncio.create_task(active_users_flush_loop())
+    replica_task = asyncio.create_task(get_replica().refresh_loop())
+    dashboard_task = asyncio.create_task(get_dashboard().refresh_loop())
     backups_dir = str(Path(db_path).resolve().parent.parent / "backups")
-    backup_task = asyncio.create_task(_backup_loop(db_path, backups_dir))
 
     bot = Bot(
         token=config.bot_token,
         default=DefaultBotProperties(parse_mode=ParseMode.HTML),
     )
+    scheduler_task = asyncio.create_task(Scheduler(maintenance_jobs(db_path, backups_dir, bot), bot=bot).run())
+    wal_guard_task = asyncio.create_task(wal_guard_loop(db_path, bot))
     dp = Dispatcher(storage=MemoryStorage())
     dp.update.outer_middleware(BotInjectMiddleware(bot))
     dp.update.outer_middleware(CurrencyMiddleware())
@@ -66,15 +69,28 @@ async def main() -> None:
     dp.update.outer_middleware(UserBlockMiddleware())
     dp.update.outer_middleware(DemoRestoreMiddleware())
     dp.update.outer_middleware(LoggingMiddleware())
+    dp.update.outer_middleware(ActivityMiddleware())
     dp.include_router(get_root_router())
+    webapp_runner = None
+    if config.webapp_port:
+        origin = "/".join(config.webapp_base_url.split("/")[:3]) if config.webapp_base_url else ""
+        webapp_runner = await start_webapp(config.bot_token, config.webapp_host, config.webapp_port, origin, config.metrics_token)
     try:
         await dp.start_polling(bot)
     finally:
-        backup_task.cancel()
+        if webapp_runner is not None:
+            await webapp_runner.cleanup()
+        for task in (scheduler_task, wal_guard_task, catalog_task, active_users_task, dashboard_task, replica_task):
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        # Last archiver step before close_db checkpoints and removes the WAL, so PITR reaches the shutdown
         try:
-            await backup_task
-        except asyncio.CancelledError:
-            pass
+            await asyncio.to_thread(archive_wal, db_path, wal_archive_dir_for(db_path))
+        except Exception as e:
+            log.warning("Final WAL archive step failed: {}", e)
         await close_db()
         await bot.session.close()
 
@@ -1,5 +1,6 @@
-"""Middlewares: BotInject, TechWork, UserBlock, DemoRestore, Logging, Currency. Register in this order."""
+"""Middlewares: BotInject, TechWork, UserBlock, DemoRestore, Logging, Currency, Activity. Register in this order."""
 
+from bot.middlewares.activity import ActivityMiddleware
 from bot.middlewares.bot_inject import BotInjectMiddleware
 from bot.middlewares.currency import CurrencyMiddleware
 from bot.middlewares.demo import DemoRestoreMiddleware
@@ -14,4 +15,5 @@ __all__ = [
     "DemoRestoreMiddleware",
     "LoggingMiddleware",
     "CurrencyMiddleware",
+    "ActivityMiddleware",
 ]
@@ -0,0 +1,27 @@
+"""ActivityMiddleware: count the sender of every update in today's active-users sketch (DAU / WAU / MAU)."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from typing import Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import Update
+
+from bot.middlewares.logging_mw import _get_event_type_and_user
+from bot.services.active_users import get_active_users
+
+
+class ActivityMiddleware(BaseMiddleware):
+    """In-memory only (one sketch register update); the sketch is written to the DB by active_users_flush_loop."""
+
+    async def __call__(
+        self,
+        handler: Callable[[Update, Dict[str, object]], Awaitable[object]],
+        event: Update,
+        data: Dict[str, object],
+    ) -> object:
+        _, user_id = _get_event_type_and_user(event)
+        if user_id is not None:
+            get_active_users().observe(user_id)
+        return await handler(event, data)
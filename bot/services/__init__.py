@@ -1,8 +1,11 @@
 """Business logic: game, balance, referral, stats, demo, notify."""
 
+from bot.services.autoplay import run_autoplay
 from bot.services.balance import check_sufficient, credit_deposit, credit_referral_bonus, credit_win, deduct_bet, deduct_withdraw
+from bot.services.catalog import get_catalog, load_catalog
 from bot.services.demo import can_restore_demo, perform_demo_restore
 from bot.services.game import calculate_win_amount, get_game_info, get_probability, resolve_outcome
+from bot.services.idempotency import IdempotencyStore, get_idempotency_store
 from bot.services.notify_admin import notify_admins_new_payment_request
 from bot.services.notify_referrer import notify_referrer_new_referral
 from bot.services.referral import generate_referral_link, process_referral_bonuses, validate_referral_link
@@ -23,11 +26,19 @@ __all__ = [
     # notify
     "notify_referrer_new_referral",
     "notify_admins_new_payment_request",
+    # catalog
+    "get_catalog",
+    "load_catalog",
     # game
     "get_game_info",
     "get_probability",
     "resolve_outcome",
     "calculate_win_amount",
+    # autoplay
+    "run_autoplay",
+    # idempotency
+    "IdempotencyStore",
+    "get_idempotency_store",
     # stats
     "get_user_stats_display",
     # demo
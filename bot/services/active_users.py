@@ -0,0 +1,108 @@
+"""Active users: today's HyperLogLog in memory (fed by ActivityMiddleware), flushed to active_users_hll periodically."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from bot.database.queries import active_users as active_users_queries
+from bot.utils.hll import HyperLogLog
+from bot.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+ACTIVE_USERS_FLUSH_SECONDS = 60
+
+
+def _today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+class ActiveUsers:
+    """
+    observe() is a hash plus one register compare, no I/O. flush() merges the in-memory sketches into the stored
+    ones (register max), so several workers writing the same day combine instead of overwriting each other.
+    """
+
+    def __init__(self) -> None:
+        self._days: Dict[str, HyperLogLog] = {}
+        self._dirty: set[str] = set()
+
+    def observe(self, user_id: int, day: Optional[date] = None) -> None:
+        key = (day or _today()).isoformat()
+        sketch = self._days.get(key)
+        if sketch is None:
+            sketch = self._days[key] = HyperLogLog()
+        if sketch.add(user_id):
+            self._dirty.add(key)
+
+    async def flush(self) -> int:
+        """
+        Save changed days; days other than today are dropped from memory once saved. Returns days written. The dirty
+        set is taken before the first await, so observe() calls during the flush mark their day for the next one; days
+        not written because of an error stay dirty and the error is raised.
+        """
+        today = _today().isoformat()
+        pending = sorted(self._dirty)
+        self._dirty = set()
+        written = 0
+        try:
+            for key in pending:
+                sketch = self._days[key]
+                stored = await active_users_queries.get_sketch(key)
+                if stored is not None:
+                    sketch.merge(HyperLogLog.from_bytes(stored))
+                await active_users_queries.save_sketch(key, sketch.to_bytes())
+                written += 1
+        finally:
+            self._dirty.update(pending[written:])
+            for key in [k for k in self._days if k != today and k not in self._dirty]:
+                del self._days[key]
+        return written
+
+    async def counts(self, today: Optional[date] = None) -> Dict[str, int]:
+        """DAU / WAU / MAU: stored daily sketches of the last 1 / 7 / 30 days merged with unsaved in-memory ones."""
+        today = today or _today()
+        sketches: Dict[str, HyperLogLog] = {}
+        for key, blob in await active_users_queries.get_sketches((today - timedelta(days=29)).isoformat()):
+            sketches[key] = HyperLogLog.from_bytes(blob)
+        for key, sketch in self._days.items():
+            if key in sketches:
+                sketches[key].merge(sketch)
+            else:
+                sketches[key] = HyperLogLog(sketch.p, bytes(sketch.registers))
+        result = {}
+        for name, days in (("dau", 1), ("wau", 7), ("mau", 30)):
+            union = HyperLogLog()
+            since = (today - timedelta(days=days - 1)).isoformat()
+            for key, sketch in sketches.items():
+                if since <= key <= today.isoformat():
+                    union.merge(sketch)
+            result[name] = union.count()
+        return result
+
+
+_active_users = ActiveUsers()
+
+
+def get_active_users() -> ActiveUsers:
+    return _active_users
+
+
+async def active_users_flush_loop(interval: float = ACTIVE_USERS_FLUSH_SECONDS) -> None:
+    """Background task: flush every interval seconds, and once more on cancel (shutdown)."""
+    tracker = get_active_users()
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await tracker.flush()
+            except Exception as e:
+                log.warning("Active users flush failed: {}", e)
+    except asyncio.CancelledError:
+        try:
+            await tracker.flush()
+        except Exception as e:
+            log.warning("Active users final flush failed: {}", e)
+        raise
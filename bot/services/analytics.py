@@ -0,0 +1,110 @@
+"""
+Cohort / retention analytics. The live DB is copied with the SQLite backup API into a snapshot file, the GROUP BY
+work runs in a process pool against that file, and the results land in analytics_cache for the admin screen.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from bot.database.queries import analytics as analytics_queries
+from bot.utils.backup import copy_db_snapshot
+from bot.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+RETENTION_DAYS = (1, 7, 30)
+# Signups older than this are left out: activity (games_rollup_players) is only kept ROLLUP_PLAYERS_DAYS anyway
+ANALYTICS_LOOKBACK_DAYS = 90
+TOP_REFERRERS = 10
+_running = asyncio.Lock()
+
+
+def _load(snapshot_path: str, since: str) -> Tuple[List[tuple], Set[Tuple[int, str]]]:
+    """Users signed up since `since` (user_id, signup day, referrer_id, has deposited) and their (user_id, day) activity."""
+    conn = sqlite3.connect(f"file:{snapshot_path}?mode=ro", uri=True)
+    try:
+        users = conn.execute(
+            """
+            SELECT u.user_id, substr(u.created_at, 1, 10), r.referrer_id, COALESCE(s.total_deposited, 0) > 0
+            FROM users u
+            LEFT JOIN referrals r ON r.user_id = u.user_id
+            LEFT JOIN user_stats s ON s.user_id = u.user_id
+            WHERE u.created_at >= ?
+            """,
+            (since,),
+        ).fetchall()
+        activity = set(conn.execute("SELECT DISTINCT user_id, day FROM games_rollup_players WHERE day >= ?", (since,)).fetchall())
+    finally:
+        conn.close()
+    return users, activity
+
+
+def _group_stats(members: List[tuple], activity: Set[Tuple[int, str]], today: date) -> dict:
+    """users, depositors and per-N retention as (eligible, retained): eligible = signed up at least N days ago."""
+    result = {"users": len(members), "depositors": sum(1 for m in members if m[3])}
+    for n in RETENTION_DAYS:
+        eligible = retained = 0
+        for user_id, signup, _, _ in members:
+            target = date.fromisoformat(signup) + timedelta(days=n)
+            if target >= today:
+                continue
+            eligible += 1
+            if (user_id, target.isoformat()) in activity:
+                retained += 1
+        result[f"d{n}"] = [eligible, retained]
+    return result
+
+
+def cohort_matrix(snapshot_path: str, today_iso: str) -> List[dict]:
+    """Retention and deposit conversion per signup ISO week, newest first. Runs in a worker process."""
+    today = date.fromisoformat(today_iso)
+    users, activity = _load(snapshot_path, (today - timedelta(days=ANALYTICS_LOOKBACK_DAYS)).isoformat())
+    cohorts: Dict[str, List[tuple]] = {}
+    for row in users:
+        year, week, _ = date.fromisoformat(row[1]).isocalendar()
+        cohorts.setdefault(f"{year}-W{week:02d}", []).append(row)
+    return [{"cohort": key, **_group_stats(members, activity, today)} for key, members in sorted(cohorts.items(), reverse=True)]
+
+
+def referrer_breakdown(snapshot_path: str, today_iso: str) -> List[dict]:
+    """Same figures per referrer (top TOP_REFERRERS by signups) plus one 'organic' row. Runs in a worker process."""
+    today = date.fromisoformat(today_iso)
+    users, activity = _load(snapshot_path, (today - timedelta(days=ANALYTICS_LOOKBACK_DAYS)).isoformat())
+    groups: Dict[Optional[int], List[tuple]] = {}
+    for row in users:
+        groups.setdefault(row[2], []).append(row)
+    organic = groups.pop(None, [])
+    top = sorted(groups.items(), key=lambda item: (-len(item[1]), item[0]))[:TOP_REFERRERS]
+    rows = [{"referrer_id": referrer_id, **_group_stats(members, activity, today)} for referrer_id, members in top]
+    rows.append({"referrer_id": None, **_group_stats(organic, activity, today)})
+    return rows
+
+
+async def run_analytics_job(db_path: str, work_dir: Path, today: Optional[date] = None) -> bool:
+    """Snapshot -> cohort and referrer tables computed in parallel worker processes -> analytics_cache. False if already running."""
+    if _running.locked():
+        return False
+    async with _running:
+        today = today or datetime.now(timezone.utc).date()
+        snapshot_path = work_dir / "analytics_snapshot.db"
+        snapshot_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.to_thread(copy_db_snapshot, db_path, snapshot_path)
+            with ProcessPoolExecutor(max_workers=2) as pool:
+                cohorts, referrers = await asyncio.gather(
+                    loop.run_in_executor(pool, cohort_matrix, str(snapshot_path), today.isoformat()),
+                    loop.run_in_executor(pool, referrer_breakdown, str(snapshot_path), today.isoformat()),
+                )
+            await analytics_queries.save_result("cohorts", cohorts, snapshot_at)
+            await analytics_queries.save_result("referrers", referrers, snapshot_at)
+            log.info("Analytics: {} cohorts, {} referrer groups", len(cohorts), len(referrers))
+        finally:
+            snapshot_path.unlink(missing_ok=True)
+    return True
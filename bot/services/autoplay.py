@@ -0,0 +1,87 @@
+"""Auto-play: run a series of rounds server-side, then settle it (debit, credit, games, stats) in one transaction."""
+
+from __future__ import annotations
+
+import secrets
+from datetime import datetime, timezone
+from typing import List, Union
+
+from bot.core.exceptions import InsufficientFunds
+from bot.database.queries import games as games_queries
+from bot.services.balance import check_sufficient
+from bot.services.catalog import get_catalog
+from bot.services.game import calculate_win_amount, get_game_info, resolve_outcome
+from bot.services.leaderboard import get_leaderboards
+from bot.services.metrics import get_metrics
+
+
+def roll_dice(game_id: int) -> Union[int, List[int]]:
+    """Server-side roll in the same value range as the Telegram dice of the game (two dice for game 1)."""
+    if game_id == 1:
+        return [secrets.randbelow(6) + 1, secrets.randbelow(6) + 1]
+    faces = int(get_game_info(game_id)["all_outcomes_num"])
+    return secrets.randbelow(faces) + 1
+
+
+async def run_autoplay(
+    user_id: int,
+    game_id: int,
+    outcome_index: int,
+    amount: int,
+    rounds: int,
+    is_demo: bool,
+    stop_loss: int = 0,
+    take_profit: int = 0,
+) -> dict:
+    """
+    Resolve rounds against a reserve of amount * rounds until stop_loss / take_profit (0 = off) is hit, then
+    settle the series with games_queries.settle_series: the reserve debit, the credit of winnings plus unplayed
+    stakes, all games and the stats update commit together or not at all. Raises InsufficientFunds if the reserve
+    is not covered.
+    """
+    reserve = amount * rounds
+    if not await check_sufficient(user_id, reserve, is_demo):
+        raise InsufficientFunds(f"user {user_id}: {reserve} required for {rounds} rounds")
+
+    game_type = get_catalog().emoji_type(game_id)
+    played_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    rows = []
+    wins = 0
+    total_won = 0
+    total_lost = 0
+    stopped_by = None
+    for _ in range(rounds):
+        is_win, outcome_name, ratio = resolve_outcome(game_id, outcome_index, roll_dice(game_id))
+        win_amount = calculate_win_amount(amount, ratio) if is_win else 0
+        rows.append((user_id, game_type, game_id, amount, outcome_name, is_win, win_amount, is_demo, played_at))
+        if is_win:
+            wins += 1
+            total_won += win_amount
+        else:
+            total_lost += amount
+        net = total_won - amount * len(rows)
+        if stop_loss and net <= -stop_loss:
+            stopped_by = "stop_loss"
+            break
+        if take_profit and net >= take_profit:
+            stopped_by = "take_profit"
+            break
+
+    played = len(rows)
+    refund = amount * (rounds - played)
+    if not await games_queries.settle_series(user_id, is_demo, reserve, total_won + refund, rows, total_won, total_lost):
+        raise InsufficientFunds(f"user {user_id}: {reserve} required for {rounds} rounds")
+    get_leaderboards().record_rows(rows)
+    metrics = get_metrics()
+    for row in rows:
+        metrics.record(game_id, row[3], row[6], is_demo)
+    return {
+        "rounds": rounds,
+        "played": played,
+        "wins": wins,
+        "losses": played - wins,
+        "staked": amount * played,
+        "won": total_won,
+        "net": total_won - amount * played,
+        "stopped_by": stopped_by,
+    }
@@ -25,10 +25,10 @@ async def deduct_bet(user_id: int, amount: int, is_demo: bool) -> None:
         return
     if is_demo:
         new_balance = max(0, row.demo_balance - amount)
-        await users_queries.update_balance(user_id, demo_balance=new_balance)
+        await users_queries.update_balance(user_id, demo_balance=new_balance, reason="bet")
     else:
         new_balance = max(0, row.real_balance - amount)
-        await users_queries.update_balance(user_id, real_balance=new_balance)
+        await users_queries.update_balance(user_id, real_balance=new_balance, reason="bet")
 
 
 async def credit_win(user_id: int, amount: int, is_demo: bool) -> None:
@@ -37,9 +37,9 @@ async def credit_win(user_id: int, amount: int, is_demo: bool) -> None:
     if not row:
         return
     if is_demo:
-        await users_queries.update_balance(user_id, demo_balance=row.demo_balance + amount)
+        await users_queries.update_balance(user_id, demo_balance=row.demo_balance + amount, reason="win")
     else:
-        await users_queries.update_balance(user_id, real_balance=row.real_balance + amount)
+        await users_queries.update_balance(user_id, real_balance=row.real_balance + amount, reason="win")
 
 
 async def credit_referral_bonus(user_id: int, amount: int) -> None:
@@ -47,7 +47,7 @@ async def credit_referral_bonus(user_id: int, amount: int) -> None:
     row = await users_queries.get_user_balance(user_id)
     if not row:
         return
-    await users_queries.update_balance(user_id, real_balance=row.real_balance + amount)
+    await users_queries.update_balance(user_id, real_balance=row.real_balance + amount, reason="referral")
 
 
 async def credit_deposit(user_id: int, amount: int) -> None:
@@ -55,7 +55,7 @@ async def credit_deposit(user_id: int, amount: int) -> None:
     row = await users_queries.get_user_balance(user_id)
     if not row:
         return
-    await users_queries.update_balance(user_id, real_balance=row.real_balance + amount)
+    await users_queries.update_balance(user_id, real_balance=row.real_balance + amount, reason="deposit")
 
 
 async def deduct_withdraw(user_id: int, amount: int) -> None:
@@ -64,4 +64,4 @@ async def deduct_withdraw(user_id: int, amount: int) -> None:
     if not row:
         return
     new_balance = max(0, row.real_balance - amount)
-    await users_queries.update_balance(user_id, real_balance=new_balance)
+    await users_queries.update_balance(user_id, real_balance=new_balance, reason="withdraw")
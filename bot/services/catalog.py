@@ -0,0 +1,140 @@
+"""Game catalog: immutable snapshot compiled from games_catalog, swapped atomically; workers follow the version counter."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Iterable, List, Mapping, Optional, Tuple
+
+from bot.core.games import GAME_ID_TO_EMOJI, GAME_ID_TO_IMAGE_SCREEN, GAME_LIST
+from bot.database.models import GameCatalogEntry
+from bot.database.queries import games_catalog as catalog_queries
+from bot.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# How often each worker checks games_catalog_version (one PK read)
+CATALOG_POLL_SECONDS = 30
+
+
+@dataclass(frozen=True)
+class GameSpec:
+    """One game as the hot path sees it."""
+
+    game_id: int
+    emoji_type: str
+    image_screen: str
+    name_key: str
+    outcome_keys: Tuple[str, ...]
+    ratios: Tuple[float, ...]
+    win_outcome_value: Tuple[Optional[Tuple[int, ...]], ...]
+    all_outcomes_num: int
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Read-only view of all active games at one catalog version. Replaced as a whole, never mutated."""
+
+    version: int
+    games: Mapping[int, GameSpec]
+
+    def emoji_type(self, game_id: int) -> str:
+        spec = self.games.get(game_id)
+        return spec.emoji_type if spec else "dice"
+
+    def image_screen(self, game_id: int) -> str:
+        spec = self.games.get(game_id)
+        return spec.image_screen if spec else "gamelist"
+
+
+def default_entries() -> List[GameCatalogEntry]:
+    """Catalog rows built from the hardcoded GAME_LIST (seed data and fallback before the DB is loaded)."""
+    return [
+        GameCatalogEntry(
+            game_id=gid,
+            emoji_type=GAME_ID_TO_EMOJI.get(gid, "dice"),
+            image_screen=GAME_ID_TO_IMAGE_SCREEN.get(gid, "gamelist"),
+            name_key=str(game.get("name_key", f"game_name_{gid}")),
+            outcome_keys=list(game["outcome_keys"]),
+            ratios=[float(r) for r in game["ratios"]],
+            win_outcome_value=list(game["win_outcome_value"]),
+            all_outcomes_num=int(game["all_outcomes_num"]),
+            updated_at="",
+        )
+        for gid, game in sorted(GAME_LIST.items())
+    ]
+
+
+def compile_snapshot(entries: Iterable[GameCatalogEntry], version: int) -> CatalogSnapshot:
+    """Validate rows and freeze them. Inactive or inconsistent games are left out (and logged)."""
+    games = {}
+    for e in entries:
+        if not e.is_active:
+            continue
+        # win_outcome_value is per outcome, or [None] for paired-dice games (game 1 compares two dice)
+        paired = e.win_outcome_value == [None]
+        if len(e.outcome_keys) != len(e.ratios) or not (paired or len(e.win_outcome_value) == len(e.outcome_keys)) or e.all_outcomes_num <= 0:
+            log.warning("Catalog: game {} skipped (outcomes/ratios/values length mismatch)", e.game_id)
+            continue
+        games[e.game_id] = GameSpec(
+            game_id=e.game_id,
+            emoji_type=e.emoji_type,
+            image_screen=e.image_screen,
+            name_key=e.name_key,
+            outcome_keys=tuple(e.outcome_keys),
+            ratios=tuple(float(r) for r in e.ratios),
+            win_outcome_value=tuple(None if v is None else tuple(v) for v in e.win_outcome_value),
+            all_outcomes_num=e.all_outcomes_num,
+        )
+    return CatalogSnapshot(version=version, games=MappingProxyType(games))
+
+
+_snapshot: CatalogSnapshot = compile_snapshot(default_entries(), version=0)
+
+
+def get_catalog() -> CatalogSnapshot:
+    """Current snapshot (no DB access)."""
+    return _snapshot
+
+
+async def load_catalog() -> CatalogSnapshot:
+    """Seed missing games from GAME_LIST, read the table, compile and swap the snapshot."""
+    global _snapshot
+    await catalog_queries.seed_catalog(default_entries())
+    version = await catalog_queries.get_catalog_version()
+    snapshot = compile_snapshot(await catalog_queries.get_catalog_entries(), version)
+    _snapshot = snapshot
+    log.info("Catalog: loaded version {} ({} games)", version, len(snapshot.games))
+    return snapshot
+
+
+async def refresh_if_changed() -> bool:
+    """Reload the snapshot if another worker (or admin edit) bumped the version. Returns True if reloaded."""
+    global _snapshot
+    version = await catalog_queries.get_catalog_version()
+    if version == _snapshot.version:
+        return False
+    _snapshot = compile_snapshot(await catalog_queries.get_catalog_entries(), version)
+    log.info("Catalog: switched to version {}", version)
+    return True
+
+
+async def set_ratio(game_id: int, outcome_index: int, ratio: float) -> bool:
+    """Admin edit: persist the ratio, bump the version and swap this worker's snapshot right away."""
+    if not await catalog_queries.set_outcome_ratio(game_id, outcome_index, ratio):
+        return False
+    await refresh_if_changed()
+    return True
+
+
+async def catalog_watch_loop(interval: float = CATALOG_POLL_SECONDS) -> None:
+    """Background task: follow the version counter so edits made by other workers show up without restart."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await refresh_if_changed()
+        except asyncio.CancelledError:
+            break
+        except Exception as e:
+            log.warning("Catalog: version check failed: {}", e)
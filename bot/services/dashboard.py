@@ -0,0 +1,124 @@
+"""Admin dashboard snapshot: the Admin → Stats figures computed in the background and kept in memory."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+from bot.database.queries import payments as payments_queries
+from bot.database.queries import rollups as rollups_queries
+from bot.database.queries import user_stats as stats_queries
+from bot.database.queries import users as users_queries
+from bot.services.active_users import get_active_users
+from bot.services.replica import get_replica
+from bot.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+DASHBOARD_REFRESH_SECONDS = 60
+# Burst of invalidations (e.g. an admin approving a queue of payments) -> at most one recompute per this many seconds
+DASHBOARD_MIN_REFRESH_SECONDS = 5
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    """Period figures are (rounds, wins, turnover, payouts) of real-money games plus demo rounds."""
+
+    users_count: int
+    games_count: int
+    total_deposited: int
+    total_withdrawn: int
+    pending_count: int
+    today: Tuple[int, int, int, int]
+    today_demo_rounds: int
+    last_24h: Tuple[int, int, int, int]
+    last_24h_demo_rounds: int
+    players_today: int
+    active: Dict[str, int]
+    computed_at: str
+
+
+async def compute_snapshot() -> DashboardSnapshot:
+    """
+    All aggregate reads of the admin stats screen. Games come from games_rollup_* (not purged with history). The
+    reads go to the read replica when it is fresh enough; computed_at is then the replica's as-of time.
+    """
+    now = datetime.now(timezone.utc)
+    today = now.strftime("%Y-%m-%d")
+    last_24h = (now - timedelta(hours=23)).strftime("%Y-%m-%dT%H")
+    async with get_replica().reading() as as_of:
+        deposited, withdrawn = await stats_queries.get_aggregate_totals()
+        return DashboardSnapshot(
+            users_count=await users_queries.get_users_count(),
+            games_count=await rollups_queries.get_total_rounds(),
+            total_deposited=deposited,
+            total_withdrawn=withdrawn,
+            pending_count=len(await payments_queries.get_pending_requests()),
+            today=await rollups_queries.get_rollup_totals("games_rollup_daily", today, is_demo=0),
+            today_demo_rounds=(await rollups_queries.get_rollup_totals("games_rollup_daily", today, is_demo=1))[0],
+            last_24h=await rollups_queries.get_rollup_totals("games_rollup_hourly", last_24h, is_demo=0),
+            last_24h_demo_rounds=(await rollups_queries.get_rollup_totals("games_rollup_hourly", last_24h, is_demo=1))[0],
+            players_today=await rollups_queries.get_unique_players(today),
+            active=await get_active_users().counts(),
+            computed_at=as_of or now.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        )
+
+
+class Dashboard:
+    """
+    Holds the last snapshot. get() is a memory read once the first snapshot exists; refresh_loop() recomputes every
+    DASHBOARD_REFRESH_SECONDS or soon after invalidate() (new user, payment request created or processed).
+    """
+
+    def __init__(self) -> None:
+        self._snapshot: Optional[DashboardSnapshot] = None
+        self._refreshed_at = 0.0
+        self._dirty = asyncio.Event()
+        self._lock = asyncio.Lock()
+
+    @property
+    def snapshot(self) -> Optional[DashboardSnapshot]:
+        return self._snapshot
+
+    def invalidate(self) -> None:
+        self._dirty.set()
+
+    async def refresh(self) -> DashboardSnapshot:
+        """Recompute now; concurrent callers share one computation."""
+        started = time.monotonic()
+        async with self._lock:
+            if self._snapshot is not None and self._refreshed_at >= started:
+                return self._snapshot
+            self._dirty.clear()
+            self._snapshot = await compute_snapshot()
+            self._refreshed_at = time.monotonic()
+            return self._snapshot
+
+    async def get(self) -> DashboardSnapshot:
+        """Last snapshot; only the very first call (before the loop has run) computes inline."""
+        return self._snapshot or await self.refresh()
+
+    async def refresh_loop(self, interval: float = DASHBOARD_REFRESH_SECONDS, min_interval: float = DASHBOARD_MIN_REFRESH_SECONDS) -> None:
+        """Background task: refresh on schedule or on invalidation, debounced by min_interval."""
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.warning("Dashboard refresh failed: {}", e)
+            await asyncio.sleep(min_interval)
+            try:
+                await asyncio.wait_for(self._dirty.wait(), timeout=max(0.0, interval - min_interval))
+            except asyncio.TimeoutError:
+                pass
+
+
+_dashboard = Dashboard()
+
+
+def get_dashboard() -> Dashboard:
+    return _dashboard
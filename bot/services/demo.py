@@ -44,5 +44,5 @@ async def perform_demo_restore(user_id: int) -> None:
     """
     settings = await settings_queries.get_settings()
     now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-    await users_queries.update_balance(user_id, demo_balance=settings.demo_balance)
+    await users_queries.update_balance(user_id, demo_balance=settings.demo_balance, reason="demo_restore")
     await demo_queries.upsert_demo_reset(user_id, now)
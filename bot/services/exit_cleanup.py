@@ -0,0 +1,12 @@
+"""Game exit cleanup: result message -> confirmation and dice message ids, so Exit can delete the whole round."""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+from bot.core.constants import EXIT_CLEANUP_MAX_ENTRIES, EXIT_CLEANUP_TTL_SECONDS
+from bot.utils.cache import TTLCache
+
+# (chat_id, result_message_id) -> (confirm_msg_id, dice_msg_ids). Bounded LRU with TTL;
+# on a miss the game handler recovers the ids from the exit button's callback_data.
+exit_cleanup_cache: TTLCache[Tuple[int, int], Tuple[int, Tuple[int, ...]]] = TTLCache(maxsize=EXIT_CLEANUP_MAX_ENTRIES, ttl=EXIT_CLEANUP_TTL_SECONDS)
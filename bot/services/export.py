@@ -0,0 +1,118 @@
+"""Game / payment history export: rows streamed from a read-only connection (plus the games archive) into gzip CSV or NDJSON."""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import gzip
+import io
+import json
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional, Sequence, Tuple
+
+from bot.utils.archive import iter_archived_games
+
+# Rows per fetchmany(): memory stays at one batch regardless of export size
+EXPORT_FETCH_ROWS = 2000
+EXPORT_FORMATS = ("csv", "ndjson")
+
+_TABLES = {
+    "games": ("id, user_id, game_type, game_id, bet_amount, outcome, is_win, win_amount, is_demo, played_at", "played_at"),
+    "payments": (
+        "id, user_id, request_type, amount, status, payment_method, payment_details, created_at, processed_at, processed_by",
+        "created_at",
+    ),
+}
+_SOURCES = {"games": "games", "payments": "payment_requests"}
+
+
+@dataclass(frozen=True)
+class ExportFilter:
+    """One user's history (user_id) and/or a [date_from, date_to] range of 'YYYY-MM-DD' days (inclusive)."""
+
+    user_id: Optional[int] = None
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+
+
+def _build_query(kind: str, flt: ExportFilter, source: Optional[str] = None) -> Tuple[str, list]:
+    columns, time_col = _TABLES[kind]
+    where, params = [], []
+    if flt.user_id is not None:
+        where.append("user_id = ?")
+        params.append(flt.user_id)
+    if flt.date_from:
+        where.append(f"{time_col} >= ?")
+        params.append(flt.date_from)
+    if flt.date_to:
+        # played_at / created_at are 'YYYY-MM-DDTHH:MM:SSZ': everything on date_to sorts below date_to + 'U'
+        where.append(f"{time_col} < ?")
+        params.append(flt.date_to + "U")
+    sql = f"SELECT {columns} FROM {source or _SOURCES[kind]}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    return sql + " ORDER BY id", params
+
+
+def iter_rows(db_path: str, sql: str, params: Sequence, batch: Optional[int] = None) -> Iterator[tuple]:
+    """Yield rows in fetchmany batches from a separate read-only connection (does not touch the bot's connection)."""
+    batch = batch or EXPORT_FETCH_ROWS
+    conn = sqlite3.connect(f"file:{Path(db_path).resolve()}?mode=ro", uri=True)
+    try:
+        cursor = conn.execute(sql, params)
+        while rows := cursor.fetchmany(batch):
+            yield from rows
+    finally:
+        conn.close()
+
+
+def _after_archived(archived: Iterator[tuple], hot: Iterator[tuple]) -> Iterator[tuple]:
+    """Archived rows, then hot rows with a higher id (a replica copy may still hold rows archived since)."""
+    last_id = None
+    for row in archived:
+        last_id = row[0]
+        yield row
+    for row in hot:
+        if last_id is None or row[0] > last_id:
+            yield row
+
+
+def write_export(db_path: str, kind: str, fmt: str, out_path: Path, flt: ExportFilter, source_path: Optional[str] = None) -> int:
+    """
+    Stream kind ('games' | 'payments') into gzip out_path as CSV (with header) or NDJSON. Blocking. Returns row count.
+    Hot rows are read from source_path (the read replica) when given, else from db_path.
+    """
+    if kind not in _TABLES or fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export: {kind}/{fmt}")
+    sql, params = _build_query(kind, flt)
+    rows = iter_rows(source_path or db_path, sql, params)
+    if kind == "games":
+        # Archived months first (older ids), then the hot table
+        archived = iter_archived_games(db_path, lambda table: _build_query(kind, flt, table)[0], params, flt.date_from, flt.date_to)
+        rows = _after_archived(archived, rows)
+    names = [c.strip() for c in _TABLES[kind][0].split(",")]
+    count = 0
+    with gzip.open(out_path, "wb", compresslevel=6) as raw, io.TextIOWrapper(raw, encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(names)
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        else:
+            for row in rows:
+                f.write(json.dumps(dict(zip(names, row)), ensure_ascii=False) + "\n")
+                count += 1
+    return count
+
+
+async def export_history(db_path: str, kind: str, fmt: str, out_dir: Path, flt: ExportFilter, source_path: Optional[str] = None) -> Tuple[Path, int]:
+    """Run write_export in a worker thread. Returns (file path, row count); the caller removes the file after sending."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    scope = f"user{flt.user_id}" if flt.user_id is not None else "all"
+    period = f"_{flt.date_from or 'start'}_{flt.date_to or 'now'}" if flt.date_from or flt.date_to else ""
+    out_path = out_dir / f"{kind}_{scope}{period}.{fmt}.gz"
+    count = await asyncio.to_thread(write_export, db_path, kind, fmt, out_path, flt, source_path)
+    return out_path, count
@@ -1,35 +1,26 @@
-"""Game outcome resolution and win calculation from GAME_LIST."""
+"""Game outcome resolution and win calculation from the game catalog snapshot."""
 
 from __future__ import annotations
 
 from typing import List, Union
 
-from bot.core.games import GAME_LIST
+from bot.services.catalog import get_catalog
 from bot.templates.texts import get_text
 
 
 def get_game_info(game_id: int, lang: str = "en") -> dict:
-    """Return game info with translated names and outcomes."""
-    if game_id not in GAME_LIST:
+    """Return game info with translated names and outcomes (from the current catalog snapshot)."""
+    game = get_catalog().games.get(game_id)
+    if game is None:
         raise KeyError(f"Unknown game_id: {game_id}")
 
-    game = GAME_LIST[game_id]
-
-    # Get translated name
-    name_key = game.get("name_key", f"game_name_{game_id}")
-    name = get_text(name_key, lang)
-
-    # Get translated outcomes
-    outcome_keys = game.get("outcome_keys", [])
-    outcomes = [get_text(key, lang) for key in outcome_keys]
-
     # Create result with translations
     return {
-        "name": name,
-        "outcomes": outcomes,
-        "ratios": game["ratios"],
-        "win_outcome_value": game["win_outcome_value"],
-        "all_outcomes_num": game["all_outcomes_num"],
+        "name": get_text(game.name_key, lang),
+        "outcomes": [get_text(key, lang) for key in game.outcome_keys],
+        "ratios": list(game.ratios),
+        "win_outcome_value": [None if v is None else list(v) for v in game.win_outcome_value],
+        "all_outcomes_num": game.all_outcomes_num,
     }
 
 
@@ -0,0 +1,99 @@
+"""Idempotency store: one-shot claims on (chat_id, message_id) with TTL, bounded memory and optional SQLite backend."""
+
+from __future__ import annotations
+
+import time
+from typing import Optional, Tuple
+
+from bot.database.queries import idempotency as idempotency_queries
+from bot.utils.cache import TTLCache
+from bot.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# SQLite backend: delete expired rows once per this many claims
+_PURGE_EVERY = 500
+
+Key = Tuple[int, int]
+
+
+class IdempotencyStore:
+    """
+    claim() returns True exactly once per key until the claim expires (ttl seconds) or is released.
+    backend="memory": bounded TTLCache, per process. backend="sqlite": idempotency_keys table
+    (survives restarts, shared by workers on the same DB file) with the TTLCache as a local fast path.
+    """
+
+    def __init__(self, backend: str = "memory", ttl: int = 86400, maxsize: int = 50000) -> None:
+        if backend not in ("memory", "sqlite"):
+            raise ValueError(f"Unknown idempotency backend: {backend}")
+        self.backend = backend
+        self.ttl = ttl
+        self._local: TTLCache[Key, bool] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._claims_since_purge = 0
+        self.claimed = 0
+        self.rejected = 0
+
+    async def claim(self, chat_id: int, message_id: int) -> bool:
+        key = (chat_id, message_id)
+        if key in self._local:
+            self.rejected += 1
+            return False
+        if self.backend == "sqlite":
+            now = int(time.time())
+            if not await idempotency_queries.claim_key(chat_id, message_id, now, now + self.ttl):
+                self._local.set(key, True)
+                self.rejected += 1
+                return False
+            await self._maybe_purge(now)
+        self._local.set(key, True)
+        self.claimed += 1
+        return True
+
+    async def release(self, chat_id: int, message_id: int) -> None:
+        """Drop a claim so the same message can be used again (only on paths where nothing was charged)."""
+        self._local.pop((chat_id, message_id))
+        if self.backend == "sqlite":
+            await idempotency_queries.release_key(chat_id, message_id)
+
+    async def _maybe_purge(self, now: int) -> None:
+        self._claims_since_purge += 1
+        if self._claims_since_purge < _PURGE_EVERY:
+            return
+        self._claims_since_purge = 0
+        try:
+            deleted = await idempotency_queries.purge_expired_keys(now)
+            if deleted:
+                log.debug("Idempotency: purged {} expired keys", deleted)
+        except Exception as e:
+            log.warning("Idempotency: purge failed: {}", e)
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend,
+            "local_keys": len(self._local),
+            "local_max": self._local.maxsize,
+            "claimed": self.claimed,
+            "rejected": self.rejected,
+            "evicted": self._local.evictions,
+        }
+
+
+_store: Optional[IdempotencyStore] = None
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    """Process-wide store configured from env (IDEMPOTENCY_BACKEND, IDEMPOTENCY_TTL_SECONDS, IDEMPOTENCY_MAX_KEYS)."""
+    global _store
+    if _store is None:
+        try:
+            from bot.config import get_config
+
+            cfg = get_config()
+        except Exception as e:
+            # No env (tests, scripts): per-process defaults. A bad IDEMPOTENCY_BACKEND still raises below.
+            log.debug("Idempotency: config not loaded ({}), using memory backend", e)
+            _store = IdempotencyStore()
+        else:
+            _store = IdempotencyStore(cfg.idempotency_backend, cfg.idempotency_ttl_seconds, cfg.idempotency_max_keys)
+    return _store
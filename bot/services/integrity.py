@@ -0,0 +1,34 @@
+"""Integrity monitor job: background checks (bot/utils/integrity.py) with an admin alert when the findings change."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Optional, Tuple
+
+from bot.services.notify_admin import notify_admins_integrity
+from bot.utils.integrity import IntegrityReport, check_integrity
+from bot.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# Findings of the last alert: the same problems are not re-sent every run
+_last_alerted: Optional[Tuple] = None
+
+
+def _fingerprint(report: IntegrityReport) -> Tuple:
+    return tuple(report.problems), tuple((m.user_id, m.account, m.balance, m.ledger) for m in report.mismatches)
+
+
+async def run_integrity_check(db_path: str, bot=None) -> IntegrityReport:
+    """Scheduler job: check in a thread, log the result, alert admins (when a bot is given) about new findings."""
+    global _last_alerted
+    report = await asyncio.to_thread(check_integrity, db_path)
+    if report.ok:
+        _last_alerted = None
+        log.info("Integrity check ok: {} tables, {} users in {:.1f}s", report.tables, report.users, report.seconds)
+        return report
+    log.error("Integrity check failed: {} problems, {} balance mismatches", len(report.problems), len(report.mismatches))
+    if bot is not None and _fingerprint(report) != _last_alerted:
+        await notify_admins_integrity(bot, report)
+        _last_alerted = _fingerprint(report)
+    return report
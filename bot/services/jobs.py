@@ -0,0 +1,45 @@
+"""The bot's scheduled maintenance jobs (specs are UTC cron, see bot/utils/cron.py)."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import List
+
+from bot.services.analytics import run_analytics_job
+from bot.services.integrity import run_integrity_check
+from bot.services.scheduler import Job
+from bot.utils.backup import run_backup, run_cleanup
+from bot.utils.cron import CronSpec
+from bot.utils.maintenance import analyze, incremental_vacuum, optimize
+from bot.utils.wal_archive import run_base_backup, run_wal_archive
+
+SCHEDULES = {
+    "backup": "0 3 1 * *",
+    "cleanup": "30 3 * * *",
+    # Archiving the WAL is also what checkpoints it (the bot connection has wal_autocheckpoint off)
+    "wal_archive": "* * * * *",
+    "base_backup": "20 2 * * *",
+    "optimize": "45 */6 * * *",
+    "analyze": "0 4 * * 0",
+    # Off-peak (night in UTC+3): vacuum steps hold the write lock briefly
+    "vacuum": "0 1 * * *",
+    "analytics": "15 */6 * * *",
+    "integrity": "40 * * * *",
+}
+
+
+def maintenance_jobs(db_path: str, backups_dir: str, bot=None) -> List[Job]:
+    """bot (optional) is used for admin alerts."""
+    work_dir = Path(db_path).resolve().parent / "analytics"
+    return [
+        Job("backup", CronSpec(SCHEDULES["backup"]), lambda: run_backup(db_path, backups_dir), jitter=300, lease_seconds=6 * 3600),
+        Job("cleanup", CronSpec(SCHEDULES["cleanup"]), lambda: run_cleanup(db_path), jitter=300, lease_seconds=6 * 3600),
+        Job("wal_archive", CronSpec(SCHEDULES["wal_archive"]), lambda: run_wal_archive(db_path), jitter=5, lease_seconds=600),
+        Job("base_backup", CronSpec(SCHEDULES["base_backup"]), lambda: run_base_backup(db_path), jitter=300, lease_seconds=6 * 3600),
+        Job("optimize", CronSpec(SCHEDULES["optimize"]), lambda: asyncio.to_thread(optimize, db_path), jitter=120, lease_seconds=600),
+        Job("analyze", CronSpec(SCHEDULES["analyze"]), lambda: asyncio.to_thread(analyze, db_path), jitter=300, lease_seconds=3600),
+        Job("vacuum", CronSpec(SCHEDULES["vacuum"]), lambda: asyncio.to_thread(incremental_vacuum, db_path), jitter=300, lease_seconds=3 * 3600),
+        Job("analytics", CronSpec(SCHEDULES["analytics"]), lambda: run_analytics_job(db_path, work_dir), jitter=120, lease_seconds=3600),
+        Job("integrity", CronSpec(SCHEDULES["integrity"]), lambda: run_integrity_check(db_path, bot), jitter=120, lease_seconds=3600),
+    ]
@@ -0,0 +1,153 @@
+"""Leaderboards: bounded top-K per (period, metric, demo/real), updated on settle, rebuilt from rollups at startup."""
+
+from __future__ import annotations
+
+import heapq
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from bot.database.queries import rollups as rollups_queries
+from bot.services.replica import get_replica
+from bot.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+LEADERBOARD_SIZE = 10
+PERIODS = ("day", "week")
+# wins: biggest single win (₽); multiplier: best win_amount / bet. Both only grow within a period,
+# so a bounded top-K is exact without keeping every player's score.
+METRICS = ("wins", "multiplier")
+
+BoardKey = Tuple[str, str, bool]
+
+
+def period_id(period: str, day: date) -> str:
+    """'YYYY-MM-DD' for day, ISO week 'YYYY-Www' for week."""
+    if period == "day":
+        return day.isoformat()
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+class TopK:
+    """
+    Top-k scores, one entry per user, for scores that only increase. Min-heap of (score, user_id) with lazy
+    deletion: raising a member pushes a new entry and the stale one is skipped when it reaches the top.
+    """
+
+    def __init__(self, k: int) -> None:
+        self.k = k
+        self._scores: Dict[int, float] = {}
+        self._heap: List[Tuple[float, int]] = []
+
+    def offer(self, user_id: int, score: float) -> bool:
+        """Record score for user; returns True if the board changed."""
+        if score <= 0:
+            return False
+        current = self._scores.get(user_id)
+        if current is not None:
+            if score <= current:
+                return False
+        elif len(self._scores) >= self.k:
+            if score <= self.min_score():
+                return False
+            _, evicted = heapq.heappop(self._heap)
+            del self._scores[evicted]
+        self._scores[user_id] = score
+        heapq.heappush(self._heap, (score, user_id))
+        if len(self._heap) > 4 * self.k:
+            self._heap = [(s, u) for u, s in self._scores.items()]
+            heapq.heapify(self._heap)
+        return True
+
+    def min_score(self) -> float:
+        while self._heap and self._scores.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else 0.0
+
+    def items(self) -> List[Tuple[int, float]]:
+        """(user_id, score), best first."""
+        return sorted(self._scores.items(), key=lambda item: (-item[1], item[0]))
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+
+class Leaderboards:
+    """All boards of the current day and week. A board whose period has rolled over is started from scratch."""
+
+    def __init__(self, k: int = LEADERBOARD_SIZE) -> None:
+        self.k = k
+        self._boards: Dict[BoardKey, Tuple[str, TopK]] = {}
+        self.versions: Dict[BoardKey, int] = {}
+
+    def _board(self, key: BoardKey, pid: str) -> Optional[TopK]:
+        """Board for period pid; None for rounds of an already finished period."""
+        stored = self._boards.get(key)
+        if stored is not None and stored[0] == pid:
+            return stored[1]
+        if stored is not None and stored[0] > pid:
+            return None
+        board = TopK(self.k)
+        self._boards[key] = (pid, board)
+        self.versions[key] = self.versions.get(key, 0) + 1
+        return board
+
+    def record(self, user_id: int, is_demo: bool, bet_amount: int, win_amount: int, played_at: str) -> None:
+        """Apply one settled round (played_at 'YYYY-MM-DDTHH:MM:SSZ')."""
+        if win_amount <= 0:
+            return
+        day = date.fromisoformat(played_at[:10])
+        scores = {"wins": float(win_amount), "multiplier": round(win_amount / bet_amount, 2) if bet_amount > 0 else 0.0}
+        for period in PERIODS:
+            pid = period_id(period, day)
+            for metric, score in scores.items():
+                key = (period, metric, bool(is_demo))
+                board = self._board(key, pid)
+                if board is not None and board.offer(user_id, score):
+                    self.versions[key] = self.versions.get(key, 0) + 1
+
+    def record_rows(self, rows: Iterable[tuple]) -> None:
+        """Rows in the games_queries.save_games layout."""
+        for row in rows:
+            self.record(row[0], bool(row[7]), row[3], row[6], row[8])
+
+    def top(self, period: str, metric: str, is_demo: bool, today: Optional[date] = None) -> List[Tuple[int, float]]:
+        """Current standings, best first (empty if the stored board belongs to an older period)."""
+        today = today or datetime.now(timezone.utc).date()
+        stored = self._boards.get((period, metric, bool(is_demo)))
+        if stored is None or stored[0] != period_id(period, today):
+            return []
+        return stored[1].items()
+
+    def version(self, period: str, metric: str, is_demo: bool) -> int:
+        return self.versions.get((period, metric, bool(is_demo)), 0)
+
+    async def rebuild(self, today: Optional[date] = None) -> None:
+        """Fill the current day and week boards from games_rollup_players (one indexed range read)."""
+        today = today or datetime.now(timezone.utc).date()
+        week_start = today - timedelta(days=today.weekday())
+        self._boards.clear()
+        for key in list(self.versions):
+            self.versions[key] += 1
+        async with get_replica().reading():
+            rows = await rollups_queries.get_period_player_bests(week_start.isoformat())
+        for day_str, user_id, is_demo, biggest_win, best_multiplier in rows:
+            day = date.fromisoformat(day_str)
+            for period in PERIODS:
+                if period == "day" and day != today:
+                    continue
+                pid = period_id(period, today)
+                for metric, score in (("wins", float(biggest_win)), ("multiplier", round(best_multiplier, 2))):
+                    key = (period, metric, bool(is_demo))
+                    board = self._board(key, pid)
+                    if board is not None:
+                        board.offer(user_id, score)
+        log.info("Leaderboards rebuilt from {} rollup rows", len(rows))
+
+
+_leaderboards = Leaderboards()
+
+
+def get_leaderboards() -> Leaderboards:
+    return _leaderboards
@@ -0,0 +1,115 @@
+"""Live house metrics: real-money rounds, turnover, payouts and GGR per game in per-second / per-minute rings."""
+
+from __future__ import annotations
+
+import time
+from array import array
+from typing import Dict, Optional
+
+# Window name -> seconds. 1m / 5m read the per-second ring, 1h the per-minute ring.
+WINDOWS = {"1m": 60, "5m": 300, "1h": 3600}
+_SECOND_SLOTS = 300
+_MINUTE_SLOTS = 60
+
+
+class Ring:
+    """
+    Fixed ring of time slots (slot_seconds wide) holding rounds / bets / payouts. All storage is allocated in
+    __init__ as array('q'); record() only overwrites integers in place. A slot is reused when its stamp (absolute
+    slot number) is older than the current one, so no sweeper is needed.
+    """
+
+    __slots__ = ("slots", "slot_seconds", "stamps", "rounds", "bets", "payouts")
+
+    def __init__(self, slots: int, slot_seconds: int) -> None:
+        self.slots = slots
+        self.slot_seconds = slot_seconds
+        self.stamps = array("q", [-1]) * slots
+        self.rounds = array("q", [0]) * slots
+        self.bets = array("q", [0]) * slots
+        self.payouts = array("q", [0]) * slots
+
+    def record(self, now: float, bet: int, payout: int) -> None:
+        slot = int(now) // self.slot_seconds
+        i = slot % self.slots
+        if self.stamps[i] != slot:
+            self.stamps[i] = slot
+            self.rounds[i] = 0
+            self.bets[i] = 0
+            self.payouts[i] = 0
+        self.rounds[i] += 1
+        self.bets[i] += bet
+        self.payouts[i] += payout
+
+    def window(self, now: float, seconds: int) -> tuple[int, int, int]:
+        """(rounds, bets, payouts) over the last `seconds` including the current slot."""
+        current = int(now) // self.slot_seconds
+        oldest = current - min(self.slots, max(1, seconds // self.slot_seconds)) + 1
+        rounds = bets = payouts = 0
+        for i in range(self.slots):
+            if oldest <= self.stamps[i] <= current:
+                rounds += self.rounds[i]
+                bets += self.bets[i]
+                payouts += self.payouts[i]
+        return rounds, bets, payouts
+
+
+class GameMetrics:
+    """Per-second (last 5 min) and per-minute (last hour) rings of one game."""
+
+    __slots__ = ("seconds", "minutes")
+
+    def __init__(self) -> None:
+        self.seconds = Ring(_SECOND_SLOTS, 1)
+        self.minutes = Ring(_MINUTE_SLOTS, 60)
+
+    def record(self, now: float, bet: int, payout: int) -> None:
+        self.seconds.record(now, bet, payout)
+        self.minutes.record(now, bet, payout)
+
+    def window(self, now: float, seconds: int) -> tuple[int, int, int]:
+        ring = self.seconds if seconds <= _SECOND_SLOTS else self.minutes
+        return ring.window(now, seconds)
+
+
+class HouseMetrics:
+    """Real-money rounds only (demo is not house P&L). Rings for a game are allocated the first time it is seen."""
+
+    def __init__(self) -> None:
+        self.games: Dict[int, GameMetrics] = {}
+
+    def record(self, game_id: int, bet: int, payout: int, is_demo: bool = False, now: Optional[float] = None) -> None:
+        if is_demo:
+            return
+        game = self.games.get(game_id)
+        if game is None:
+            game = self.games[game_id] = GameMetrics()
+        game.record(time.time() if now is None else now, bet, payout)
+
+    def snapshot(self, now: Optional[float] = None) -> dict:
+        """{window: {"total": {...}, "games": {game_id: {...}}}} with rounds, turnover, payouts and ggr."""
+        now = time.time() if now is None else now
+        result = {}
+        for name, seconds in WINDOWS.items():
+            games = {}
+            total = [0, 0, 0]
+            for game_id, game in sorted(self.games.items()):
+                rounds, bets, payouts = game.window(now, seconds)
+                if rounds:
+                    games[game_id] = _figures(rounds, bets, payouts)
+                    total[0] += rounds
+                    total[1] += bets
+                    total[2] += payouts
+            result[name] = {"total": _figures(*total), "games": games}
+        return result
+
+
+def _figures(rounds: int, bets: int, payouts: int) -> dict:
+    return {"rounds": rounds, "turnover": bets, "payouts": payouts, "ggr": bets - payouts}
+
+
+_metrics = HouseMetrics()
+
+
+def get_metrics() -> HouseMetrics:
+    return _metrics
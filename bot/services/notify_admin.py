@@ -12,6 +12,7 @@ from bot.database.queries import users as users_queries
 from bot.keyboards.inline import admin_new_request_notification_keyboard
 from bot.templates.texts import get_text
 from bot.utils.helpers import get_image_path
+from bot.utils.integrity import IntegrityReport
 from bot.utils.logger import get_logger
 
 log = get_logger(__name__)
@@ -72,3 +73,28 @@ async def notify_admins_new_payment_request(
                 )
         except Exception as e:
             log.warning("Failed to notify admin {} of new request {}: {}", admin_id, request_id, e)
+
+
+async def notify_admins_text(bot, key: str, **kwargs) -> None:
+    """Send every admin the text key in their language (operational alerts without buttons)."""
+    for admin_id in get_config().get_admin_ids():
+        try:
+            admin_user = await users_queries.get_user(admin_id)
+            lang = admin_user.language if admin_user else "ru"
+            await bot.send_message(admin_id, get_text(key, lang, **kwargs), parse_mode=ParseMode.HTML)
+        except Exception as e:
+            log.warning("Failed to send {} to admin {}: {}", key, admin_id, e)
+
+
+async def notify_admins_integrity(bot, report: IntegrityReport) -> None:
+    """Send every admin the failed integrity checks (quick_check messages, balance mismatches) in their language."""
+    for admin_id in get_config().get_admin_ids():
+        try:
+            admin_user = await users_queries.get_user(admin_id)
+            lang = admin_user.language if admin_user else "ru"
+            lines = [html.escape(problem) for problem in report.problems]
+            lines += [get_text("admin_integrity_balance", lang, user_id=m.user_id, account=m.account, balance=m.balance, ledger=m.ledger) for m in report.mismatches]
+            text = get_text("admin_integrity_alert", lang, details="\n".join(lines), tables=report.tables, users=report.users)
+            await bot.send_message(admin_id, text, parse_mode=ParseMode.HTML)
+        except Exception as e:
+            log.warning("Failed to send integrity alert to admin {}: {}", admin_id, e)
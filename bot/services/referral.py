@@ -12,6 +12,7 @@ from bot.database.queries import referrals as referrals_queries
 from bot.database.queries import settings as settings_queries
 from bot.database.queries import users as users_queries
 from bot.services.balance import credit_referral_bonus
+from bot.utils.locks import user_lanes
 
 
 def generate_referral_link(user_id: int, bot_username: str) -> str:
@@ -84,7 +85,9 @@ async def process_referral_bonuses(user_id: int, referrer_id: int) -> bool:
     settings = await settings_queries.get_settings()
     amount = settings.referral_bonus
     await referrals_queries.add_referral(user_id, referrer_id)
-    await credit_referral_bonus(user_id, amount)
-    await credit_referral_bonus(referrer_id, amount)
+    # Each credit runs in that user's lane so it cannot interleave with their bets (see bot.utils.locks)
+    for uid in (user_id, referrer_id):
+        async with user_lanes.hold(uid):
+            await credit_referral_bonus(uid, amount)
     await referrals_queries.set_bonus_credited(user_id)
     return True
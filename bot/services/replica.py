@@ -0,0 +1,198 @@
+"""
+Read replica for heavy reads (admin stats, exports, leaderboard rebuild): two copies of the DB in <db dir>/replica,
+a.db and b.db. A refresh rewrites the copy nobody is reading and then makes it the current one. It replays the WAL
+archive segments since that copy's last refresh (bot/utils/wal_archive.py) when they are all there, otherwise it
+takes a full backup-API copy in small steps. Reads fall back to the primary while the replica lags more than
+REPLICA_MAX_LAG_SECONDS.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional
+
+import aiosqlite
+
+from bot.database.connection import use_connection
+from bot.utils.backup import copy_db_snapshot
+from bot.utils.logger import get_logger
+from bot.utils.wal_archive import archive_position, replay_segments, segments_after, wal_archive_dir_for
+
+log = get_logger(__name__)
+
+REPLICA_REFRESH_SECONDS = 60
+REPLICA_MAX_LAG_SECONDS = 300
+_TS_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+_BUFFERS = ("a", "b")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime(_TS_FORMAT)
+
+
+def _page_size(path: Path) -> int:
+    with open(path, "rb") as f:
+        f.seek(16)
+        value = int.from_bytes(f.read(2), "big")
+    return 65536 if value == 1 else value
+
+
+def _mark_rollback_journal(path: Path) -> None:
+    """
+    Page 1 copied from the primary says WAL mode; as a rollback-journal file the copy opens read-only without
+    -wal / -shm files. Header bytes 18-19 are the file format read / write versions (1 = legacy, 2 = WAL).
+    """
+    with open(path, "r+b") as f:
+        f.seek(18)
+        f.write(b"\x01\x01")
+
+
+def refresh_buffer(db_path: str, buffer: Path, position: Optional[dict]) -> dict:
+    """
+    Bring one replica file up to date (blocking: call via asyncio.to_thread). position is what the last refresh
+    of this file returned: {"seq": archive seq or None, "as_of": time, "mode": "incremental" | "full"}.
+    """
+    archive_dir = wal_archive_dir_for(db_path)
+    archived = archive_position(archive_dir)
+    if position and position.get("seq") is not None and archived and buffer.exists() and archived[0] >= position["seq"]:
+        segments = segments_after(archive_dir, position["seq"], archived[0])
+        if segments is not None:
+            replay_segments(buffer, segments, _page_size(buffer))
+            _mark_rollback_journal(buffer)
+            return {"seq": archived[0], "as_of": max(archived[1], position["as_of"]), "mode": "incremental"}
+    # Commits after the archive position read here may also be in the copy; replaying them again later is harmless
+    started = _now()
+    partial = buffer.with_name(buffer.name + ".partial")
+    copy_db_snapshot(db_path, partial)
+    _mark_rollback_journal(partial)
+    os.replace(partial, buffer)
+    return {"seq": archived[0] if archived else None, "as_of": started, "mode": "full"}
+
+
+class Replica:
+    """
+    Readers pin the current copy (reading() / read_path()); refresh() never rewrites a pinned copy, it skips a round
+    instead. Unconfigured (no configure() call, e.g. in tests) every read goes to the primary.
+    """
+
+    def __init__(self, max_lag: float = REPLICA_MAX_LAG_SECONDS) -> None:
+        self.max_lag = max_lag
+        self.db_path: Optional[str] = None
+        self.dir: Optional[Path] = None
+        self._state: Dict[str, Optional[dict]] = {"active": None}
+        self._pins: Dict[str, int] = {name: 0 for name in _BUFFERS}
+        self._conns: Dict[str, aiosqlite.Connection] = {}
+        self._lock = asyncio.Lock()
+
+    def configure(self, db_path: str, replica_dir: Optional[Path] = None) -> None:
+        """Point at the primary; a copy left by the previous run is reused (and refreshed incrementally)."""
+        self.db_path = db_path
+        self.dir = replica_dir or Path(db_path).resolve().parent / "replica"
+        self.dir.mkdir(parents=True, exist_ok=True)
+        state_path = self.dir / "state.json"
+        if state_path.exists():
+            self._state = json.loads(state_path.read_text(encoding="utf-8"))
+
+    def _buffer(self, name: str) -> Path:
+        return self.dir / f"{name}.db"
+
+    @property
+    def current(self) -> Optional[dict]:
+        """Position of the copy reads go to: {"seq", "as_of", "mode"}, None before the first refresh."""
+        active = self._state.get("active")
+        return self._state.get(active) if active else None
+
+    def lag_seconds(self, now: Optional[datetime] = None) -> Optional[float]:
+        """How far the replica is behind the primary; None before the first refresh."""
+        if self.current is None:
+            return None
+        now = now or datetime.now(timezone.utc)
+        as_of = datetime.strptime(self.current["as_of"], _TS_FORMAT).replace(tzinfo=timezone.utc)
+        return max(0.0, (now - as_of).total_seconds())
+
+    def is_fresh(self) -> bool:
+        lag = self.lag_seconds()
+        return lag is not None and lag <= self.max_lag
+
+    async def refresh(self) -> bool:
+        """Update the idle copy and switch reads to it. False when that copy is still being read (retry later)."""
+        if self.db_path is None:
+            return False
+        async with self._lock:
+            active = self._state.get("active")
+            target = "b" if active == "a" else "a"
+            if self._pins[target]:
+                return False
+            conn = self._conns.pop(target, None)
+            if conn is not None:
+                await conn.close()
+            position = await asyncio.to_thread(refresh_buffer, self.db_path, self._buffer(target), self._state.get(target))
+            self._state[target] = position
+            self._state["active"] = target
+            (self.dir / "state.json").write_text(json.dumps(self._state, indent=2, sort_keys=True), encoding="utf-8")
+            return True
+
+    @asynccontextmanager
+    async def _pin(self) -> AsyncIterator[Optional[str]]:
+        active = self._state.get("active") if self.db_path is not None and self.is_fresh() else None
+        if active is None:
+            yield None
+            return
+        self._pins[active] += 1
+        try:
+            yield active
+        finally:
+            self._pins[active] -= 1
+
+    @asynccontextmanager
+    async def reading(self) -> AsyncIterator[Optional[str]]:
+        """
+        Queries in this block (current task) read the replica; yields its as_of time, or None when the replica is
+        missing / too stale and the block reads the primary.
+        """
+        async with self._pin() as name:
+            if name is None:
+                yield None
+                return
+            conn = self._conns.get(name)
+            if conn is None:
+                conn = await aiosqlite.connect(f"file:{self._buffer(name)}?mode=ro", uri=True)
+                conn.row_factory = aiosqlite.Row
+                self._conns[name] = conn
+            with use_connection(conn):
+                yield self._state[name]["as_of"]
+
+    @asynccontextmanager
+    async def read_path(self) -> AsyncIterator[Optional[str]]:
+        """Path of the pinned replica file for a separate (threaded) reader, or None to use the primary."""
+        async with self._pin() as name:
+            yield str(self._buffer(name)) if name else None
+
+    async def refresh_loop(self, interval: float = REPLICA_REFRESH_SECONDS) -> None:
+        """Background task: refresh every interval; connections are closed on cancel."""
+        try:
+            while True:
+                try:
+                    await self.refresh()
+                except Exception as e:
+                    log.warning("Replica refresh failed: {}", e)
+                await asyncio.sleep(interval)
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        for conn in self._conns.values():
+            await conn.close()
+        self._conns.clear()
+
+
+_replica = Replica()
+
+
+def get_replica() -> Replica:
+    return _replica
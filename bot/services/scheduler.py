@@ -0,0 +1,139 @@
+"""
+Maintenance scheduler: cron-like jobs with the last run kept in scheduler_jobs. A job is due once the first slot
+after its last run has passed (plus jitter), so a restart never skips a slot — a missed run happens on the next
+tick. Each run takes a lease in the DB first, so with several workers on one DB only one of them runs it. A failed
+run does not count as a run: the slot stays due and is retried after a backoff that doubles per failure and never
+reaches past the job's next slot; the admins are alerted on the first failure in a row.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import html
+import os
+import random
+import socket
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from bot.database.queries import scheduler as scheduler_queries
+from bot.services.notify_admin import notify_admins_text
+from bot.utils.cron import CronSpec
+from bot.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+SCHEDULER_TICK_SECONDS = 30
+# Retry delay after the n-th failure in a row: base * 2^(n-1), at most the max and never past the next slot
+JOB_RETRY_BASE_SECONDS = 60
+JOB_RETRY_MAX_SECONDS = 3600
+_TS_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def _ts(dt: datetime) -> str:
+    return dt.strftime(_TS_FORMAT)
+
+
+def _parse_ts(value: str) -> datetime:
+    return datetime.strptime(value, _TS_FORMAT).replace(tzinfo=timezone.utc)
+
+
+@dataclass
+class Job:
+    """run() should keep blocking work off the event loop (to_thread / process pool)."""
+
+    name: str
+    spec: CronSpec
+    run: Callable[[], Awaitable[object]]
+    # Random delay up to this many seconds after the slot, so workers / bots sharing a host do not all start at :00
+    jitter: float = 60.0
+    # Lease length: another worker may take the job over if a run holds it longer (crashed worker)
+    lease_seconds: float = 3600.0
+
+
+class Scheduler:
+    def __init__(self, jobs: List[Job], owner: Optional[str] = None, bot=None) -> None:
+        """bot (optional) is used to alert admins about failed jobs."""
+        self.jobs = {job.name: job for job in jobs}
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        self.bot = bot
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # job name -> (slot, jitter seconds): drawn once per slot
+        self._jitter: Dict[str, Tuple[datetime, float]] = {}
+
+    def due_at(self, job: Job, last_run_at: str) -> datetime:
+        slot = job.spec.next_after(_parse_ts(last_run_at))
+        cached = self._jitter.get(job.name)
+        if cached is None or cached[0] != slot:
+            cached = self._jitter[job.name] = (slot, random.uniform(0, job.jitter))
+        return slot + timedelta(seconds=cached[1])
+
+    async def tick(self, now: Optional[datetime] = None) -> List[str]:
+        """Start every due job this worker can lease. Returns the names started."""
+        now = now or datetime.now(timezone.utc)
+        records = await scheduler_queries.get_jobs()
+        started = []
+        for name, job in self.jobs.items():
+            task = self._tasks.get(name)
+            if task is not None and not task.done():
+                continue
+            record = records.get(name)
+            if record is None:
+                await scheduler_queries.register_job(name, _ts(now))
+                continue
+            if now < self.due_at(job, record["last_run_at"]):
+                continue
+            if record["retry_at"] is not None and now < _parse_ts(record["retry_at"]):
+                continue
+            until = _ts(now + timedelta(seconds=job.lease_seconds))
+            if not await scheduler_queries.acquire_lease(name, self.owner, record["last_run_at"], _ts(now), until):
+                continue
+            self._tasks[name] = asyncio.create_task(self._run(job, now))
+            started.append(name)
+        return started
+
+    def retry_at(self, job: Job, failed_at: datetime, failures: int) -> datetime:
+        """When the slot is tried again after the failures-th failure in a row."""
+        delay = min(JOB_RETRY_BASE_SECONDS * 2 ** (failures - 1), JOB_RETRY_MAX_SECONDS)
+        return min(failed_at + timedelta(seconds=delay), job.spec.next_after(failed_at))
+
+    async def _run(self, job: Job, now: datetime) -> None:
+        started = time.monotonic()
+        try:
+            await job.run()
+        except asyncio.CancelledError:
+            await scheduler_queries.release_lease(job.name, self.owner)
+            raise
+        except Exception as e:
+            log.exception("Scheduled job {} failed: {}", job.name, e)
+            await self._record_failure(job, now, str(e)[:500], time.monotonic() - started)
+            return
+        duration = time.monotonic() - started
+        await scheduler_queries.finish_run(job.name, self.owner, _ts(now), "ok", None, duration)
+        log.info("Scheduled job {}: ok in {:.1f}s", job.name, duration)
+
+    async def _record_failure(self, job: Job, now: datetime, error: str, duration: float) -> None:
+        records = await scheduler_queries.get_jobs()
+        failures = (records[job.name]["failures"] or 0) + 1
+        retry_at = _ts(self.retry_at(job, now, failures))
+        failures = await scheduler_queries.record_failure(job.name, self.owner, error, duration, retry_at)
+        log.warning("Scheduled job {}: failure {} in a row, retry at {}", job.name, failures, retry_at)
+        if failures == 1 and self.bot is not None:
+            await notify_admins_text(self.bot, "admin_job_failed_alert", name=job.name, error=html.escape(error), retry_at=retry_at)
+
+    async def run(self, tick_seconds: float = SCHEDULER_TICK_SECONDS) -> None:
+        """Background task: tick forever; on cancel, cancel running jobs (their leases are released)."""
+        try:
+            while True:
+                try:
+                    await self.tick()
+                except Exception as e:
+                    log.warning("Scheduler tick failed: {}", e)
+                await asyncio.sleep(tick_seconds)
+        finally:
+            running = [task for task in self._tasks.values() if not task.done()]
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
@@ -19,6 +19,14 @@ async def get_user_stats_display(user_id: int) -> dict:
             "total_withdrawn": 0,
             "total_won": 0,
             "total_lost": 0,
+            "total_bet": 0,
+            "biggest_win": 0,
+            "current_streak": 0,
+            "longest_win_streak": 0,
+            "longest_loss_streak": 0,
+            "real_games": 0,
+            "demo_games": 0,
+            "per_game": [],
         }
 
     # Calculate win rate
@@ -36,4 +44,12 @@ async def get_user_stats_display(user_id: int) -> dict:
         "total_withdrawn": stats.total_withdrawn,
         "total_won": stats.total_won,
         "total_lost": stats.total_lost,
+        "total_bet": stats.total_bet,
+        "biggest_win": stats.biggest_win,
+        "current_streak": stats.current_streak,
+        "longest_win_streak": stats.longest_win_streak,
+        "longest_loss_streak": stats.longest_loss_streak,
+        "real_games": stats.real_games,
+        "demo_games": stats.demo_games,
+        "per_game": await stats_queries.get_user_game_stats(user_id),
     }
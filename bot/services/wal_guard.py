@@ -0,0 +1,60 @@
+"""
+WAL size guard: the bot connection never checkpoints (wal_autocheckpoint=0), so while the scheduler's wal_archive
+job is not running the WAL grows without bound. Every WAL_GUARD_SECONDS the -wal size is checked; above
+WAL_GUARD_BYTES the guard runs an archiver step itself, and if the archiver has been idle for WAL_GUARD_IDLE_SECONDS
+the admins are alerted (once, until the WAL is back under the limit).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Optional
+
+from bot.services.notify_admin import notify_admins_text
+from bot.utils.logger import get_logger
+from bot.utils.maintenance import file_sizes
+from bot.utils.wal_archive import archive_position, run_wal_archive, wal_archive_dir_for
+
+log = get_logger(__name__)
+
+WAL_GUARD_BYTES = 256 * 1024 * 1024
+WAL_GUARD_SECONDS = 60
+WAL_GUARD_IDLE_SECONDS = 300
+
+_alerted = False
+
+
+def _archiver_idle_seconds(db_path: str, now: datetime) -> Optional[float]:
+    """Seconds since the last archiver step; None if it never ran."""
+    position = archive_position(wal_archive_dir_for(db_path))
+    if position is None:
+        return None
+    at = datetime.strptime(position[1], "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+    return (now - at).total_seconds()
+
+
+async def check_wal_size(db_path: str, bot=None, now: Optional[datetime] = None) -> bool:
+    """One guard round. True when the WAL was over WAL_GUARD_BYTES and an archiver step was forced."""
+    global _alerted
+    wal_bytes = file_sizes(db_path)[1]
+    if wal_bytes < WAL_GUARD_BYTES:
+        _alerted = False
+        return False
+    idle = _archiver_idle_seconds(db_path, now or datetime.now(timezone.utc))
+    log.warning("WAL is {} MiB (archiver idle: {}s); forcing an archiver step", wal_bytes // (1024 * 1024), idle)
+    await run_wal_archive(db_path)
+    if bot is not None and not _alerted and (idle is None or idle > WAL_GUARD_IDLE_SECONDS):
+        await notify_admins_text(bot, "admin_wal_guard_alert", wal_mib=wal_bytes // (1024 * 1024), idle=int(idle) if idle is not None else "-")
+        _alerted = True
+    return True
+
+
+async def wal_guard_loop(db_path: str, bot=None, interval: float = WAL_GUARD_SECONDS) -> None:
+    """Background task, independent of the scheduler: check_wal_size every interval seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await check_wal_size(db_path, bot)
+        except Exception as e:
+            log.warning("WAL guard failed: {}", e)
@@ -23,6 +23,17 @@ TEXTS = {
     "btn_deposit": "Deposit",
     "btn_language": "Language",
     "btn_referral": "Become a referral",
+    "btn_leaderboard": "Leaderboard",
+    "lb_period_day": "Today",
+    "lb_period_week": "This week",
+    "lb_metric_wins": "Biggest wins",
+    "lb_metric_multiplier": "Multipliers",
+    "lb_mode_real": "Real",
+    "lb_mode_demo": "Demo",
+    "lb_caption": "🏆 {title}\n{period} · {mode}\n\n{lines}",
+    "lb_empty": "No winners yet — be the first!",
+    "lb_line_wins": "{place}. {name} — {score}₽",
+    "lb_line_multiplier": "{place}. {name} — x{score}",
     "btn_share": "Share referral link",
     "referral_caption": (
         "👥 <b>Referral Program</b>\n\n"
@@ -46,6 +57,13 @@ TEXTS = {
     "stats_caption": "View your statistics or reset display (data is kept).",
     "btn_stats_view": "📊 View statistics",
     "btn_stats_reset": "Reset statistics",
+    "btn_stats_history": "Game history",
+    "btn_history_newer": "◀ Newer",
+    "btn_history_older": "Older ▶",
+    "history_caption": "🕓 Game history ({days} days)\n\n{lines}",
+    "history_empty": "No games yet.",
+    "history_line": "{when} · {game} · {bet}₽ → {result}{demo}",
+    "history_demo_mark": " (demo)",
     "stats_reset_success": "Statistics reset (local only, data preserved in database)",
     "btn_stats_last10": "Last 10 games (WebApp)",
     "btn_stats_full": "Full statistics (WebApp)",
@@ -136,6 +154,25 @@ TEXTS = {
     "btn_choose_game": "Choose game",
     "game_bet_insufficient": "Insufficient balance. Top up or switch to demo.",
     "game_already_played": "This bet was already placed. Use the result menu.",
+    "btn_autoplay": "🔁 Auto-play",
+    "autoplay_rounds_caption": (
+        "Auto-play: <b>{game_name}</b> — {outcome}, bet <b>{amount}</b> per round.\n\nChoose the number of rounds. The whole series is reserved up front; unplayed rounds are refunded."
+    ),
+    "autoplay_rounds_btn": "{rounds} rounds",
+    "autoplay_limits_caption": (
+        "Rounds: <b>{rounds}</b>, reserve: <b>{reserve}</b>.\n\nChoose stop-loss (−) and take-profit (+) in multiples of your bet. The series stops as soon as one of them is hit."
+    ),
+    "autoplay_no_limit": "∞",
+    "autoplay_summary": (
+        "🔁 Auto-play finished: <b>{game_name}</b> — {outcome}\n"
+        "Rounds: <b>{played}/{rounds}</b>\n"
+        "Wins: <b>{wins}</b> Losses: <b>{losses}</b>\n"
+        "Staked: <b>{staked}</b>\n"
+        "Won: <b>{won}</b>\n"
+        "Net: <b>{net}</b>{stopped}"
+    ),
+    "autoplay_stopped_stop_loss": "\n\nStopped by stop-loss.",
+    "autoplay_stopped_take_profit": "\n\nStopped by take-profit.",
     "btn_restore_demo": "Restore demo balance",
     "demo_restore_success": "Demo balance has been restored. You can play again.",
     "next_restore_in": "Next restore available in {time_left}.",
@@ -174,6 +211,27 @@ TEXTS = {
     "admin_user_not_found": "User not found.",
     "admin_user_caption": "User {user_id}\n@{username}\n{full_name}\nBlocked: {blocked}\nReal: {real}₽ Demo: {demo}₽",
     "admin_stats_caption": "Users: {users_count}\nGames: {games_count}\nTotal deposited: {total_deposited}₽\nTotal withdrawn: {total_withdrawn}₽\nPending requests: {pending_count}",
+    "admin_stats_games": "{title}\nRounds: {rounds} (wins {wins})\nTurnover: {turnover}₽\nPayouts: {payouts}₽\nGGR: {ggr}₽\nDemo rounds: {demo_rounds}",
+    "admin_stats_today": "Today (UTC)",
+    "admin_stats_24h": "Last 24 hours",
+    "admin_stats_players": "Players today: {players}",
+    "admin_stats_active": "Active users (≈): DAU {dau} · WAU {wau} · MAU {mau}",
+    "admin_stats_updated": "Updated: {computed_at}",
+    "admin_btn_analytics": "Retention",
+    "admin_btn_analytics_run": "Recompute",
+    "admin_analytics_caption": "Retention by signup week (snapshot {snapshot_at}):\nusers · D1 · D7 · D30 · deposit conversion",
+    "admin_analytics_referrers": "By referrer:",
+    "admin_analytics_organic": "organic",
+    "admin_analytics_empty": "No analytics yet. Press Recompute and open this screen again in a minute.",
+    "admin_analytics_started": "Analytics job started.",
+    "admin_btn_export": "Export history",
+    "admin_btn_export_range": "Export by dates",
+    "admin_export_format": "Export {scope}: choose a format (gzip).",
+    "admin_export_range_prompt": "Send the date range as YYYY-MM-DD YYYY-MM-DD (UTC, inclusive):",
+    "admin_export_range_invalid": "Invalid range. Example: 2026-03-01 2026-03-31",
+    "admin_export_started": "Preparing export…",
+    "admin_export_done": "{kind}: {count} rows",
+    "admin_export_too_large": "{kind}: {count} rows, {mib} MiB is over the Telegram upload limit. Narrow the date range.",
     "admin_broadcast_prompt": "Send the broadcast text (one message):",
     "admin_broadcast_done": "Broadcast sent to {count} users.",
     "admin_set_value": "Current {key} = {value}. Send new value:",
@@ -186,6 +244,35 @@ TEXTS = {
     "admin_btn_read": "Read",
     "admin_btn_dismiss": "Close",
     "admin_btn_exit": "Exit",
+    "admin_btn_system": "System",
+    "admin_btn_catalog": "Game ratios",
+    "admin_catalog_caption": "Game ratios (catalog version {version}). Choose a game:",
+    "admin_catalog_game_caption": "{name}\nChoose an outcome to change its ratio:",
+    "admin_catalog_ratio_prompt": "{name} — {outcome}\nCurrent ratio: x{ratio}. Send new ratio (e.g. 1.9):",
+    "admin_catalog_ratio_invalid": "Invalid ratio. Send a number from 1.01 to 100.",
+    "admin_catalog_ratio_ok": "Ratio for {outcome} set to x{ratio} (catalog version {version}).",
+    "admin_system_caption": "System status",
+    "admin_system_lanes": "User lanes: {keys} active, {waiting} waiting\nAcquired: {acquired}, contended: {contended}\nWait avg/max: {avg_wait_ms} / {max_wait_ms} ms",
+    "admin_system_memory": "Process RSS: {rss_mib} MiB",
+    "admin_system_exit_cache": "Game exit cache: {size}/{maxsize} entries, ~{kib} KiB\nHits: {hits}, misses: {misses}, evicted: {evictions}, expired: {expirations}",
+    "admin_system_idempotency": "Double-tap store ({backend}): {local_keys}/{local_max} keys\nClaimed: {claimed}, rejected: {rejected}, evicted: {evicted}",
+    "admin_system_metrics": "Live (real money):",
+    "admin_system_metrics_window": "{window}: {rounds} rounds, turnover {turnover}₽, payouts {payouts}₽, GGR {ggr}₽",
+    "admin_system_storage": "Database: {db_mib} MiB (free inside: {free_mib} MiB), WAL: {wal_mib} MiB\nJournal: {journal_mode}, auto_vacuum: {auto_vacuum}",
+    "admin_system_replica": "Read replica: data as of {as_of} (lag {lag}s, last refresh: {mode})\nStats, exports and leaderboards read: {target}",
+    "admin_system_replica_none": "Read replica: not built yet, heavy reads use the primary DB",
+    "admin_system_replica_target_replica": "replica",
+    "admin_system_replica_target_primary": "primary DB (replica lags more than {max_lag}s)",
+    "admin_integrity_alert": (
+        "<b>⚠️ Database integrity check failed</b>\n\n{details}\n\n" "Tables checked: {tables}, users checked: {users}. Copy the DB files before restarting; see make restore / --pitr."
+    ),
+    "admin_integrity_balance": "User {user_id}, {account}: balance {balance}, ledger sum {ledger}",
+    "admin_wal_guard_alert": (
+        "<b>⚠️ WAL is {wal_mib} MiB</b>\n\nThe WAL archiver last ran {idle}s ago, so the scheduler may be stuck. " "An archiver step was forced; check the scheduler_jobs table and the logs."
+    ),
+    "admin_job_failed_alert": (
+        "<b>⚠️ Scheduled job {name} failed</b>\n\n{error}\n\n" "It is retried from {retry_at} UTC with a growing delay until it succeeds; see the scheduler_jobs table and the logs."
+    ),
     "info_caption": (
         "<b>BASALT Casino</b>\n\n"
         "• <b>Account</b> — profile, statistics, mode (demo/real), deposit, language.\n"
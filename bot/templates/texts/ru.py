@@ -23,6 +23,17 @@ TEXTS = {
     "btn_deposit": "Депозит",
     "btn_language": "Язык",
     "btn_referral": "Стать рефералом",
+    "btn_leaderboard": "Рейтинг",
+    "lb_period_day": "Сегодня",
+    "lb_period_week": "Неделя",
+    "lb_metric_wins": "Крупные выигрыши",
+    "lb_metric_multiplier": "Множители",
+    "lb_mode_real": "Реальный",
+    "lb_mode_demo": "Демо",
+    "lb_caption": "🏆 {title}\n{period} · {mode}\n\n{lines}",
+    "lb_empty": "Победителей пока нет — станьте первым!",
+    "lb_line_wins": "{place}. {name} — {score}₽",
+    "lb_line_multiplier": "{place}. {name} — x{score}",
     "btn_share": "Поделиться ссылкой",
     "referral_caption": (
         "👥 <b>Реферальная программа</b>\n\n" "Поделитесь этой ссылкой с друзьями. Когда они запустят бота, и вы, и друг получите {bonus} ₽!\n\n" "Скопируйте её или используйте кнопку «Поделиться»."
@@ -43,6 +54,13 @@ TEXTS = {
     "stats_caption": "Просмотр статистики или сброс отображения (данные сохраняются).",
     "btn_stats_view": "📊 Посмотреть статистику",
     "btn_stats_reset": "Сбросить статистику",
+    "btn_stats_history": "История игр",
+    "btn_history_newer": "◀ Новее",
+    "btn_history_older": "Старше ▶",
+    "history_caption": "🕓 История игр ({days} дн.)\n\n{lines}",
+    "history_empty": "Игр пока нет.",
+    "history_line": "{when} · {game} · {bet}₽ → {result}{demo}",
+    "history_demo_mark": " (демо)",
     "stats_reset_success": "Статистика сброшена (только локально, данные в базе сохранены)",
     "btn_stats_last10": "Последние 10 игр (WebApp)",
     "btn_stats_full": "Полная статистика (WebApp)",
@@ -131,6 +149,23 @@ TEXTS = {
     "btn_choose_game": "Выбрать игру",
     "game_bet_insufficient": "Недостаточно средств. Пополните баланс или переключитесь на демо.",
     "game_already_played": "Ставка уже сделана. Используйте меню результата.",
+    "btn_autoplay": "🔁 Автоигра",
+    "autoplay_rounds_caption": (
+        "Автоигра: <b>{game_name}</b> — {outcome}, ставка <b>{amount}</b> за раунд.\n\nВыберите количество раундов. Вся серия резервируется с баланса заранее; несыгранные раунды возвращаются."
+    ),
+    "autoplay_rounds_btn": "{rounds} раундов",
+    "autoplay_limits_caption": "Раундов: <b>{rounds}</b>, резерв: <b>{reserve}</b>.\n\nВыберите стоп-лосс (−) и тейк-профит (+) в ставках. Серия остановится, как только сработает один из них.",
+    "autoplay_no_limit": "∞",
+    "autoplay_summary": (
+        "🔁 Автоигра завершена: <b>{game_name}</b> — {outcome}\n"
+        "Раундов: <b>{played}/{rounds}</b>\n"
+        "Побед: <b>{wins}</b> Поражений: <b>{losses}</b>\n"
+        "Поставлено: <b>{staked}</b>\n"
+        "Выиграно: <b>{won}</b>\n"
+        "Итог: <b>{net}</b>{stopped}"
+    ),
+    "autoplay_stopped_stop_loss": "\n\nОстановлено по стоп-лоссу.",
+    "autoplay_stopped_take_profit": "\n\nОстановлено по тейк-профиту.",
     "btn_restore_demo": "Восстановить демо-баланс",
     "demo_restore_success": "Демо-баланс восстановлен. Можете снова играть.",
     "next_restore_in": "Следующее восстановление через {time_left}.",
@@ -169,6 +204,27 @@ TEXTS = {
     "admin_user_not_found": "Пользователь не найден.",
     "admin_user_caption": "User {user_id}\n@{username}\n{full_name}\nЗаблокирован: {blocked}\nРеал: {real}₽ Демо: {demo}₽",
     "admin_stats_caption": "Пользователей: {users_count}\nИгр: {games_count}\nДепозитов: {total_deposited}₽\nВыводов: {total_withdrawn}₽\nЗаявок в ожидании: {pending_count}",
+    "admin_stats_games": "{title}\nРаундов: {rounds} (выигрышей {wins})\nОборот: {turnover}₽\nВыплаты: {payouts}₽\nДоход (GGR): {ggr}₽\nДемо-раундов: {demo_rounds}",
+    "admin_stats_today": "Сегодня (UTC)",
+    "admin_stats_24h": "За 24 часа",
+    "admin_stats_players": "Игроков сегодня: {players}",
+    "admin_stats_active": "Активные пользователи (≈): DAU {dau} · WAU {wau} · MAU {mau}",
+    "admin_stats_updated": "Обновлено: {computed_at}",
+    "admin_btn_analytics": "Удержание",
+    "admin_btn_analytics_run": "Пересчитать",
+    "admin_analytics_caption": "Удержание по неделе регистрации (снимок {snapshot_at}):\nпользователи · D1 · D7 · D30 · конверсия в депозит",
+    "admin_analytics_referrers": "По рефереру:",
+    "admin_analytics_organic": "без реферера",
+    "admin_analytics_empty": "Аналитики пока нет. Нажмите «Пересчитать» и откройте экран через минуту.",
+    "admin_analytics_started": "Расчёт аналитики запущен.",
+    "admin_btn_export": "Выгрузить историю",
+    "admin_btn_export_range": "Выгрузка по датам",
+    "admin_export_format": "Выгрузка {scope}: выберите формат (gzip).",
+    "admin_export_range_prompt": "Отправьте период в виде ГГГГ-ММ-ДД ГГГГ-ММ-ДД (UTC, включительно):",
+    "admin_export_range_invalid": "Неверный период. Пример: 2026-03-01 2026-03-31",
+    "admin_export_started": "Готовлю выгрузку…",
+    "admin_export_done": "{kind}: {count} строк",
+    "admin_export_too_large": "{kind}: {count} строк, {mib} МиБ — больше лимита загрузки Telegram. Сузьте период.",
     "admin_broadcast_prompt": "Отправьте текст рассылки (одним сообщением):",
     "admin_broadcast_done": "Рассылка отправлена {count} пользователям.",
     "admin_set_value": "Текущее {key} = {value}. Отправьте новое значение:",
@@ -181,6 +237,36 @@ TEXTS = {
     "admin_btn_read": "Прочитано",
     "admin_btn_dismiss": "Закрыть",
     "admin_btn_exit": "Выйти",
+    "admin_btn_system": "Система",
+    "admin_btn_catalog": "Коэффициенты игр",
+    "admin_catalog_caption": "Коэффициенты игр (версия каталога {version}). Выберите игру:",
+    "admin_catalog_game_caption": "{name}\nВыберите исход, чтобы изменить коэффициент:",
+    "admin_catalog_ratio_prompt": "{name} — {outcome}\nТекущий коэффициент: x{ratio}. Отправьте новый (например 1.9):",
+    "admin_catalog_ratio_invalid": "Неверный коэффициент. Отправьте число от 1.01 до 100.",
+    "admin_catalog_ratio_ok": "Коэффициент для {outcome} = x{ratio} (версия каталога {version}).",
+    "admin_system_caption": "Состояние системы",
+    "admin_system_lanes": "Очереди игроков: активных {keys}, ждут {waiting}\nЗахватов: {acquired}, с ожиданием: {contended}\nОжидание сред./макс.: {avg_wait_ms} / {max_wait_ms} мс",
+    "admin_system_memory": "Память процесса (RSS): {rss_mib} МиБ",
+    "admin_system_exit_cache": "Кэш выхода из игры: {size}/{maxsize} записей, ~{kib} КиБ\nПопаданий: {hits}, промахов: {misses}, вытеснено: {evictions}, истекло: {expirations}",
+    "admin_system_idempotency": "Защита от двойного нажатия ({backend}): {local_keys}/{local_max} ключей\nПринято: {claimed}, отклонено: {rejected}, вытеснено: {evicted}",
+    "admin_system_metrics": "Онлайн (реальные деньги):",
+    "admin_system_metrics_window": "{window}: раундов {rounds}, оборот {turnover}₽, выплаты {payouts}₽, GGR {ggr}₽",
+    "admin_system_storage": "База: {db_mib} МиБ (свободно внутри: {free_mib} МиБ), WAL: {wal_mib} МиБ\nЖурнал: {journal_mode}, auto_vacuum: {auto_vacuum}",
+    "admin_system_replica": "Реплика для чтения: данные на {as_of} (отставание {lag} с, последнее обновление: {mode})\nСтатистика, выгрузки и лидерборды читают: {target}",
+    "admin_system_replica_none": "Реплика для чтения: ещё не создана, тяжёлые запросы идут в основную БД",
+    "admin_system_replica_target_replica": "реплику",
+    "admin_system_replica_target_primary": "основную БД (реплика отстаёт больше чем на {max_lag} с)",
+    "admin_integrity_alert": (
+        "<b>⚠️ Проверка целостности базы не пройдена</b>\n\n{details}\n\n" "Проверено таблиц: {tables}, пользователей: {users}. Скопируйте файлы БД перед перезапуском; см. make restore / --pitr."
+    ),
+    "admin_integrity_balance": "Пользователь {user_id}, {account}: баланс {balance}, сумма по журналу {ledger}",
+    "admin_wal_guard_alert": (
+        "<b>⚠️ WAL вырос до {wal_mib} МиБ</b>\n\nАрхиватор WAL последний раз запускался {idle} с назад, планировщик мог зависнуть. "
+        "Шаг архивации запущен принудительно; проверьте таблицу scheduler_jobs и логи."
+    ),
+    "admin_job_failed_alert": (
+        "<b>⚠️ Плановая задача {name} завершилась ошибкой</b>\n\n{error}\n\n" "Повтор с {retry_at} UTC с растущей паузой, пока задача не выполнится; см. таблицу scheduler_jobs и логи."
+    ),
     "info_caption": (
         "<b>BASALT Casino</b>\n\n"
         "• <b>Аккаунт</b> — профиль, статистика, режим (демо/реал), депозит, язык.\n"
@@ -0,0 +1,277 @@
+"""
+Games archive tier: expired games are moved (not deleted) into one SQLite file per month, games_YYYY_MM.db in
+<db dir>/archive. Months that can no longer receive rows are gzipped; manifest.json lists every month with row
+counts, time span and checksums. Historical reads ATTACH the months they need next to the hot DB; sealed months
+are unpacked into archive/cache on first read and dropped after ARCHIVE_CACHE_DAYS without reads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import os
+import shutil
+import sqlite3
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+import aiosqlite
+
+from bot.database.connection import dedicated_connection
+from bot.utils.checksum import compress_and_verify, sha256_file
+from bot.utils.logger import get_logger
+from bot.utils.purge import purge_batches
+
+log = get_logger(__name__)
+
+ARCHIVE_FETCH_ROWS = 2000
+# Unpacked sealed months in archive/cache not read for this long are removed by the daily cleanup
+ARCHIVE_CACHE_DAYS = 7
+# Ids per IN (...) list (stays below SQLITE_MAX_VARIABLE_NUMBER of older SQLite builds)
+_ID_CHUNK = 500
+_GAMES_COLUMNS = "id, user_id, game_type, game_id, bet_amount, outcome, is_win, win_amount, is_demo, played_at"
+_ARCHIVE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS {schema}.games (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    game_type TEXT NOT NULL,
+    game_id INTEGER NOT NULL,
+    bet_amount INTEGER NOT NULL,
+    outcome TEXT NOT NULL,
+    is_win INTEGER NOT NULL,
+    win_amount INTEGER NOT NULL,
+    is_demo INTEGER NOT NULL,
+    played_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS {schema}.idx_games_user_played ON games(user_id, played_at);
+"""
+
+
+def archive_dir_for(db_path: str) -> Path:
+    return Path(db_path).resolve().parent / "archive"
+
+
+def _month_start(month: str) -> str:
+    """'2026_01' -> '2026-01' (a prefix that sorts right before every played_at of that month)."""
+    return month.replace("_", "-")
+
+
+def _next_month(month: str) -> str:
+    year, mon = (int(x) for x in month.split("_"))
+    return f"{year + mon // 12}_{mon % 12 + 1:02d}"
+
+
+def _db_file(archive_dir: Path, month: str) -> Path:
+    return archive_dir / f"games_{month}.db"
+
+
+def _gz_file(archive_dir: Path, month: str) -> Path:
+    return archive_dir / f"games_{month}.db.gz"
+
+
+def load_manifest(archive_dir: Path) -> Dict[str, dict]:
+    """{month: {file, rows, first_played_at, last_played_at, compressed, db_sha256?, gz_sha256?}}"""
+    path = archive_dir / "manifest.json"
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))["months"]
+
+
+def _save_manifest(archive_dir: Path, months: Dict[str, dict]) -> None:
+    tmp = archive_dir / "manifest.json.tmp"
+    tmp.write_text(json.dumps({"months": months}, indent=2, sort_keys=True), encoding="utf-8")
+    tmp.replace(archive_dir / "manifest.json")
+
+
+def _decompress(gz_path: Path, out_path: Path, expected_sha256: Optional[str]) -> None:
+    tmp = out_path.with_name(out_path.name + ".partial")
+    with gzip.open(gz_path, "rb") as src, open(tmp, "wb") as dst:
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+    if expected_sha256 and sha256_file(tmp) != expected_sha256:
+        tmp.unlink()
+        raise ValueError(f"Archive {gz_path} does not match its manifest checksum")
+    tmp.replace(out_path)
+
+
+def _describe_month(archive_dir: Path, month: str) -> dict:
+    conn = sqlite3.connect(f"file:{_db_file(archive_dir, month)}?mode=ro", uri=True)
+    try:
+        rows, first, last = conn.execute("SELECT COUNT(*), MIN(played_at), MAX(played_at) FROM games").fetchone()
+    finally:
+        conn.close()
+    return {"file": _db_file(archive_dir, month).name, "rows": rows, "first_played_at": first, "last_played_at": last, "compressed": False}
+
+
+def _seal_month(archive_dir: Path, month: str, entry: dict) -> dict:
+    """Gzip a month that can no longer receive rows and drop the plain file (blocking)."""
+    sums = compress_and_verify(str(_db_file(archive_dir, month)), str(_gz_file(archive_dir, month)))
+    _db_file(archive_dir, month).unlink()
+    return {**entry, **sums, "file": _gz_file(archive_dir, month).name, "compressed": True}
+
+
+def _open_month(db_file: Path) -> sqlite3.Connection:
+    """Archive month file, created on first use; commits are fsynced (rollback journal, synchronous=FULL)."""
+    conn = sqlite3.connect(db_file, check_same_thread=False)
+    conn.execute("PRAGMA synchronous = FULL")
+    conn.executescript(_ARCHIVE_SCHEMA.format(schema="main"))
+    return conn
+
+
+def _id_chunks(ids: List[int]) -> Iterator[List[int]]:
+    for start in range(0, len(ids), _ID_CHUNK):
+        end = start + _ID_CHUNK
+        yield ids[start:end]
+
+
+def _store_rows(conn: sqlite3.Connection, rows: List[tuple], ids: List[int]) -> None:
+    """
+    INSERT OR IGNORE the rows (a re-run after a crash is harmless) and commit, then check every id is in the file.
+    Raises ValueError otherwise, so nothing is deleted from the hot table.
+    """
+    conn.executemany(f"INSERT OR IGNORE INTO games ({_GAMES_COLUMNS}) VALUES ({', '.join('?' for _ in _GAMES_COLUMNS.split(','))})", rows)
+    conn.commit()
+    stored = 0
+    for chunk in _id_chunks(ids):
+        stored += conn.execute(f"SELECT COUNT(*) FROM games WHERE id IN ({', '.join('?' for _ in chunk)})", chunk).fetchone()[0]
+    if stored != len(ids):
+        raise ValueError(f"Archive stored {stored} of {len(ids)} games; the batch stays in the hot table")
+
+
+def prune_cache(archive_dir: Path, max_age_days: int = ARCHIVE_CACHE_DAYS) -> int:
+    """Remove months unpacked into archive/cache that were not read for max_age_days. Returns files removed."""
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for path in (archive_dir / "cache").glob("games_*.db"):
+        if path.stat().st_mtime < cutoff:
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+async def archive_expired_games(db_path: str, cutoff: str) -> int:
+    """
+    Move games with played_at < cutoff into their month's archive DB, in purge batches on a dedicated connection.
+    The archive file is committed (fsynced) first and checked to hold every id of the batch; only then are those ids
+    deleted from the hot table. A crash in between leaves the rows in both places, and the next run finishes the
+    batch. Months wholly before the cutoff are sealed (gzipped). Returns the number of rows moved.
+    """
+    archive_dir = archive_dir_for(db_path)
+    moved = 0
+    async with dedicated_connection(db_path) as conn:
+        cursor = await conn.execute("SELECT MIN(played_at) FROM games WHERE played_at < ?", (cutoff,))
+        oldest = (await cursor.fetchone())[0]
+        await cursor.close()
+        if oldest is not None:
+            archive_dir.mkdir(parents=True, exist_ok=True)
+            moved = await _archive_months(conn, archive_dir, oldest, cutoff)
+    if archive_dir.exists():
+        removed = await asyncio.to_thread(prune_cache, archive_dir)
+        if removed:
+            log.info("Archive: removed {} cached months", removed)
+    if moved:
+        log.info("Archive: moved {} games older than {} to {}", moved, cutoff, archive_dir)
+    return moved
+
+
+async def _archive_months(conn: aiosqlite.Connection, archive_dir: Path, oldest: str, cutoff: str) -> int:
+    months = load_manifest(archive_dir)
+    cutoff_month = cutoff[:7].replace("-", "_")
+    month = oldest[:7].replace("-", "_")
+    moved = 0
+    while month <= cutoff_month:
+        lower, upper = _month_start(month), min(_month_start(_next_month(month)), cutoff)
+        cursor = await conn.execute("SELECT 1 FROM games WHERE played_at >= ? AND played_at < ? LIMIT 1", (lower, upper))
+        has_rows = await cursor.fetchone() is not None
+        await cursor.close()
+        if not has_rows:
+            month = _next_month(month)
+            continue
+        db_file, gz_file = _db_file(archive_dir, month), _gz_file(archive_dir, month)
+        if not db_file.exists() and gz_file.exists():
+            # More rows for a sealed month (e.g. GAME_HISTORY_DAYS was lowered): reopen it
+            await asyncio.to_thread(_decompress, gz_file, db_file, months.get(month, {}).get("db_sha256"))
+            gz_file.unlink()
+            (archive_dir / "cache" / db_file.name).unlink(missing_ok=True)
+        archive = await asyncio.to_thread(_open_month, db_file)
+        try:
+
+            async def store(ids: List[int]) -> None:
+                rows = []
+                for chunk in _id_chunks(ids):
+                    cursor = await conn.execute(f"SELECT {_GAMES_COLUMNS} FROM games WHERE id IN ({', '.join('?' for _ in chunk)})", chunk)
+                    rows.extend(tuple(row) for row in await cursor.fetchall())
+                    await cursor.close()
+                await asyncio.to_thread(_store_rows, archive, rows, ids)
+
+            progress = await purge_batches(conn, "games", "played_at", "played_at >= ? AND played_at < ?", (lower, upper), before_delete=store)
+            moved += progress.deleted
+        finally:
+            archive.close()
+        months[month] = await asyncio.to_thread(_describe_month, archive_dir, month)
+        if upper < cutoff:
+            months[month] = await asyncio.to_thread(_seal_month, archive_dir, month, months[month])
+        _save_manifest(archive_dir, months)
+        month = _next_month(month)
+    return moved
+
+
+def _months_between(months: Dict[str, dict], date_from: Optional[str], date_to: Optional[str]) -> List[str]:
+    """Archived months overlapping [date_from, date_to] ('YYYY-MM-DD', inclusive), oldest first."""
+    result = []
+    for month in sorted(months):
+        if date_from and _month_start(_next_month(month)) <= date_from[:7]:
+            continue
+        if date_to and _month_start(month) > date_to[:7]:
+            continue
+        result.append(month)
+    return result
+
+
+def _readable_month(archive_dir: Path, month: str, entry: dict) -> Path:
+    """Plain archive file to ATTACH; sealed months are unpacked once into archive/cache (checksum-verified)."""
+    if _db_file(archive_dir, month).exists():
+        return _db_file(archive_dir, month)
+    cached = archive_dir / "cache" / f"games_{month}.db"
+    if cached.exists():
+        # mtime = last read, for prune_cache
+        os.utime(cached)
+    else:
+        cached.parent.mkdir(exist_ok=True)
+        _decompress(_gz_file(archive_dir, month), cached, entry.get("db_sha256"))
+    return cached
+
+
+def iter_archived_games(
+    db_path: str,
+    build_sql: Callable[[str], str],
+    params: Sequence,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    batch: Optional[int] = None,
+) -> Iterator[tuple]:
+    """
+    Rows from the archived months overlapping the date range, oldest month first. build_sql(table) returns the
+    query with `table` as its games source; each month is ATTACHed read-only next to the hot DB in turn, so the
+    query may also join main tables (users etc.). Blocking: run in a worker thread.
+    """
+    batch = batch or ARCHIVE_FETCH_ROWS
+    archive_dir = archive_dir_for(db_path)
+    months = load_manifest(archive_dir)
+    if not months:
+        return
+    conn = sqlite3.connect(f"file:{Path(db_path).resolve()}?mode=ro", uri=True)
+    try:
+        for month in _months_between(months, date_from, date_to):
+            path = _readable_month(archive_dir, month, months[month])
+            conn.execute("ATTACH DATABASE ? AS archive", (f"file:{path}?mode=ro",))
+            try:
+                cursor = conn.execute(build_sql("archive.games"), params)
+                while rows := cursor.fetchmany(batch):
+                    yield from rows
+                cursor.close()
+            finally:
+                conn.execute("DETACH DATABASE archive")
+    finally:
+        conn.close()
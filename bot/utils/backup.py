@@ -1,79 +1,143 @@
-"""Backup and cleanup: monthly dump (1st of month), keep 3 dumps, purge old games and payment_requests."""
+"""Backup and cleanup: online backup (monthly), keep 3, archive old games, purge old payment_requests."""
 
 from __future__ import annotations
 
 import asyncio
-import gzip
+import json
 import sqlite3
-from datetime import date
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
+from typing import Optional
 
-from bot.core.constants import GAME_HISTORY_DAYS, MAX_DUMPS_KEEP, PAYMENT_REQUESTS_DAYS
-from bot.database.connection import get_connection
+from bot.core.constants import GAME_HISTORY_DAYS, MAX_DUMPS_KEEP, PAYMENT_REQUESTS_DAYS, ROLLUP_PLAYERS_DAYS
+from bot.database.queries.rollups import prune_player_rollups
+from bot.utils.archive import archive_expired_games
+from bot.utils.checksum import compress_and_verify
 from bot.utils.logger import get_logger
+from bot.utils.purge import purge_payment_requests
 
 log = get_logger(__name__)
 
 
-def _do_dump_sync(db_path: str, dump_path: Path) -> None:
-    """Run sqlite3 dump and gzip to dump_path (blocking). Uses separate connection."""
-    conn = sqlite3.connect(db_path)
+# Online copy: this many pages per backup step, then sleep so the bot's writers get the lock in between
+BACKUP_STEP_PAGES = 1024
+BACKUP_STEP_SLEEP = 0.005
+
+
+def copy_db_snapshot(db_path: str, copy_path: Path) -> None:
+    """
+    Page-level copy of the live DB via sqlite3 backup API, BACKUP_STEP_PAGES per step (blocking, own connections).
+    The source holds one read transaction across all steps, so in WAL mode every step reads the same snapshot and
+    commits made meanwhile do not restart the copy (without it a busy DB may never finish copying).
+    """
+    copy_path.parent.mkdir(parents=True, exist_ok=True)
+    copy_path.unlink(missing_ok=True)
+    src = sqlite3.connect(f"file:{Path(db_path).resolve()}?mode=ro", uri=True, isolation_level=None)
+    dst = sqlite3.connect(copy_path)
     try:
-        with gzip.open(dump_path, "wt", encoding="utf-8") as f:
-            for line in conn.iterdump():
-                f.write(line + "\n")
+        src.execute("BEGIN")
+        src.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+        src.backup(dst, pages=BACKUP_STEP_PAGES, sleep=BACKUP_STEP_SLEEP)
     finally:
-        conn.close()
+        dst.close()
+        src.close()
 
 
-async def run_backup_and_cleanup(db_path: str, backups_dir: str) -> None:
+def _copy_db_sync(db_path: str, copy_path: Path) -> dict:
+    """
+    copy_db_snapshot, then row counts per table and page stats, read from the copy so they match its contents
+    exactly.
+    """
+    copy_db_snapshot(db_path, copy_path)
+    dst = sqlite3.connect(copy_path)
+    try:
+        tables = [r[0] for r in dst.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name")]
+        return {
+            "tables": {name: dst.execute(f'SELECT COUNT(*) FROM "{name}"').fetchone()[0] for name in tables},
+            "page_size": dst.execute("PRAGMA page_size").fetchone()[0],
+            "page_count": dst.execute("PRAGMA page_count").fetchone()[0],
+        }
+    finally:
+        dst.close()
+
+
+def manifest_path(backup_path: Path) -> Path:
+    """casino_2026-03-01.db.gz -> casino_2026-03-01.manifest.json"""
+    return backup_path.with_name(backup_path.name.split(".", 1)[0] + ".manifest.json")
+
+
+async def create_backup(db_path: str, backups_dir: Path, name: str) -> Path:
     """
-    If today is the 1st of the month: create gzipped dump in backups_dir (casino_YYYY-MM-DD.gz).
-    Keep only the last MAX_DUMPS_KEEP dumps.
-    Delete from games where played_at older than GAME_HISTORY_DAYS.
-    Delete from payment_requests where status in ('approved','rejected') and created_at older than PAYMENT_REQUESTS_DAYS.
+    backups_dir/<name>.db.gz plus <name>.manifest.json (checksums, sizes, row counts per table).
+    Copy in a thread (backup API, stepped), compression and verification in a worker process.
     """
+    backups_dir.mkdir(parents=True, exist_ok=True)
+    raw_path = backups_dir / f"{name}.db.partial"
+    gz_path = backups_dir / f"{name}.db.gz"
+    try:
+        stats = await asyncio.to_thread(_copy_db_sync, db_path, raw_path)
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            sums = await asyncio.get_running_loop().run_in_executor(pool, compress_and_verify, str(raw_path), str(gz_path))
+    except BaseException:
+        gz_path.unlink(missing_ok=True)
+        raise
+    finally:
+        raw_path.unlink(missing_ok=True)
+    manifest = {
+        "file": gz_path.name,
+        "format": "sqlite-db-gzip",
+        "created_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        **sums,
+        **stats,
+    }
+    manifest_path(gz_path).write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    return gz_path
+
+
+async def run_backup(db_path: str, backups_dir: str, today: Optional[date] = None) -> Path:
+    """Verified backup casino_YYYY-MM-DD.db.gz + manifest; keep only the last MAX_DUMPS_KEEP (legacy SQL dumps casino_YYYY-MM-DD.gz count too)."""
     backups_path = Path(backups_dir)
-    backups_path.mkdir(parents=True, exist_ok=True)
-    today = date.today()
+    today = today or date.today()
+    dump_path = await create_backup(db_path, backups_path, f"casino_{today.isoformat()}")
+    log.info("Backup created: {}", dump_path)
+    existing = sorted(backups_path.glob("casino_*.gz"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in existing[MAX_DUMPS_KEEP:]:
+        try:
+            old.unlink()
+            manifest_path(old).unlink(missing_ok=True)
+            log.info("Removed old dump: {}", old)
+        except OSError as e:
+            log.warning("Could not remove {}: {}", old, e)
+    return dump_path
+
+
+async def run_cleanup(db_path: str) -> None:
+    """
+    Move games older than GAME_HISTORY_DAYS to the monthly archive (bot/utils/archive.py) and delete processed
+    payment_requests older than PAYMENT_REQUESTS_DAYS, both in bounded batches (bot/utils/purge.py).
+    Game rollups (games_rollup_hourly/daily) are kept; only per-player rollup rows older than ROLLUP_PLAYERS_DAYS go.
+    """
+    now = datetime.now(timezone.utc)
+    archived_games = await archive_expired_games(db_path, (now - timedelta(days=GAME_HISTORY_DAYS)).strftime("%Y-%m-%dT%H:%M:%SZ"))
+    deleted_payments = await purge_payment_requests(db_path, (now - timedelta(days=PAYMENT_REQUESTS_DAYS)).strftime("%Y-%m-%dT%H:%M:%SZ"))
+    if archived_games or deleted_payments:
+        log.info("Cleanup: archived {} games, deleted {} payment_requests", archived_games, deleted_payments)
+    await prune_player_rollups((now.date() - timedelta(days=ROLLUP_PLAYERS_DAYS)).isoformat())
+
 
-    if today.day == 1:
-        dump_name = f"casino_{today.isoformat()}.gz"
-        dump_path = backups_path / dump_name
+async def run_backup_and_cleanup(db_path: str, backups_dir: str) -> None:
+    """CLI (make backup): backup if today is the 1st of the month, then cleanup. The bot runs both from its scheduler."""
+    if date.today().day == 1:
         try:
-            await asyncio.to_thread(_do_dump_sync, db_path, dump_path)
-            log.info("Backup created: %s", dump_path)
+            await run_backup(db_path, backups_dir)
         except Exception as e:
-            log.error("Backup failed: %s", e)
+            log.error("Backup failed: {}", e)
             return
-
-        existing = sorted(backups_path.glob("casino_*.gz"), key=lambda p: p.stat().st_mtime, reverse=True)
-        for old in existing[MAX_DUMPS_KEEP:]:
-            try:
-                old.unlink()
-                log.info("Removed old dump: %s", old)
-            except OSError as e:
-                log.warning("Could not remove %s: %s", old, e)
-
-    conn = await get_connection()
     try:
-        cur_games = await conn.execute(
-            "DELETE FROM games WHERE played_at < datetime('now', ?)",
-            (f"-{GAME_HISTORY_DAYS} days",),
-        )
-        deleted_games = cur_games.rowcount
-        await cur_games.close()
-        cur_payments = await conn.execute(
-            "DELETE FROM payment_requests WHERE status IN ('approved', 'rejected') AND created_at < datetime('now', ?)",
-            (f"-{PAYMENT_REQUESTS_DAYS} days",),
-        )
-        deleted_payments = cur_payments.rowcount
-        await cur_payments.close()
-        await conn.commit()
-        if deleted_games or deleted_payments:
-            log.info("Cleanup: deleted %s games, %s payment_requests", deleted_games, deleted_payments)
+        await run_cleanup(db_path)
     except Exception as e:
-        log.error("Cleanup failed: %s", e)
+        log.error("Cleanup failed: {}", e)
 
 
 async def _run_once() -> None:
@@ -0,0 +1,129 @@
+"""Bounded in-process cache with per-entry TTL and LRU eviction."""
+
+from __future__ import annotations
+
+import sys
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Iterator, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Mapping with at most maxsize entries; each entry expires ttl seconds after it was set.
+    Oldest (least recently used) entries are evicted first when full. Not thread-safe (single event loop).
+    """
+
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        item = self._data.get(key)  # type: ignore[arg-type]
+        if item is None:
+            return False
+        if item[0] <= self._clock():
+            del self._data[key]  # type: ignore[arg-type]
+            self.expirations += 1
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(list(self._data))
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        """Return value and mark as recently used, or default if missing/expired."""
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+        if item[0] <= self._clock():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return item[1]
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        """
+        Insert or replace value. When over maxsize, pops from the front (least recently used): expired entries
+        there first, then live ones while still over maxsize. With the usual uniform ttl the front is also the
+        soonest to expire, so this is O(1) amortized instead of a scan of every entry on the hot path.
+        """
+        now = self._clock()
+        self._data[key] = (now + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            while next(iter(self._data.values()))[0] <= now:
+                self._data.popitem(last=False)
+                self.expirations += 1
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def add(self, key: K, value: V, ttl: Optional[float] = None) -> bool:
+        """Set only if key is absent (or expired). Returns True if the key was added."""
+        if key in self:
+            return False
+        self.set(key, value, ttl)
+        return True
+
+    def pop(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        """Remove key and return its value (default if missing or expired)."""
+        item = self._data.pop(key, None)
+        if item is None or item[0] <= self._clock():
+            return default
+        return item[1]
+
+    def purge_expired(self) -> int:
+        """Drop all expired entries. Returns number removed."""
+        now = self._clock()
+        expired = [k for k, (exp, _) in self._data.items() if exp <= now]
+        for k in expired:
+            del self._data[k]
+        self.expirations += len(expired)
+        return len(expired)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def memory_usage(self) -> int:
+        """Approximate bytes held: dict + per-entry tuples, keys and values (tuples/lists counted recursively)."""
+
+        def size(obj: object) -> int:
+            n = sys.getsizeof(obj)
+            if isinstance(obj, (tuple, list)):
+                n += sum(size(x) for x in obj)
+            return n
+
+        total = sys.getsizeof(self._data)
+        for k, (exp, v) in self._data.items():
+            total += size(k) + sys.getsizeof((exp, v)) + sys.getsizeof(exp) + size(v)
+        return total
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "kib": round(self.memory_usage() / 1024, 1),
+        }
@@ -0,0 +1,35 @@
+"""Checksums and verified gzip copies for backups and archives (module-level so they can run in worker processes)."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+from pathlib import Path
+
+_CHUNK_BYTES = 1024 * 1024
+
+
+def sha256_file(path: Path, opener=open) -> str:
+    """Hex sha256 of a file; opener=gzip.open hashes the decompressed contents."""
+    digest = hashlib.sha256()
+    with opener(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def compress_and_verify(raw_path: str, gz_path: str) -> dict:
+    """
+    Gzip raw_path to gz_path, then read the archive back and compare the sha256 of its contents with the source.
+    Raises ValueError if the archive does not match.
+    """
+    raw, gz = Path(raw_path), Path(gz_path)
+    digest = hashlib.sha256()
+    with open(raw, "rb") as src, gzip.open(gz, "wb", compresslevel=6) as dst:
+        for chunk in iter(lambda: src.read(_CHUNK_BYTES), b""):
+            digest.update(chunk)
+            dst.write(chunk)
+    db_sha256 = digest.hexdigest()
+    if sha256_file(gz, gzip.open) != db_sha256:
+        raise ValueError(f"Gzip verification failed: {gz} does not match {raw}")
+    return {"db_sha256": db_sha256, "db_size": raw.stat().st_size, "gz_sha256": sha256_file(gz), "gz_size": gz.stat().st_size}
@@ -0,0 +1,82 @@
+"""Five-field cron specs (minute hour day-of-month month day-of-week, UTC) for the maintenance scheduler."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import FrozenSet
+
+# (low, high) per field; day-of-week 0 = Sunday, 7 is accepted as Sunday too
+_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+# Longest gap searched by next_after (Feb 29 specs need up to 8 years)
+_MAX_SEARCH = timedelta(days=366 * 8)
+
+
+def _parse_field(text: str, low: int, high: int) -> FrozenSet[int]:
+    values = set()
+    for part in text.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"Bad cron step: {text}")
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(x) for x in part.split("-", 1))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if not low <= start <= end <= high:
+            raise ValueError(f"Cron value out of range {low}-{high}: {text}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class CronSpec:
+    """
+    Supports *, lists, ranges and steps. Like cron, when both day-of-month and day-of-week are restricted a day
+    matches if either does.
+    """
+
+    __slots__ = ("spec", "minutes", "hours", "days", "months", "weekdays", "_any_day", "_any_weekday")
+
+    def __init__(self, spec: str) -> None:
+        parts = spec.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron spec needs 5 fields: {spec!r}")
+        self.spec = spec
+        self.minutes, self.hours, self.days, self.months, weekdays = (_parse_field(p, lo, hi) for p, (lo, hi) in zip(parts, _FIELDS))
+        self.weekdays = frozenset(d % 7 for d in weekdays)
+        self._any_day = parts[2] == "*"
+        self._any_weekday = parts[4] == "*"
+
+    def _day_matches(self, dt: datetime) -> bool:
+        in_days = dt.day in self.days
+        in_weekdays = (dt.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return in_days and in_weekdays
+        return in_days or in_weekdays
+
+    def matches(self, dt: datetime) -> bool:
+        return dt.minute in self.minutes and dt.hour in self.hours and dt.month in self.months and self._day_matches(dt)
+
+    def next_after(self, dt: datetime) -> datetime:
+        """First matching minute strictly after dt (tz of dt is kept). Skips whole months / days / hours that cannot match."""
+        current = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt + _MAX_SEARCH
+        while current <= limit:
+            if current.month not in self.months:
+                current = (current.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(current):
+                current = current.replace(hour=0, minute=0) + timedelta(days=1)
+            elif current.hour not in self.hours:
+                current = current.replace(minute=0) + timedelta(hours=1)
+            elif current.minute not in self.minutes:
+                current += timedelta(minutes=1)
+            else:
+                return current
+        raise ValueError(f"Cron spec never matches: {self.spec!r}")
+
+    def __repr__(self) -> str:
+        return f"CronSpec({self.spec!r})"
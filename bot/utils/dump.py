@@ -0,0 +1,252 @@
+"""
+Parallel logical dump: python -m bot.utils.dump [--out DIR] [--workers N]. The DB is first copied with the backup
+API so every chunk reads the same snapshot; each table (large rowid tables split into rowid ranges of
+DUMP_CHUNK_ROWS) is then written by a worker process as gzip JSON lines, one array of column values per row.
+manifest.json lists the schema, row counts and every chunk with its sha256. load_dump reverses it: workers decode
+chunks into small part DBs in parallel, and one writer merges them in manifest order and builds the indexes last.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import gzip
+import json
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from bot.utils.backup import copy_db_snapshot
+from bot.utils.checksum import sha256_file
+
+DUMP_CHUNK_ROWS = 250_000
+DUMP_FORMAT = "jsonl-gzip-chunks"
+# sqlite_sequence is created by AUTOINCREMENT tables themselves; only its rows are dumped
+_SEQUENCE_TABLE = "sqlite_sequence"
+
+
+def _encode(value):
+    return {"b64": base64.b64encode(value).decode("ascii")} if isinstance(value, bytes) else value
+
+
+def _decode(value):
+    return base64.b64decode(value["b64"]) if isinstance(value, dict) else value
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _connect_snapshot(path: str) -> sqlite3.Connection:
+    # The snapshot is never written while dumping: no locking needed
+    return sqlite3.connect(f"file:{Path(path).resolve()}?immutable=1", uri=True)
+
+
+def _has_rowid(conn: sqlite3.Connection, table: str) -> bool:
+    try:
+        conn.execute(f"SELECT rowid FROM {_quote(table)} LIMIT 0")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def plan_chunks(conn: sqlite3.Connection, table: str, chunk_rows: int) -> List[Tuple[Optional[int], Optional[int]]]:
+    """Inclusive rowid ranges of at most chunk_rows rows; [(None, None)] (whole table) for small / WITHOUT ROWID tables."""
+    if not _has_rowid(conn, table):
+        return [(None, None)]
+    ranges = []
+    low = None
+    while True:
+        first = conn.execute(f"SELECT MIN(rowid) FROM {_quote(table)}" + (" WHERE rowid > ?" if low is not None else ""), (low,) if low is not None else ()).fetchone()[0]
+        if first is None:
+            break
+        # Keyset step along the rowid b-tree: the chunk_rows-th rowid from first (or the last one)
+        row = conn.execute(f"SELECT rowid FROM {_quote(table)} WHERE rowid >= ? ORDER BY rowid LIMIT 1 OFFSET ?", (first, chunk_rows - 1)).fetchone()
+        last = row[0] if row else conn.execute(f"SELECT MAX(rowid) FROM {_quote(table)}").fetchone()[0]
+        ranges.append((first, last))
+        if row is None:
+            break
+        low = last
+    return ranges if len(ranges) > 1 else [(None, None)]
+
+
+def dump_chunk(snapshot: str, table: str, first: Optional[int], last: Optional[int], out_path: str) -> dict:
+    """Worker: one table / rowid range to gzip JSON lines. Returns the manifest entry of the chunk."""
+    conn = _connect_snapshot(snapshot)
+    rows = 0
+    try:
+        sql = f"SELECT * FROM {_quote(table)}"
+        params: tuple = ()
+        if first is not None:
+            sql += " WHERE rowid BETWEEN ? AND ? ORDER BY rowid"
+            params = (first, last)
+        cursor = conn.execute(sql, params)
+        columns = [d[0] for d in cursor.description]
+        with gzip.open(out_path, "wt", encoding="utf-8", compresslevel=6) as f:
+            while batch := cursor.fetchmany(5000):
+                f.writelines(json.dumps([_encode(v) for v in row], ensure_ascii=False, separators=(",", ":")) + "\n" for row in batch)
+                rows += len(batch)
+    finally:
+        conn.close()
+    path = Path(out_path)
+    return {
+        "file": path.name,
+        "table": table,
+        "columns": columns,
+        "first_rowid": first,
+        "last_rowid": last,
+        "rows": rows,
+        "bytes": path.stat().st_size,
+        "sha256": sha256_file(path),
+    }
+
+
+def create_dump(db_path: str, out_dir: Path, workers: Optional[int] = None, chunk_rows: int = DUMP_CHUNK_ROWS) -> Path:
+    """Dump db_path into out_dir (created; must not exist yet). Blocking. Returns the manifest path."""
+    out_dir.mkdir(parents=True)
+    snapshot = out_dir / "snapshot.db"
+    created_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    try:
+        copy_db_snapshot(db_path, snapshot)
+        conn = _connect_snapshot(str(snapshot))
+        try:
+            schema = [
+                {"type": t, "name": n, "tbl_name": tbl, "sql": sql}
+                for t, n, tbl, sql in conn.execute("SELECT type, name, tbl_name, sql FROM sqlite_master WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%' ORDER BY rowid")
+            ]
+            tables = [s["name"] for s in schema if s["type"] == "table"]
+            if conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (_SEQUENCE_TABLE,)).fetchone():
+                tables.append(_SEQUENCE_TABLE)
+            jobs = []
+            for table in tables:
+                for n, (first, last) in enumerate(plan_chunks(conn, table, chunk_rows)):
+                    jobs.append((str(snapshot), table, first, last, str(out_dir / f"{table}.{n:05d}.jsonl.gz")))
+        finally:
+            conn.close()
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            chunks = list(pool.map(dump_chunk, *zip(*jobs))) if jobs else []
+    finally:
+        snapshot.unlink(missing_ok=True)
+    counts = {}
+    for chunk in chunks:
+        counts[chunk["table"]] = counts.get(chunk["table"], 0) + chunk["rows"]
+    manifest = {
+        "format": DUMP_FORMAT,
+        "created_at": created_at,
+        "schema": schema,
+        # Same shape as the backup manifest (restore.verify_db compares it); sqlite_sequence is not counted there
+        "tables": {name: rows for name, rows in counts.items() if name != _SEQUENCE_TABLE},
+        "chunks": chunks,
+    }
+    path = out_dir / "manifest.json"
+    path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return path
+
+
+def _iter_chunk_rows(path: Path) -> Iterator[list]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            yield [_decode(v) for v in json.loads(line)]
+
+
+def load_chunk(chunk_path: str, sha256: str, create_sql: str, table: str, part_path: str) -> int:
+    """Worker: verify one chunk and decode it into a part DB holding only that table. Returns rows loaded."""
+    path = Path(chunk_path)
+    if sha256_file(path) != sha256:
+        raise ValueError(f"{path.name}: checksum does not match the manifest")
+    conn = sqlite3.connect(part_path, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute(create_sql)
+        columns = conn.execute(f"SELECT * FROM {_quote(table)} LIMIT 0").description
+        placeholders = ", ".join("?" for _ in columns)
+        conn.execute("BEGIN")
+        cursor = conn.executemany(f"INSERT INTO {_quote(table)} VALUES ({placeholders})", _iter_chunk_rows(path))
+        conn.execute("COMMIT")
+        return cursor.rowcount
+    finally:
+        conn.close()
+
+
+def load_dump(dump_dir: Path, conn: sqlite3.Connection, manifest: dict, workers: Optional[int] = None) -> int:
+    """
+    Rebuild the dump into conn (an empty DB in autocommit mode). Tables are created first, chunks merged in
+    manifest order as the workers finish them, indexes / triggers / views created at the end. Returns rows loaded.
+    """
+    if manifest.get("format") != DUMP_FORMAT:
+        raise ValueError(f"Not a chunked dump: {manifest.get('format')}")
+    table_sql = {s["name"]: s["sql"] for s in manifest["schema"] if s["type"] == "table"}
+    for sql in table_sql.values():
+        conn.execute(sql)
+    data_chunks = [c for c in manifest["chunks"] if c["table"] != _SEQUENCE_TABLE]
+    parts = [dump_dir / f"part.{n:05d}.db" for n in range(len(data_chunks))]
+    for part in parts:
+        part.unlink(missing_ok=True)
+    total = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            results = pool.map(
+                load_chunk,
+                [str(dump_dir / c["file"]) for c in data_chunks],
+                [c["sha256"] for c in data_chunks],
+                [table_sql[c["table"]] for c in data_chunks],
+                [c["table"] for c in data_chunks],
+                [str(p) for p in parts],
+            )
+            for chunk, part, rows in zip(data_chunks, parts, results):
+                conn.execute("ATTACH DATABASE ? AS part", (str(part),))
+                try:
+                    table = _quote(chunk["table"])
+                    conn.execute(f"INSERT INTO main.{table} SELECT * FROM part.{table}")
+                finally:
+                    conn.execute("DETACH DATABASE part")
+                part.unlink()
+                total += rows
+    finally:
+        for part in parts:
+            part.unlink(missing_ok=True)
+    for chunk in manifest["chunks"]:
+        if chunk["table"] == _SEQUENCE_TABLE:
+            if sha256_file(dump_dir / chunk["file"]) != chunk["sha256"]:
+                raise ValueError(f"{chunk['file']}: checksum does not match the manifest")
+            conn.execute(f"DELETE FROM {_SEQUENCE_TABLE}")
+            conn.executemany(f"INSERT INTO {_SEQUENCE_TABLE} VALUES (?, ?)", _iter_chunk_rows(dump_dir / chunk["file"]))
+    for entry in manifest["schema"]:
+        if entry["type"] != "table":
+            conn.execute(entry["sql"])
+    return total
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bot.utils.dump", description="Parallel chunked logical dump of the casino DB.")
+    parser.add_argument("--db", help="DB file to dump (default: DATABASE_PATH from config)")
+    parser.add_argument("--out", type=Path, help="Output directory (default: backups/dump_<UTC time>)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+    db_path = args.db
+    if db_path is None:
+        from bot.config import get_config
+
+        db_path = get_config().database_path
+    out_dir = args.out or Path(db_path).resolve().parent.parent / "backups" / f"dump_{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}"
+    started = time.monotonic()
+    try:
+        manifest_file = create_dump(db_path, out_dir, workers=args.workers)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Dump failed: {e}", file=sys.stderr)
+        return 1
+    manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
+    print(f"Dumped {db_path} -> {out_dir} in {time.monotonic() - started:.1f}s ({len(manifest['chunks'])} chunks)")
+    for name, rows in manifest["tables"].items():
+        print(f"  {name}: {rows}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
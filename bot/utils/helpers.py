@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 from bot.core.constants import IMAGES_DIR
@@ -17,6 +18,15 @@ def get_image_path(screen: str, lang: str) -> Path:
     return folder / f"basalt_{screen}.png"
 
 
+def process_rss_bytes() -> int:
+    """Current resident set size of this process (Linux /proc), 0 if unavailable."""
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+    except (OSError, ValueError, IndexError):
+        return 0
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
 def format_amount(amount: int) -> str:
     """Format amount with thousands separator and currency (e.g. 1 500 ₽)."""
     return f"{amount:,}".replace(",", " ") + " ₽"
@@ -0,0 +1,107 @@
+"""
+Background integrity checks on a read-only connection (blocking: call via asyncio.to_thread). PRAGMA quick_check
+runs one table (with its indexes) per slice, and the balance invariant (balance_ledger sums == user_balances) one
+user_id range per slice, with a pause in between. In WAL mode readers never block the bot's writes.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List
+
+# quick_check messages kept per table, balance mismatches kept per run
+INTEGRITY_MAX_ERRORS = 20
+INTEGRITY_USERS_PER_SLICE = 5000
+INTEGRITY_SLICE_PAUSE = 0.05
+
+_MISMATCH_SQL = """
+SELECT b.user_id, b.real_balance, COALESCE(l.real_sum, 0), b.demo_balance, COALESCE(l.demo_sum, 0)
+FROM user_balances b
+LEFT JOIN (
+    SELECT user_id,
+           SUM(CASE WHEN account = 'real' THEN amount ELSE 0 END) AS real_sum,
+           SUM(CASE WHEN account = 'demo' THEN amount ELSE 0 END) AS demo_sum
+    FROM balance_ledger
+    WHERE user_id > ? AND user_id <= ?
+    GROUP BY user_id
+) l ON l.user_id = b.user_id
+WHERE b.user_id > ? AND b.user_id <= ?
+  AND (b.real_balance != COALESCE(l.real_sum, 0) OR b.demo_balance != COALESCE(l.demo_sum, 0))
+ORDER BY b.user_id
+"""
+
+
+@dataclass
+class BalanceMismatch:
+    user_id: int
+    account: str
+    balance: int
+    ledger: int
+
+
+@dataclass
+class IntegrityReport:
+    tables: int = 0
+    users: int = 0
+    problems: List[str] = field(default_factory=list)
+    mismatches: List[BalanceMismatch] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.problems and not self.mismatches
+
+
+def _connect_ro(db_path: str) -> sqlite3.Connection:
+    return sqlite3.connect(f"file:{Path(db_path).resolve()}?mode=ro", uri=True, timeout=30)
+
+
+def quick_check(conn: sqlite3.Connection, report: IntegrityReport) -> None:
+    """PRAGMA quick_check(table) for every table, one statement (one read snapshot) per table."""
+    tables = [r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name")]
+    for name in tables:
+        escaped = name.replace('"', '""')
+        rows = conn.execute(f'PRAGMA quick_check("{escaped}")').fetchmany(INTEGRITY_MAX_ERRORS)
+        report.problems.extend(f"{name}: {row[0]}" for row in rows if row[0] != "ok")
+        report.tables += 1
+        time.sleep(INTEGRITY_SLICE_PAUSE)
+
+
+def check_balances(conn: sqlite3.Connection, report: IntegrityReport) -> None:
+    """Users whose real or demo balance differs from the sum of their balance_ledger movements."""
+    low = -(2**63)
+    top = conn.execute("SELECT MAX(user_id) FROM user_balances").fetchone()[0]
+    while top is not None and low < top:
+        # Next slice boundary: the INTEGRITY_USERS_PER_SLICE-th user_id above low (primary key range scan)
+        row = conn.execute("SELECT user_id FROM user_balances WHERE user_id > ? ORDER BY user_id LIMIT 1 OFFSET ?", (low, INTEGRITY_USERS_PER_SLICE - 1)).fetchone()
+        high = row[0] if row else top
+        for user_id, real, real_sum, demo, demo_sum in conn.execute(_MISMATCH_SQL, (low, high, low, high)):
+            if len(report.mismatches) >= INTEGRITY_MAX_ERRORS:
+                break
+            if real != real_sum:
+                report.mismatches.append(BalanceMismatch(user_id, "real", real, real_sum))
+            if demo != demo_sum:
+                report.mismatches.append(BalanceMismatch(user_id, "demo", demo, demo_sum))
+        report.users += conn.execute("SELECT COUNT(*) FROM user_balances WHERE user_id > ? AND user_id <= ?", (low, high)).fetchone()[0]
+        low = high
+        time.sleep(INTEGRITY_SLICE_PAUSE)
+
+
+def check_integrity(db_path: str) -> IntegrityReport:
+    """quick_check of every table, then the balance invariant. A DB too damaged to open is reported, not raised."""
+    started = time.monotonic()
+    report = IntegrityReport()
+    try:
+        conn = _connect_ro(db_path)
+        try:
+            quick_check(conn, report)
+            check_balances(conn, report)
+        finally:
+            conn.close()
+    except sqlite3.DatabaseError as e:
+        report.problems.append(f"database: {e}")
+    report.seconds = time.monotonic() - started
+    return report
@@ -0,0 +1,100 @@
+"""Per-key execution lanes: one asyncio.Lock per key (user id), dropped when no handler holds or awaits it."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Hashable, Optional, Union
+
+from bot.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+LaneKey = Callable[..., Union[Optional[Hashable], Awaitable[Optional[Hashable]]]]
+
+
+class KeyedLocks:
+    """
+    Serializes coroutines sharing a key; different keys run in parallel.
+    Locks live in a WeakValueDictionary, so a key's lock disappears once nobody holds or waits on it.
+    """
+
+    def __init__(self) -> None:
+        self._locks: "weakref.WeakValueDictionary[Hashable, asyncio.Lock]" = weakref.WeakValueDictionary()
+        self.acquired = 0
+        self.contended = 0
+        self.waiting = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _lock_for(self, key: Hashable) -> asyncio.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[key] = lock
+        return lock
+
+    @asynccontextmanager
+    async def hold(self, key: Hashable) -> AsyncIterator[None]:
+        lock = self._lock_for(key)
+        if lock.locked():
+            self.contended += 1
+        started = time.monotonic()
+        self.waiting += 1
+        try:
+            await lock.acquire()
+        finally:
+            self.waiting -= 1
+        waited = time.monotonic() - started
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        try:
+            yield
+        finally:
+            lock.release()
+
+    def stats(self) -> dict:
+        return {
+            "keys": len(self._locks),
+            "acquired": self.acquired,
+            "contended": self.contended,
+            "waiting": self.waiting,
+            "avg_wait_ms": round(self.total_wait / self.acquired * 1000, 2) if self.acquired else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 2),
+        }
+
+
+user_lanes = KeyedLocks()
+
+
+def _from_user_id(event: Any, **kwargs: Any) -> Optional[int]:
+    user = getattr(event, "from_user", None)
+    return user.id if user else None
+
+
+def user_lane(key: LaneKey = _from_user_id) -> Callable:
+    """
+    Handler decorator: run the handler inside the lane of key(event, **handler_kwargs) (sync or async).
+    Default key is the sender's user id; None runs the handler without a lane.
+    functools.wraps keeps the handler signature, so aiogram still injects state, usd_rate, etc.
+    """
+
+    def decorator(handler: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(handler)
+        async def wrapper(event: Any, *args: Any, **kwargs: Any) -> Any:
+            lane = key(event, **kwargs)
+            if inspect.isawaitable(lane):
+                lane = await lane
+            if lane is None:
+                return await handler(event, *args, **kwargs)
+            async with user_lanes.hold(lane):
+                return await handler(event, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,146 @@
+"""
+SQLite maintenance on a separate short-lived connection (blocking: call via asyncio.to_thread): planner
+statistics, incremental vacuum in bounded steps, and file sizes for the admin System screen. Checkpoints are left
+to the WAL archiver (bot/utils/wal_archive.py): a checkpoint it does not know about breaks the PITR chain.
+
+A DB created before auto_vacuum=INCREMENTAL needs one full VACUUM, which rewrites the whole file under the write
+lock; run it offline with the bot stopped: python -m bot.utils.maintenance --convert-auto-vacuum [--db PATH].
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from bot.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# One vacuum run reclaims at most this many free pages, VACUUM_STEP_PAGES per transaction with a pause between
+VACUUM_MAX_PAGES = 50000
+VACUUM_STEP_PAGES = 1000
+VACUUM_STEP_PAUSE = 0.05
+_AUTO_VACUUM_INCREMENTAL = 2
+AUTO_VACUUM_NAMES = {0: "none", 1: "full", 2: "incremental"}
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(Path(db_path).resolve(), timeout=30)
+    # Only the WAL archiver may checkpoint on its own (frames it has not copied yet would be lost)
+    conn.execute("PRAGMA wal_autocheckpoint = 0")
+    return conn
+
+
+def file_sizes(db_path: str) -> Tuple[int, int]:
+    """(db bytes, wal bytes); 0 for a missing file."""
+    path = Path(db_path).resolve()
+    sizes = []
+    for candidate in (path, Path(f"{path}-wal")):
+        try:
+            sizes.append(os.stat(candidate).st_size)
+        except FileNotFoundError:
+            sizes.append(0)
+    return sizes[0], sizes[1]
+
+
+def optimize(db_path: str) -> None:
+    """PRAGMA optimize: re-analyzes only the tables whose statistics are stale (cheap, run often)."""
+    conn = _connect(db_path)
+    try:
+        conn.execute("PRAGMA optimize")
+    finally:
+        conn.close()
+
+
+def analyze(db_path: str) -> None:
+    """Refresh planner statistics (sqlite_stat1) for all tables and indexes."""
+    conn = _connect(db_path)
+    try:
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def incremental_vacuum(db_path: str, max_pages: Optional[int] = None) -> int:
+    """
+    Return free pages to the filesystem in short steps (the write lock is held per step only). Returns pages
+    reclaimed. A DB not in auto_vacuum=INCREMENTAL is left alone with a warning: see convert_auto_vacuum.
+    """
+    max_pages = max_pages or VACUUM_MAX_PAGES
+    conn = _connect(db_path)
+    conn.isolation_level = None
+    try:
+        mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+        if mode != _AUTO_VACUUM_INCREMENTAL:
+            log.warning(
+                "Incremental vacuum skipped: auto_vacuum is {}; stop the bot and run python -m bot.utils.maintenance --convert-auto-vacuum",
+                AUTO_VACUUM_NAMES.get(mode, mode),
+            )
+            return 0
+        reclaimed = 0
+        while reclaimed < max_pages:
+            free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if not free:
+                break
+            step = min(VACUUM_STEP_PAGES, free, max_pages - reclaimed)
+            # executescript steps the pragma to completion; a plain execute() frees only one page
+            conn.executescript(f"PRAGMA incremental_vacuum({int(step)});")
+            freed = free - conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if freed <= 0:
+                break
+            reclaimed += freed
+            time.sleep(VACUUM_STEP_PAUSE)
+        return reclaimed
+    finally:
+        conn.close()
+
+
+def convert_auto_vacuum(db_path: str) -> int:
+    """
+    Switch the DB to auto_vacuum=INCREMENTAL with one full VACUUM (offline: it rewrites the file and holds the
+    write lock throughout). Returns pages reclaimed; 0 if the DB is already incremental.
+    """
+    conn = _connect(db_path)
+    conn.isolation_level = None
+    try:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == _AUTO_VACUUM_INCREMENTAL:
+            return 0
+        before = conn.execute("PRAGMA page_count").fetchone()[0]
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        return before - conn.execute("PRAGMA page_count").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bot.utils.maintenance", description="Offline SQLite maintenance of the casino DB (stop the bot first).")
+    parser.add_argument("--db", help="DB file (default: DATABASE_PATH from config)")
+    parser.add_argument("--convert-auto-vacuum", action="store_true", help="Switch the DB to auto_vacuum=INCREMENTAL with one full VACUUM")
+    args = parser.parse_args(argv)
+    if not args.convert_auto_vacuum:
+        parser.print_help()
+        return 2
+    db_path = args.db
+    if db_path is None:
+        from bot.config import get_config
+
+        db_path = get_config().database_path
+    started = time.monotonic()
+    try:
+        reclaimed = convert_auto_vacuum(db_path)
+    except sqlite3.Error as e:
+        print(f"Conversion failed: {e}", file=sys.stderr)
+        return 1
+    print(f"{db_path}: auto_vacuum=incremental, {reclaimed} pages reclaimed in {time.monotonic() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Retention purge in bounded batches on a dedicated connection. Each batch picks the ids of the oldest expired rows
+through the time index (LIMIT batch size), deletes them by primary key in its own short transaction, then yields so
+game settlements are not stalled behind one long DELETE. The batch size follows the observed write latency.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Optional
+
+import aiosqlite
+
+from bot.database.connection import dedicated_connection
+from bot.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+PURGE_BATCH_ROWS = 2000
+PURGE_MIN_BATCH_ROWS = 100
+PURGE_MAX_BATCH_ROWS = 20000
+# One batch (delete + commit) should hold the write lock for about this long
+PURGE_TARGET_BATCH_SECONDS = 0.05
+# Pause between batches so queued writes (settlements) go first
+PURGE_PAUSE_SECONDS = 0.02
+
+
+@dataclass
+class PurgeProgress:
+    table: str
+    deleted: int = 0
+    batches: int = 0
+    batch_rows: int = PURGE_BATCH_ROWS
+    last_batch_seconds: float = 0.0
+    done: bool = False
+
+
+ProgressCallback = Callable[[PurgeProgress], Awaitable[None]]
+
+
+def next_batch_size(current: int, elapsed: float) -> int:
+    """Halve when a batch took over the target, double when it took under half of it; clamp to min/max."""
+    if elapsed > PURGE_TARGET_BATCH_SECONDS:
+        current //= 2
+    elif elapsed < PURGE_TARGET_BATCH_SECONDS / 2:
+        current *= 2
+    return max(PURGE_MIN_BATCH_ROWS, min(PURGE_MAX_BATCH_ROWS, current))
+
+
+async def purge_batches(
+    conn: aiosqlite.Connection,
+    table: str,
+    time_column: str,
+    where: str,
+    params: tuple,
+    on_progress: Optional[ProgressCallback] = None,
+    before_delete: Optional[Callable[[List[int]], Awaitable[None]]] = None,
+) -> PurgeProgress:
+    """
+    Delete rows of `table` matching `where` oldest first, on conn (a dedicated connection: the rollback on failure
+    must not discard other coroutines' pending statements). Each batch is at most batch_rows ids taken from the index
+    on time_column; they are deleted by id with `where` re-checked. before_delete(ids) runs first and raises if the
+    rows must not go yet (the archiver stores them there).
+    """
+    progress = PurgeProgress(table=table, batch_rows=PURGE_BATCH_ROWS)
+    while True:
+        cursor = await conn.execute(f"SELECT id FROM {table} WHERE {where} ORDER BY {time_column} LIMIT ?", (*params, progress.batch_rows))
+        ids = [row[0] for row in await cursor.fetchall()]
+        await cursor.close()
+        if not ids:
+            break
+        started = time.monotonic()
+        try:
+            if before_delete is not None:
+                await before_delete(ids)
+            cursor = await conn.executemany(f"DELETE FROM {table} WHERE id = ? AND {where}", [(row_id, *params) for row_id in ids])
+            deleted = cursor.rowcount
+            await cursor.close()
+            await conn.commit()
+        except Exception:
+            await conn.rollback()
+            raise
+        progress.last_batch_seconds = time.monotonic() - started
+        progress.deleted += deleted
+        progress.batches += 1
+        progress.batch_rows = next_batch_size(progress.batch_rows, progress.last_batch_seconds)
+        if on_progress is not None:
+            await on_progress(progress)
+        await asyncio.sleep(PURGE_PAUSE_SECONDS)
+    progress.done = True
+    if on_progress is not None:
+        await on_progress(progress)
+    if progress.deleted:
+        log.info("Purge {}: deleted {} rows in {} batches", table, progress.deleted, progress.batches)
+    return progress
+
+
+async def purge_payment_requests(db_path: str, cutoff: str, on_progress: Optional[ProgressCallback] = None) -> int:
+    """Processed (approved / rejected) requests with created_at < cutoff, via idx_payment_requests_status_created."""
+    deleted = 0
+    async with dedicated_connection(db_path) as conn:
+        for status in ("approved", "rejected"):
+            progress = await purge_batches(conn, "payment_requests", "created_at", "status = ? AND created_at < ?", (status, cutoff), on_progress)
+            deleted += progress.deleted
+    return deleted
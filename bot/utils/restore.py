@@ -0,0 +1,262 @@
+"""
+Restore a backup into the live DB path: python -m bot.utils.restore backups/casino_YYYY-MM-DD.db.gz [--target PATH]
+[--check]. Stop the bot first. The backup is loaded into a temporary file next to the target, verified
+(integrity_check, manifest row counts and checksums) and only then swapped in with one rename; the previous DB
+is kept as <target>.pre-restore. With --pitr [--until TIME] the DB is rebuilt from the WAL archive instead
+(bot/utils/wal_archive.py): the newest base backup before TIME plus the archived WAL segments up to TIME. A
+directory written by python -m bot.utils.dump is loaded with its parallel loader.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from bot.utils.backup import manifest_path
+from bot.utils.checksum import sha256_file
+from bot.utils.dump import load_dump
+from bot.utils.wal_archive import recovery_plan, replay_segments, wal_archive_dir_for
+
+_CHUNK_BYTES = 1024 * 1024
+# Bulk-load pragmas for the SQL dump replay: the file is thrown away on failure, so no journal or fsync is needed
+_LOAD_PRAGMAS = ("PRAGMA journal_mode = OFF", "PRAGMA synchronous = OFF", "PRAGMA cache_size = -262144", "PRAGMA locking_mode = EXCLUSIVE")
+_INDEX_RE = re.compile(r"^CREATE\s+(UNIQUE\s+)?INDEX", re.IGNORECASE)
+
+
+class RestoreError(Exception):
+    """Backup is unreadable or does not match its manifest; the target was not touched."""
+
+
+@dataclass
+class RestoreReport:
+    source: str
+    target: str
+    tables: Dict[str, int] = field(default_factory=dict)
+    manifest_checked: bool = False
+    seconds: float = 0.0
+    previous: Optional[str] = None
+    segments: int = 0
+
+
+def _load_manifest(backup_path: Path) -> Optional[dict]:
+    path = backup_path / "manifest.json" if backup_path.is_dir() else manifest_path(backup_path)
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else None
+
+
+def _load_db_gz(backup_path: Path, out_path: Path, manifest: Optional[dict]) -> None:
+    """Page-level backup (casino_*.db.gz): decompress, checking both checksums when a manifest exists."""
+    if manifest and sha256_file(backup_path) != manifest["gz_sha256"]:
+        raise RestoreError(f"{backup_path.name}: archive checksum does not match the manifest")
+    digest = hashlib.sha256()
+    with gzip.open(backup_path, "rb") as src, open(out_path, "wb") as dst:
+        for chunk in iter(lambda: src.read(_CHUNK_BYTES), b""):
+            digest.update(chunk)
+            dst.write(chunk)
+    if manifest and digest.hexdigest() != manifest["db_sha256"]:
+        raise RestoreError(f"{backup_path.name}: database checksum does not match the manifest")
+
+
+def _iter_statements(backup_path: Path):
+    """Complete SQL statements of a legacy iterdump file (statements may span lines)."""
+    buffer: List[str] = []
+    with gzip.open(backup_path, "rt", encoding="utf-8") as f:
+        for line in f:
+            buffer.append(line)
+            statement = "".join(buffer)
+            if sqlite3.complete_statement(statement):
+                buffer.clear()
+                yield statement.strip()
+    if "".join(buffer).strip():
+        raise RestoreError(f"{backup_path.name}: dump ends in the middle of a statement")
+
+
+def _load_sql_dump(backup_path: Path, out_path: Path) -> None:
+    """Legacy text dump (casino_*.gz): replay in one transaction with bulk pragmas, indexes built after the data."""
+    conn = sqlite3.connect(out_path, isolation_level=None)
+    try:
+        for pragma in _LOAD_PRAGMAS:
+            conn.execute(pragma)
+        indexes: List[str] = []
+        conn.execute("BEGIN")
+        for statement in _iter_statements(backup_path):
+            if statement.upper() in ("BEGIN TRANSACTION;", "COMMIT;"):
+                continue
+            if _INDEX_RE.match(statement):
+                indexes.append(statement)
+                continue
+            conn.execute(statement)
+        for statement in indexes:
+            conn.execute(statement)
+        conn.execute("COMMIT")
+    except sqlite3.Error as e:
+        raise RestoreError(f"{backup_path.name}: {e}") from e
+    finally:
+        conn.close()
+
+
+def _load_chunked_dump(dump_dir: Path, out_path: Path, manifest: Optional[dict]) -> None:
+    """Chunked dump directory (bot/utils/dump.py): chunks are checked and decoded in parallel, merged by one writer."""
+    if manifest is None:
+        raise RestoreError(f"{dump_dir.name}: manifest.json is missing")
+    conn = sqlite3.connect(out_path, isolation_level=None)
+    try:
+        for pragma in _LOAD_PRAGMAS:
+            conn.execute(pragma)
+        load_dump(dump_dir, conn, manifest)
+    except (ValueError, sqlite3.Error) as e:
+        raise RestoreError(f"{dump_dir.name}: {e}") from e
+    finally:
+        conn.close()
+
+
+def verify_db(path: Path, manifest: Optional[dict]) -> Dict[str, int]:
+    """integrity_check plus row counts; with a manifest the counts must match it exactly. Returns the counts."""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        result = conn.execute("PRAGMA integrity_check").fetchone()[0]
+        if result != "ok":
+            raise RestoreError(f"integrity_check failed: {result}")
+        tables = [r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name")]
+        counts = {name: conn.execute(f'SELECT COUNT(*) FROM "{name}"').fetchone()[0] for name in tables}
+    finally:
+        conn.close()
+    if manifest is not None and counts != manifest["tables"]:
+        diff = sorted(name for name in set(counts) | set(manifest["tables"]) if counts.get(name) != manifest["tables"].get(name))
+        raise RestoreError(f"Row counts differ from the manifest: {', '.join(diff)}")
+    return counts
+
+
+def swap_into_place(new_path: Path, target: Path) -> Optional[Path]:
+    """
+    Keep the current DB as <target>.pre-restore (hard link, no copy) and move its -wal along as
+    <target>.pre-restore-wal: with autocheckpoint off the WAL holds every commit since the last archiver step, and
+    under that name SQLite applies it when the .pre-restore file is opened. -shm / -journal are dropped so they
+    cannot be applied to the restored file, then the new file is renamed over the target (atomic on one filesystem).
+    """
+    previous = None
+    wal = Path(f"{target}-wal")
+    if target.exists():
+        previous = target.with_name(target.name + ".pre-restore")
+        for path in (previous, Path(f"{previous}-wal"), Path(f"{previous}-shm")):
+            path.unlink(missing_ok=True)
+        try:
+            os.link(target, previous)
+        except OSError:
+            shutil.copy2(target, previous)
+        if wal.exists():
+            os.replace(wal, f"{previous}-wal")
+    for suffix in ("-wal", "-shm", "-journal"):
+        Path(f"{target}{suffix}").unlink(missing_ok=True)
+    os.replace(new_path, target)
+    return previous
+
+
+def restore_backup(backup_path: Path, target: Path, check_only: bool = False) -> RestoreReport:
+    """Load, verify and (unless check_only) swap in. Raises RestoreError; the target is untouched on failure."""
+    started = time.monotonic()
+    backup_path, target = backup_path.resolve(), target.resolve()
+    manifest = _load_manifest(backup_path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    work = target.with_name(target.name + ".restoring")
+    work.unlink(missing_ok=True)
+    report = RestoreReport(source=str(backup_path), target=str(target), manifest_checked=manifest is not None)
+    try:
+        if backup_path.is_dir():
+            _load_chunked_dump(backup_path, work, manifest)
+        elif backup_path.name.endswith(".db.gz"):
+            _load_db_gz(backup_path, work, manifest)
+        elif backup_path.suffix == ".gz":
+            _load_sql_dump(backup_path, work)
+        else:
+            raise RestoreError(f"Unknown backup format: {backup_path.name}")
+        report.tables = verify_db(work, manifest)
+        if not check_only:
+            previous = swap_into_place(work, target)
+            report.previous = str(previous) if previous else None
+    finally:
+        work.unlink(missing_ok=True)
+    report.seconds = time.monotonic() - started
+    return report
+
+
+def restore_point_in_time(archive_dir: Path, target: Path, until: Optional[datetime] = None, check_only: bool = False) -> RestoreReport:
+    """Base backup from the WAL archive plus its segments up to until (latest when None), verified, then swapped in."""
+    started = time.monotonic()
+    target = target.resolve()
+    try:
+        base, segments = recovery_plan(archive_dir, until)
+    except ValueError as e:
+        raise RestoreError(str(e)) from e
+    manifest = _load_manifest(base)
+    if manifest is None:
+        raise RestoreError(f"{base.name}: manifest is missing")
+    target.parent.mkdir(parents=True, exist_ok=True)
+    work = target.with_name(target.name + ".restoring")
+    work.unlink(missing_ok=True)
+    report = RestoreReport(source=str(base), target=str(target), manifest_checked=True, segments=len(segments))
+    try:
+        _load_db_gz(base, work, manifest)
+        replay_segments(work, segments, manifest["page_size"])
+        # Row counts moved on since the base was taken: only integrity is checked after the replay
+        report.tables = verify_db(work, manifest if not segments else None)
+        if not check_only:
+            previous = swap_into_place(work, target)
+            report.previous = str(previous) if previous else None
+    finally:
+        work.unlink(missing_ok=True)
+    report.seconds = time.monotonic() - started
+    return report
+
+
+def _parse_until(value: str) -> datetime:
+    """ISO time (2026-03-20T14:05, 2026-03-20 14:05:00+03:00); naive means UTC."""
+    parsed = datetime.fromisoformat(value)
+    return parsed.replace(tzinfo=timezone.utc) if parsed.tzinfo is None else parsed.astimezone(timezone.utc)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bot.utils.restore", description="Restore a casino DB backup (stop the bot first).")
+    parser.add_argument("backup", type=Path, nargs="?", help="backups/casino_YYYY-MM-DD.db.gz, a dump directory or a legacy casino_YYYY-MM-DD.gz SQL dump")
+    parser.add_argument("--target", type=Path, help="DB file to replace (default: DATABASE_PATH from config)")
+    parser.add_argument("--check", action="store_true", help="Load and verify only, do not replace the DB")
+    parser.add_argument("--pitr", action="store_true", help="Rebuild from the WAL archive next to the target instead of a backup file")
+    parser.add_argument("--until", type=_parse_until, help="With --pitr: restore the state as of this time (ISO, UTC unless an offset is given)")
+    args = parser.parse_args(argv)
+    if args.pitr == (args.backup is not None):
+        parser.error("give either a backup file or --pitr")
+    target = args.target
+    if target is None:
+        from bot.config import get_config
+
+        target = Path(get_config().database_path)
+    try:
+        if args.pitr:
+            report = restore_point_in_time(wal_archive_dir_for(str(target)), target, until=args.until, check_only=args.check)
+        else:
+            report = restore_backup(args.backup, target, check_only=args.check)
+    except (RestoreError, OSError) as e:
+        print(f"Restore failed: {e}", file=sys.stderr)
+        return 1
+    print(f"{'Verified' if args.check else 'Restored'} {report.source} -> {report.target} in {report.seconds:.1f}s")
+    print(f"Manifest: {'checked' if report.manifest_checked else 'none (legacy dump)'}; previous DB: {report.previous or '-'}")
+    if args.pitr:
+        print(f"WAL segments replayed: {report.segments}")
+    for name, rows in report.tables.items():
+        print(f"  {name}: {rows}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
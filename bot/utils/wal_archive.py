@@ -0,0 +1,324 @@
+"""
+Continuous WAL archiving for point-in-time recovery. Every minute the archiver copies the WAL frames committed since
+its last step into <db dir>/wal_archive/seg_<seq>_<time>.wal, then holds the write lock for a moment to copy the
+last few frames and checkpoint (PASSIVE) before letting writers go, so the WAL is only ever restarted after all its frames were archived. The bot
+connection runs with wal_autocheckpoint=0 for that reason: commits do no checkpoint work at all. Base backups
+(backup API, base_<seq>_<time>.db.gz) are taken daily; restore = newest base before the target time plus the
+segments after it, replayed page by page (python -m bot.utils.restore --pitr --until ...).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import os
+import shutil
+import sqlite3
+import struct
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from bot.utils.backup import create_backup, manifest_path
+from bot.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+WAL_ARCHIVE_KEEP_BASES = 7
+# Frames the archiver may still have to copy while it holds the write lock (~4 MB with 4 KiB pages); above that it
+# makes another pass without the lock first, up to _UNLOCKED_PASSES
+WAL_ARCHIVE_LOCKED_FRAMES = 1000
+_UNLOCKED_PASSES = 3
+_WAL_HEADER_BYTES = 32
+_FRAME_HEADER_BYTES = 24
+_NAME_TS_FORMAT = "%Y%m%dT%H%M%SZ"
+_COPY_CHUNK_BYTES = 1024 * 1024
+
+
+def wal_archive_dir_for(db_path: str) -> Path:
+    return Path(db_path).resolve().parent / "wal_archive"
+
+
+@dataclass
+class ArchiveStep:
+    segment: Optional[Path]
+    frames: int
+    # The WAL was restarted by someone else after frames we never copied: the chain needs a new base backup
+    gap: bool = False
+
+
+def _load_state(archive_dir: Path) -> dict:
+    path = archive_dir / "state.json"
+    if path.exists():
+        return json.loads(path.read_text(encoding="utf-8"))
+    return {"seq": 0, "salt": None, "offset": _WAL_HEADER_BYTES, "checkpointed": True, "gaps": []}
+
+
+def _save_state(archive_dir: Path, state: dict) -> None:
+    tmp = archive_dir / "state.json.tmp"
+    tmp.write_text(json.dumps(state, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, archive_dir / "state.json")
+
+
+def _name_ts(now: datetime) -> str:
+    return now.strftime(_NAME_TS_FORMAT)
+
+
+def _parse_name(path: Path) -> Tuple[int, datetime]:
+    """seg_0000000042_20260320T140500Z.wal.gz / base_0000000042_20260320T022000Z.db.gz -> (42, time)."""
+    _, seq, ts = path.name.split(".", 1)[0].split("_")
+    return int(seq), datetime.strptime(ts, _NAME_TS_FORMAT).replace(tzinfo=timezone.utc)
+
+
+def _read_header(wal_path: Path) -> Optional[Tuple[bytes, int]]:
+    """(salt, page size) of the current WAL generation (the salt changes whenever the WAL is restarted); None without a WAL."""
+    try:
+        with open(wal_path, "rb") as f:
+            header = f.read(_WAL_HEADER_BYTES)
+    except FileNotFoundError:
+        return None
+    if len(header) < _WAL_HEADER_BYTES:
+        return None
+    return header[16:24], struct.unpack(">I", header[8:12])[0]
+
+
+def _start_offset(state: dict, salt_hex: str) -> Tuple[int, bool]:
+    """Where the uncopied frames of WAL generation salt_hex begin, and whether frames were lost before it (gap)."""
+    if salt_hex == state["salt"]:
+        return state["offset"], False
+    return _WAL_HEADER_BYTES, state["salt"] is not None and not state["checkpointed"]
+
+
+def _copy_committed_frames(wal_path: Path, header: Tuple[bytes, int], start: int, out_path: Path) -> Tuple[int, int]:
+    """
+    Append the frames from offset start that carry the generation's salt, up to the last commit frame, to out_path
+    and fsync it. Returns (end offset, frames copied).
+    """
+    salt, page_size = header
+    frame_bytes = _FRAME_HEADER_BYTES + page_size
+    end, frames, pending = start, 0, 0
+    with open(wal_path, "rb") as f, open(out_path, "ab") as out:
+        base = out.tell()
+        f.seek(start)
+        while True:
+            frame = f.read(frame_bytes)
+            # Frames left over from before a restart carry the old salt: the valid log ends there
+            if len(frame) < frame_bytes or frame[8:16] != salt:
+                break
+            out.write(frame)
+            pending += 1
+            if struct.unpack(">I", frame[4:8])[0]:
+                end += pending * frame_bytes
+                frames += pending
+                pending = 0
+        out.truncate(base + end - start)
+        out.flush()
+        os.fsync(out.fileno())
+    return end, frames
+
+
+def archive_wal(db_path: str, archive_dir: Path, now: Optional[datetime] = None) -> ArchiveStep:
+    """
+    One archiver step (blocking: call via asyncio.to_thread). The bulk of the new frames is copied without any lock:
+    committed frames of a WAL generation are not rewritten until a complete checkpoint lets the WAL restart, and only
+    the archiver checkpoints. The write lock is then held just to copy the frames committed meanwhile (at most
+    WAL_ARCHIVE_LOCKED_FRAMES after the catch-up passes), re-check the salt and checkpoint. The segment is gzipped
+    after the lock is released. Concurrent calls are safe: the state is re-read under the lock.
+    """
+    now = now or datetime.now(timezone.utc)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    db = Path(db_path).resolve()
+    wal = Path(f"{db}-wal")
+    partial = archive_dir / f"seg_{_name_ts(now)}_{os.getpid()}_{threading.get_ident()}.wal.partial"
+    partial.unlink(missing_ok=True)
+    state = _load_state(archive_dir)
+    header = _read_header(wal)
+    end = None
+    if header is not None:
+        end = _start_offset(state, header[0].hex())[0]
+        for _ in range(_UNLOCKED_PASSES):
+            end, copied = _copy_committed_frames(wal, header, end, partial)
+            if copied <= WAL_ARCHIVE_LOCKED_FRAMES:
+                break
+    unlocked = (state["seq"], state["salt"], state["offset"], header)
+    segment: Optional[Path] = None
+    frames = 0
+    gap = False
+    lock = sqlite3.connect(db, timeout=30, isolation_level=None)
+    try:
+        lock.execute("PRAGMA wal_autocheckpoint = 0")
+        lock.execute("BEGIN IMMEDIATE")
+        try:
+            state = _load_state(archive_dir)
+            header = _read_header(wal)
+            if (state["seq"], state["salt"], state["offset"], header) != unlocked:
+                # Another archiver step ran, or the WAL was restarted by someone else: redo the copy under the lock
+                partial.unlink(missing_ok=True)
+                end = None
+            if header is not None:
+                start, gap = _start_offset(state, header[0].hex())
+                end, _ = _copy_committed_frames(wal, header, start if end is None else end, partial)
+                frames = (end - start) // (_FRAME_HEADER_BYTES + header[1])
+                state["salt"], state["offset"] = header[0].hex(), end
+            if frames:
+                state["seq"] += 1
+                segment = archive_dir / f"seg_{state['seq']:010d}_{_name_ts(now)}.wal"
+                os.replace(partial, segment)
+                if gap:
+                    state["gaps"].append(state["seq"])
+            # Second connection: a checkpoint does not need the write lock, and while we hold it no frame can be
+            # appended, so a complete one means the next writer restarts the WAL with nothing left uncopied
+            checkpointer = sqlite3.connect(db, timeout=30)
+            try:
+                busy, log_frames, done = checkpointer.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+            finally:
+                checkpointer.close()
+            state["checkpointed"] = busy == 0 and log_frames == done
+            state["at"] = now.strftime("%Y-%m-%dT%H:%M:%SZ")
+            _save_state(archive_dir, state)
+        finally:
+            lock.execute("ROLLBACK")
+    finally:
+        lock.close()
+        partial.unlink(missing_ok=True)
+    if gap:
+        log.warning("WAL was restarted outside the archiver; PITR chain broken before segment {}", state["seq"])
+    if segment is None:
+        return ArchiveStep(segment=None, frames=0, gap=gap)
+    gz_path = segment.with_name(segment.name + ".gz")
+    tmp = segment.with_name(segment.name + ".gz.partial")
+    with open(segment, "rb") as src, gzip.open(tmp, "wb", compresslevel=6) as dst:
+        shutil.copyfileobj(src, dst, _COPY_CHUNK_BYTES)
+    os.replace(tmp, gz_path)
+    segment.unlink()
+    return ArchiveStep(segment=gz_path, frames=frames, gap=gap)
+
+
+def list_bases(archive_dir: Path) -> List[Path]:
+    return sorted(archive_dir.glob("base_*.db.gz"), key=lambda p: _parse_name(p)[0])
+
+
+def list_segments(archive_dir: Path) -> List[Path]:
+    """Archived segments in order (a segment whose gzip step was interrupted is still a plain .wal)."""
+    by_seq = {_parse_name(p)[0]: p for p in archive_dir.glob("seg_*.wal.gz")}
+    by_seq.update({_parse_name(p)[0]: p for p in archive_dir.glob("seg_*.wal")})
+    return [by_seq[seq] for seq in sorted(by_seq)]
+
+
+async def take_base_backup(db_path: str, archive_dir: Path, now: Optional[datetime] = None) -> Path:
+    """
+    Online base backup (backup API). Segments up to the current seq are already in it; later ones may overlap
+    it, which is harmless because replaying a page image twice gives the same page.
+    """
+    now = now or datetime.now(timezone.utc)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    base_seq = _load_state(archive_dir)["seq"]
+    path = await create_backup(db_path, archive_dir, f"base_{base_seq:010d}_{_name_ts(now)}")
+    log.info("WAL archive base backup: {}", path.name)
+    return path
+
+
+def prune_archive(archive_dir: Path, keep_bases: int = WAL_ARCHIVE_KEEP_BASES) -> int:
+    """Keep the newest keep_bases bases and the segments they need. Returns files removed."""
+    bases = list_bases(archive_dir)
+    if len(bases) <= keep_bases:
+        return 0
+    oldest_seq = _parse_name(bases[-keep_bases])[0]
+    removed = 0
+    for base in bases[:-keep_bases]:
+        base.unlink(missing_ok=True)
+        manifest_path(base).unlink(missing_ok=True)
+        removed += 1
+    for segment in list_segments(archive_dir):
+        if _parse_name(segment)[0] <= oldest_seq:
+            segment.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+async def run_wal_archive(db_path: str) -> ArchiveStep:
+    """Scheduler job (every minute); takes a base backup first if there is none or the chain just broke."""
+    archive_dir = wal_archive_dir_for(db_path)
+    step = await asyncio.to_thread(archive_wal, db_path, archive_dir)
+    if step.gap or not list_bases(archive_dir):
+        await take_base_backup(db_path, archive_dir)
+    return step
+
+
+async def run_base_backup(db_path: str) -> Path:
+    """Scheduler job (daily): new base backup, then drop bases and segments past WAL_ARCHIVE_KEEP_BASES."""
+    archive_dir = wal_archive_dir_for(db_path)
+    path = await take_base_backup(db_path, archive_dir)
+    removed = prune_archive(archive_dir)
+    if removed:
+        log.info("WAL archive: removed {} old files", removed)
+    return path
+
+
+def archive_position(archive_dir: Path) -> Optional[Tuple[int, str]]:
+    """(last segment seq, time of the last archiver step): every commit before that time is in the archive."""
+    state = _load_state(archive_dir)
+    return (state["seq"], state["at"]) if state.get("at") else None
+
+
+def segments_after(archive_dir: Path, seq: int, upto: int) -> Optional[List[Path]]:
+    """Segments seq+1 .. upto in order, or None if one is missing (pruned) or a recorded gap lies in between."""
+    by_seq = {_parse_name(p)[0]: p for p in list_segments(archive_dir)}
+    wanted = range(seq + 1, upto + 1)
+    if any(n not in by_seq for n in wanted) or any(seq < g <= upto for g in _load_state(archive_dir).get("gaps", [])):
+        return None
+    return [by_seq[n] for n in wanted]
+
+
+def recovery_plan(archive_dir: Path, until: Optional[datetime] = None) -> Tuple[Path, List[Path]]:
+    """
+    Newest base taken at or before until, plus the segments after it archived at or before until. Raises
+    ValueError when there is no such base or a recorded gap lies between the base and the target.
+    """
+    bases = [b for b in list_bases(archive_dir) if until is None or _parse_name(b)[1] <= until]
+    if not bases:
+        raise ValueError(f"No base backup in {archive_dir} before the requested time")
+    base = bases[-1]
+    base_seq = _parse_name(base)[0]
+    segments = [s for s in list_segments(archive_dir) if _parse_name(s)[0] > base_seq and (until is None or _parse_name(s)[1] <= until)]
+    seqs = [_parse_name(s)[0] for s in segments]
+    if seqs and seqs != list(range(base_seq + 1, base_seq + 1 + len(seqs))):
+        missing = next(seq for seq in range(base_seq + 1, seqs[-1] + 1) if seq not in seqs)
+        raise ValueError(f"Segment {missing} is missing from {archive_dir}")
+    gaps = _load_state(archive_dir).get("gaps", [])
+    broken = [g for g in gaps if seqs and base_seq < g <= seqs[-1]]
+    if broken:
+        raise ValueError(f"WAL chain is broken before segment {broken[0]}; pick an earlier time or a newer base")
+    return base, segments
+
+
+def _iter_frames(segment: Path, page_size: int) -> Iterator[Tuple[int, int, bytes]]:
+    """(page number, db size in pages after commit or 0, page image) for every frame of a segment."""
+    opener = gzip.open if segment.suffix == ".gz" else open
+    frame_bytes = _FRAME_HEADER_BYTES + page_size
+    with opener(segment, "rb") as f:
+        while True:
+            frame = f.read(frame_bytes)
+            if len(frame) < frame_bytes:
+                return
+            pgno, commit_size = struct.unpack(">II", frame[:8])
+            yield pgno, commit_size, frame[_FRAME_HEADER_BYTES:]
+
+
+def replay_segments(db_file: Path, segments: List[Path], page_size: int) -> int:
+    """Write every frame's page image into a plain DB file, in order; a commit frame sets the file size. Returns frames."""
+    frames = 0
+    with open(db_file, "r+b") as db:
+        for segment in segments:
+            for pgno, commit_size, page in _iter_frames(segment, page_size):
+                db.seek((pgno - 1) * page_size)
+                db.write(page)
+                frames += 1
+                if commit_size:
+                    db.truncate(commit_size * page_size)
+        db.flush()
+        os.fsync(db.fileno())
+    return frames
@@ -0,0 +1,5 @@
+"""Embedded HTTP API for the Telegram WebApp (aiohttp, runs in the bot process)."""
+
+from bot.webapp.app import create_app, start_webapp
+
+__all__ = ["create_app", "start_webapp"]
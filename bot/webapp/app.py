@@ -0,0 +1,112 @@
+"""aiohttp app: GET /api/stats (caller's stats, Telegram WebApp initData auth), GET /api/metrics (live GGR, bearer token)."""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+from datetime import datetime, timezone
+from typing import Optional
+
+from aiogram.utils.web_app import safe_parse_webapp_init_data
+from aiohttp import web
+
+from bot.database.queries import user_stats as stats_queries
+from bot.services.metrics import get_metrics
+from bot.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# Stats change at most once per round; clients may reuse a response this long, then revalidate with If-None-Match
+STATS_CACHE_SECONDS = 15
+# initData signed longer ago than this is rejected (the WebApp gets a fresh one every time it is opened)
+INIT_DATA_MAX_AGE_SECONDS = 24 * 3600
+BOT_TOKEN_KEY = web.AppKey("bot_token", str)
+ALLOWED_ORIGIN_KEY = web.AppKey("allowed_origin", str)
+METRICS_TOKEN_KEY = web.AppKey("metrics_token", str)
+
+
+def _init_data(request: web.Request) -> Optional[str]:
+    """initData from 'Authorization: tma <initData>' only: in a query string it would end up in access and proxy logs."""
+    auth = request.headers.get("Authorization", "")
+    return auth[4:] if auth.startswith("tma ") else None
+
+
+def _authenticated_user_id(request: web.Request) -> int:
+    raw = _init_data(request)
+    if not raw:
+        raise web.HTTPUnauthorized(text="initData required")
+    try:
+        data = safe_parse_webapp_init_data(request.app[BOT_TOKEN_KEY], raw)
+    except ValueError:
+        raise web.HTTPUnauthorized(text="invalid initData")
+    if data.user is None:
+        raise web.HTTPUnauthorized(text="initData has no user")
+    # The signature never expires by itself: a leaked initData string must stop working after a while
+    age = (datetime.now(timezone.utc) - data.auth_date).total_seconds()
+    if age > INIT_DATA_MAX_AGE_SECONDS:
+        raise web.HTTPUnauthorized(text="initData expired")
+    return data.user.id
+
+
+async def build_stats_payload(user_id: int) -> dict:
+    """user_stats row + user_game_stats rows (both primary-key reads of counters maintained on settle)."""
+    stats = await stats_queries.get_user_stats(user_id)
+    per_game = await stats_queries.get_user_game_stats(user_id)
+    body = stats.model_dump() if stats else {"user_id": user_id}
+    body["per_game"] = [g.model_dump(exclude={"user_id"}) for g in per_game]
+    return body
+
+
+async def handle_stats(request: web.Request) -> web.Response:
+    user_id = _authenticated_user_id(request)
+    body = json.dumps(await build_stats_payload(user_id), separators=(",", ":"), sort_keys=True).encode()
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={STATS_CACHE_SECONDS}", "Vary": "Authorization"}
+    if request.headers.get("If-None-Match") == etag:
+        return web.Response(status=304, headers=headers)
+    return web.Response(body=body, content_type="application/json", headers=headers)
+
+
+async def handle_metrics(request: web.Request) -> web.Response:
+    """Live windows from bot.services.metrics; 404 unless METRICS_TOKEN is set, 401 on a wrong bearer token."""
+    token = request.app[METRICS_TOKEN_KEY]
+    if not token:
+        raise web.HTTPNotFound()
+    if not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        raise web.HTTPUnauthorized(text="bearer token required")
+    return web.json_response(get_metrics().snapshot(), headers={"Cache-Control": "no-store"})
+
+
+@web.middleware
+async def cors_middleware(request: web.Request, handler):
+    """The WebApp page (WEBAPP_BASE_URL) is usually served from another origin than the API."""
+    origin = request.app[ALLOWED_ORIGIN_KEY]
+    if request.method == "OPTIONS":
+        response = web.Response(status=204)
+    else:
+        response = await handler(request)
+    if origin:
+        response.headers["Access-Control-Allow-Origin"] = origin
+        response.headers["Access-Control-Allow-Headers"] = "Authorization, If-None-Match"
+        response.headers["Access-Control-Expose-Headers"] = "ETag"
+    return response
+
+
+def create_app(bot_token: str, allowed_origin: str = "", metrics_token: str = "") -> web.Application:
+    app = web.Application(middlewares=[cors_middleware])
+    app[BOT_TOKEN_KEY] = bot_token
+    app[ALLOWED_ORIGIN_KEY] = allowed_origin
+    app[METRICS_TOKEN_KEY] = metrics_token
+    app.router.add_get("/api/stats", handle_stats)
+    app.router.add_get("/api/metrics", handle_metrics)
+    return app
+
+
+async def start_webapp(bot_token: str, host: str, port: int, allowed_origin: str = "", metrics_token: str = "") -> web.AppRunner:
+    """Start the API on host:port inside the running event loop; call runner.cleanup() on shutdown."""
+    runner = web.AppRunner(create_app(bot_token, allowed_origin, metrics_token), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    log.info("WebApp API listening on {}:{}", host, port)
+    return runner
@@ -2,7 +2,12 @@
 
 from __future__ import annotations
 
+import sqlite3
+from pathlib import Path
+from typing import Callable, Union
+
 import aiosqlite
+import pytest
 import pytest_asyncio
 
 from bot.core.constants import BOT_DIR
@@ -27,6 +32,12 @@ async def db(monkeypatch):
             continue
         await conn.execute(stmt)
 
+    # Migrations after 002 (002 is covered by the contact columns below)
+    for path in sorted(migrations_dir.glob("0*.sql")):
+        if path.name < "003":
+            continue
+        await conn.executescript(path.read_text(encoding="utf-8"))
+
     # Force add contact columns for tests
     try:
         await conn.execute("ALTER TABLE users ADD COLUMN has_contact_sent INTEGER NOT NULL DEFAULT 0")
@@ -57,6 +68,42 @@ async def db(monkeypatch):
     monkeypatch.setattr(conn_module, "_connection", None)
 
 
+@pytest_asyncio.fixture
+async def file_db(tmp_path):
+    """Migrated SQLite file (init_db) for code that opens its own connections to the DB path. Yields the path."""
+    import bot.database.connection as conn_module
+
+    path = str(tmp_path / "casino.db")
+    await conn_module.init_db(path)
+    yield path
+    await conn_module.close_db()
+
+
+@pytest.fixture
+def sqlite_file(tmp_path):
+    """
+    Factory for plain sqlite3 file DBs (code under test opens its own connections): sqlite_file(setup, wal=False)
+    runs setup (an SQL script or a callable taking the connection) on tmp_path/casino.db, commits and returns the path.
+    """
+
+    def make(setup: Union[str, Callable[[sqlite3.Connection], None]], wal: bool = False) -> Path:
+        path = tmp_path / "casino.db"
+        conn = sqlite3.connect(path)
+        try:
+            if wal:
+                conn.execute("PRAGMA journal_mode = WAL")
+            if callable(setup):
+                setup(conn)
+            else:
+                conn.executescript(setup)
+            conn.commit()
+        finally:
+            conn.close()
+        return path
+
+    return make
+
+
 @pytest_asyncio.fixture
 async def test_user(db):
     """Create one test user (user_id=1000) with balances and stats. Requires db fixture."""
@@ -0,0 +1,84 @@
+"""Tests for the monthly games archive: move instead of delete, sealed months, ATTACH-based historical reads."""
+
+from __future__ import annotations
+
+import os
+import time
+
+import pytest
+
+from bot.database.connection import get_connection
+from bot.database.queries import users as users_queries
+from bot.utils import archive, purge
+
+
+async def _insert_games(days) -> int:
+    test_user = 1000
+    await users_queries.create_user(user_id=test_user, username="testuser", first_name="Test", last_name="User", full_name="Test User")
+    rows = [(test_user, "dice", 2, 100, "More", 0, 0, 0, f"{day}T12:00:00Z") for day in days for _ in range(30)]
+    conn = await get_connection()
+    await conn.executemany(
+        "INSERT INTO games (user_id, game_type, game_id, bet_amount, outcome, is_win, win_amount, is_demo, played_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    await conn.commit()
+    return test_user
+
+
+@pytest.mark.asyncio
+async def test_archive_moves_expired_games_by_month(file_db, monkeypatch) -> None:
+    monkeypatch.setattr(purge, "PURGE_PAUSE_SECONDS", 0)
+    test_user = await _insert_games(["2026-01-05", "2026-01-20", "2026-02-10", "2026-03-01"])
+    db = await get_connection()
+    archive_dir = archive.archive_dir_for(file_db)
+
+    assert await archive.archive_expired_games(file_db, "2026-02-15T00:00:00Z") == 90
+    cursor = await db.execute("SELECT COUNT(*), MIN(played_at) FROM games")
+    assert tuple(await cursor.fetchone()) == (30, "2026-03-01T12:00:00Z")
+    months = archive.load_manifest(archive_dir)
+    # January can no longer receive rows and is sealed; February stays open
+    assert months["2026_01"]["rows"] == 60 and months["2026_01"]["compressed"] is True
+    assert months["2026_02"]["rows"] == 30 and months["2026_02"]["compressed"] is False
+    assert sorted(p.name for p in archive_dir.glob("games_*")) == ["games_2026_01.db.gz", "games_2026_02.db"]
+    assert await archive.archive_expired_games(file_db, "2026-02-15T00:00:00Z") == 0
+
+    def build_sql(table: str) -> str:
+        return f"SELECT id, played_at FROM {table} WHERE user_id = ? ORDER BY id"
+
+    found = list(archive.iter_archived_games(file_db, build_sql, [test_user], "2026-01-10", "2026-02-28"))
+    assert len(found) == 90 and found[0][1].startswith("2026-01")
+    only_feb = list(archive.iter_archived_games(file_db, build_sql, [test_user], "2026-02-01", None))
+    assert {row[1][:7] for row in only_feb} == {"2026-02"}
+
+
+@pytest.mark.asyncio
+async def test_batch_stays_hot_until_archive_holds_it(file_db, monkeypatch) -> None:
+    monkeypatch.setattr(purge, "PURGE_PAUSE_SECONDS", 0)
+    await _insert_games(["2026-01-05"])
+    store_rows = archive._store_rows
+
+    def lose_rows(conn, rows, ids):
+        # The archive commit keeps only part of the batch: the hot rows must not be deleted
+        store_rows(conn, rows[:10], ids)
+
+    monkeypatch.setattr(archive, "_store_rows", lose_rows)
+    with pytest.raises(ValueError, match="stored 10 of 30"):
+        await archive.archive_expired_games(file_db, "2026-02-15T00:00:00Z")
+    cursor = await (await get_connection()).execute("SELECT COUNT(*) FROM games")
+    assert (await cursor.fetchone())[0] == 30
+
+    # The next run re-inserts over the rows already archived (INSERT OR IGNORE) and finishes the batch
+    monkeypatch.setattr(archive, "_store_rows", store_rows)
+    assert await archive.archive_expired_games(file_db, "2026-02-15T00:00:00Z") == 30
+    assert archive.load_manifest(archive.archive_dir_for(file_db))["2026_01"]["rows"] == 30
+
+
+def test_prune_cache_drops_months_not_read_recently(tmp_path) -> None:
+    cache = tmp_path / "cache"
+    cache.mkdir()
+    for name in ("games_2025_11.db", "games_2025_12.db"):
+        (cache / name).write_bytes(b"")
+    old = time.time() - (archive.ARCHIVE_CACHE_DAYS + 1) * 86400
+    os.utime(cache / "games_2025_11.db", (old, old))
+    assert archive.prune_cache(tmp_path) == 1
+    assert [p.name for p in cache.iterdir()] == ["games_2025_12.db"]
@@ -0,0 +1,103 @@
+"""Tests for auto-play: batched debit/credit, stop-loss / take-profit, refund of unplayed rounds."""
+
+from __future__ import annotations
+
+import pytest
+
+from bot.core.exceptions import InsufficientFunds
+from bot.services import autoplay
+
+
+def _fixed_rolls(monkeypatch, values: list[int]) -> None:
+    """Patch roll_dice to return values in order (game 2: 5 -> More, 3 -> Less)."""
+    it = iter(values)
+    monkeypatch.setattr(autoplay, "roll_dice", lambda game_id: next(it))
+
+
+@pytest.mark.asyncio
+async def test_autoplay_full_series(db, test_user: int, monkeypatch) -> None:
+    """All rounds played: balance, games and user_stats reflect every round."""
+    from bot.database.queries import games as games_queries
+    from bot.database.queries import user_stats as user_stats_queries
+    from bot.database.queries import users as users_queries
+
+    await users_queries.update_balance(test_user, real_balance=1000)
+    _fixed_rolls(monkeypatch, [5, 3, 5, 3, 3])
+    summary = await autoplay.run_autoplay(test_user, 2, 0, 100, 5, is_demo=False)
+    assert summary["played"] == 5
+    assert summary["wins"] == 2
+    assert summary["losses"] == 3
+    assert summary["won"] == 360
+    assert summary["net"] == -140
+    assert summary["stopped_by"] is None
+    row = await users_queries.get_user_balance(test_user)
+    assert row is not None
+    assert row.real_balance == 860
+    assert await games_queries.get_games_count(test_user) == 5
+    stats = await user_stats_queries.get_user_stats(test_user)
+    assert stats is not None
+    assert stats.total_games == 5
+    assert stats.total_wins == 2
+
+
+@pytest.mark.asyncio
+async def test_autoplay_stop_loss_refunds_unplayed(db, test_user: int, monkeypatch) -> None:
+    """Stop-loss ends the series early and unplayed stakes return to the balance."""
+    from bot.database.queries import users as users_queries
+
+    await users_queries.update_balance(test_user, demo_balance=1000)
+    _fixed_rolls(monkeypatch, [3, 3, 5])
+    summary = await autoplay.run_autoplay(test_user, 2, 0, 100, 10, is_demo=True, stop_loss=200)
+    assert summary["played"] == 2
+    assert summary["stopped_by"] == "stop_loss"
+    row = await users_queries.get_user_balance(test_user)
+    assert row is not None
+    assert row.demo_balance == 800
+
+
+@pytest.mark.asyncio
+async def test_autoplay_take_profit(db, test_user: int, monkeypatch) -> None:
+    """Take-profit ends the series once net winnings reach the limit."""
+    from bot.database.queries import users as users_queries
+
+    await users_queries.update_balance(test_user, real_balance=1000)
+    _fixed_rolls(monkeypatch, [5, 5, 5])
+    summary = await autoplay.run_autoplay(test_user, 2, 0, 100, 10, is_demo=False, take_profit=150)
+    assert summary["played"] == 2
+    assert summary["stopped_by"] == "take_profit"
+    row = await users_queries.get_user_balance(test_user)
+    assert row is not None
+    assert row.real_balance == 1160
+
+
+@pytest.mark.asyncio
+async def test_autoplay_insufficient_reserve(db, test_user: int) -> None:
+    """Series is refused if the balance does not cover amount * rounds; nothing is debited."""
+    from bot.database.queries import users as users_queries
+
+    await users_queries.update_balance(test_user, real_balance=500)
+    with pytest.raises(InsufficientFunds):
+        await autoplay.run_autoplay(test_user, 2, 0, 100, 10, is_demo=False)
+    row = await users_queries.get_user_balance(test_user)
+    assert row is not None
+    assert row.real_balance == 500
+
+
+@pytest.mark.asyncio
+async def test_autoplay_failed_settlement_writes_nothing(db, test_user: int, monkeypatch) -> None:
+    """An error while settling rolls back the debit and credit too: the series is all or nothing."""
+    from bot.database.queries import games as games_queries
+    from bot.database.queries import users as users_queries
+
+    async def boom(*args) -> None:
+        raise RuntimeError("disk I/O error")
+
+    await users_queries.update_balance(test_user, real_balance=1000)
+    _fixed_rolls(monkeypatch, [5, 3, 5])
+    monkeypatch.setattr(games_queries, "apply_series_stats", boom)
+    with pytest.raises(RuntimeError):
+        await autoplay.run_autoplay(test_user, 2, 0, 100, 3, is_demo=False)
+    row = await users_queries.get_user_balance(test_user)
+    assert row is not None
+    assert row.real_balance == 1000
+    assert await games_queries.get_games_count(test_user) == 0
@@ -0,0 +1,81 @@
+"""Tests for the online backup: backup-API copy, gzip in a worker process, checksum-verified manifest."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import sqlite3
+
+import pytest
+
+from bot.utils import backup
+
+
+def _fill(conn: sqlite3.Connection) -> None:
+    conn.execute("CREATE TABLE games (id INTEGER PRIMARY KEY, user_id INTEGER, outcome TEXT)")
+    conn.execute("CREATE TABLE users (user_id INTEGER PRIMARY KEY)")
+    conn.executemany("INSERT INTO games (user_id, outcome) VALUES (?, ?)", [(i % 7, "x" * 50) for i in range(20000)])
+    conn.executemany("INSERT INTO users VALUES (?)", [(i,) for i in range(7)])
+
+
+@pytest.fixture
+def live_db(sqlite_file):
+    return str(sqlite_file(_fill))
+
+
+@pytest.mark.asyncio
+async def test_create_backup_writes_verified_copy_and_manifest(live_db, tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(backup, "BACKUP_STEP_PAGES", 16)
+    monkeypatch.setattr(backup, "BACKUP_STEP_SLEEP", 0)
+    out_dir = tmp_path / "backups"
+    gz_path = await backup.create_backup(live_db, out_dir, "casino_2026-03-01")
+
+    assert gz_path.name == "casino_2026-03-01.db.gz"
+    assert sorted(p.name for p in out_dir.iterdir()) == ["casino_2026-03-01.db.gz", "casino_2026-03-01.manifest.json"]
+    manifest = json.loads(backup.manifest_path(gz_path).read_text(encoding="utf-8"))
+    assert manifest["tables"] == {"games": 20000, "users": 7}
+    assert manifest["gz_sha256"] == hashlib.sha256(gz_path.read_bytes()).hexdigest()
+
+    restored = tmp_path / "restored.db"
+    restored.write_bytes(gzip.decompress(gz_path.read_bytes()))
+    assert hashlib.sha256(restored.read_bytes()).hexdigest() == manifest["db_sha256"]
+    conn = sqlite3.connect(restored)
+    assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+    assert conn.execute("SELECT COUNT(*) FROM games").fetchone()[0] == 20000
+    conn.close()
+
+
+def test_snapshot_copy_is_not_restarted_by_commits(live_db, tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(backup, "BACKUP_STEP_PAGES", 1)
+    writer = sqlite3.connect(live_db, check_same_thread=False)
+    writer.execute("PRAGMA journal_mode = WAL")
+    steps = []
+    real_connect = sqlite3.connect
+
+    class Source:
+        # Commit on the live DB between every backup step, and count the steps
+        def __init__(self, conn):
+            self.conn = conn
+
+        def __getattr__(self, name):
+            return getattr(self.conn, name)
+
+        def backup(self, dst, **kwargs):
+            def progress(status, remaining, total):
+                steps.append(remaining)
+                writer.execute("INSERT INTO users VALUES (NULL)")
+                writer.commit()
+
+            return self.conn.backup(dst, progress=progress, **kwargs)
+
+    monkeypatch.setattr(backup.sqlite3, "connect", lambda path, *a, **kw: Source(real_connect(path, *a, **kw)) if "mode=ro" in str(path) else real_connect(path, *a, **kw))
+    copy = tmp_path / "copy.db"
+    backup.copy_db_snapshot(live_db, copy)
+    writer.close()
+
+    # One pass over the pages (a restarted copy never finishes here), and the snapshot from before the first commit
+    conn = real_connect(copy)
+    assert len(steps) == conn.execute("PRAGMA page_count").fetchone()[0]
+    assert conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 7
+    conn.close()
@@ -118,3 +118,22 @@ async def test_deduct_withdraw(db, test_user: int) -> None:
     row = await users_queries.get_user_balance(test_user)
     assert row is not None
     assert row.real_balance == 0
+
+
+@pytest.mark.asyncio
+async def test_balance_changes_are_summed_in_ledger(db, test_user: int) -> None:
+    """Every balance change lands in balance_ledger by reason; per account the sums equal the balance."""
+    from bot.database.connection import get_connection
+    from bot.database.queries import users as users_queries
+
+    await users_queries.update_balance(test_user, real_balance=1000, demo_balance=500, reason="admin")
+    await deduct_bet(test_user, 300, is_demo=False)
+    await credit_win(test_user, 540, is_demo=False)
+    await deduct_bet(test_user, 900, is_demo=True)  # clamped at 0: the ledger records -500
+    await credit_deposit(test_user, 200)
+    conn = await get_connection()
+    cursor = await conn.execute("SELECT account, reason, amount, movements FROM balance_ledger WHERE user_id = ? ORDER BY account, reason", (test_user,))
+    rows = [tuple(r) for r in await cursor.fetchall()]
+    assert rows == [("demo", "admin", 500, 1), ("demo", "bet", -500, 1), ("real", "admin", 1000, 1), ("real", "bet", -300, 1), ("real", "deposit", 200, 1), ("real", "win", 540, 1)]
+    row = await users_queries.get_user_balance(test_user)
+    assert row is not None and (row.real_balance, row.demo_balance) == (1440, 0)
@@ -0,0 +1,73 @@
+"""Tests for TTLCache: expiry, LRU eviction, bounded memory."""
+
+from __future__ import annotations
+
+from bot.utils.cache import TTLCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_expiry_and_lru() -> None:
+    """Entries expire after ttl; when full, the least recently used entry is evicted."""
+    clock = _Clock()
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # a is now most recent
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.evictions == 1
+    clock.now = 11
+    assert cache.get("a") is None
+    assert len(cache) == 1  # c still stored until touched or purged
+    assert cache.purge_expired() == 1
+    assert len(cache) == 0
+
+
+def test_ttl_cache_add_only_if_absent() -> None:
+    """add() refuses live keys and accepts expired ones."""
+    clock = _Clock()
+    cache: TTLCache[int, bool] = TTLCache(maxsize=10, ttl=5, clock=clock)
+    assert cache.add(1, True) is True
+    assert cache.add(1, True) is False
+    clock.now = 6
+    assert cache.add(1, True) is True
+
+
+def test_ttl_cache_stats_memory_stays_bounded() -> None:
+    """Filling far past maxsize keeps size and reported memory at the cap."""
+    cache: TTLCache[tuple, tuple] = TTLCache(maxsize=100, ttl=60)
+    for i in range(100):
+        cache.set((1, i), (i, (i + 1, i + 2)))
+    full = cache.stats()["kib"]
+    for i in range(100, 10000):
+        cache.set((1, i), (i, (i + 1, i + 2)))
+    stats = cache.stats()
+    assert stats["size"] == 100
+    assert stats["evictions"] == 9900
+    # dict table keeps some slack after churn, but does not grow with the number of inserts
+    assert stats["kib"] <= full * 1.5
+
+
+def test_ttl_cache_full_set_pops_expired_front_only() -> None:
+    """A full cache drops the expired entries at the front, then stops at the first live one (no full scan)."""
+    clock = _Clock()
+    cache: TTLCache[int, int] = TTLCache(maxsize=4, ttl=10, clock=clock)
+    for i in range(3):
+        cache.set(i, i)
+    clock.now = 5
+    cache.set(3, 3)
+    clock.now = 12  # 0, 1, 2 expired, 3 alive
+    cache.set(4, 4)
+    assert list(cache) == [3, 4]
+    assert (cache.expirations, cache.evictions) == (3, 0)
+    clock.now = 13
+    for i in range(5, 8):
+        cache.set(i, i)
+    assert list(cache) == [4, 5, 6, 7] and cache.evictions == 1
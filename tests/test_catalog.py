@@ -0,0 +1,74 @@
+"""Tests for the game catalog: seeding from GAME_LIST, ratio edits, version-driven reload."""
+
+from __future__ import annotations
+
+import pytest
+
+from bot.services import catalog
+from bot.services.game import get_game_info
+
+
+@pytest.fixture
+def restore_snapshot(monkeypatch):
+    """Keep the module-level snapshot of other tests intact."""
+    monkeypatch.setattr(catalog, "_snapshot", catalog.get_catalog())
+
+
+@pytest.mark.asyncio
+async def test_load_catalog_seeds_from_game_list(db, restore_snapshot) -> None:
+    """First load inserts all hardcoded games and matches the built-in snapshot."""
+    builtin = catalog.get_catalog()
+    snapshot = await catalog.load_catalog()
+    assert snapshot.version == 1
+    assert dict(snapshot.games) == dict(builtin.games)
+    # Second load does not re-seed or bump the version
+    assert (await catalog.load_catalog()).version == 1
+
+
+@pytest.mark.asyncio
+async def test_set_ratio_swaps_snapshot(db, restore_snapshot) -> None:
+    """Admin edit is persisted, bumps the version and is visible through get_game_info."""
+    await catalog.load_catalog()
+    old = catalog.get_catalog()
+    assert await catalog.set_ratio(2, 1, 2.5) is True
+    new = catalog.get_catalog()
+    assert new is not old
+    assert new.version == old.version + 1
+    assert get_game_info(2)["ratios"] == [1.8, 2.5]
+    assert old.games[2].ratios == (1.8, 1.8)  # old snapshot is never mutated
+    assert await catalog.set_ratio(2, 5, 2.0) is False
+
+
+@pytest.mark.asyncio
+async def test_refresh_picks_up_other_worker_edit(db, restore_snapshot) -> None:
+    """An edit made directly in the table (another worker) is applied on the next version check."""
+    from bot.database.queries import games_catalog as catalog_queries
+
+    await catalog.load_catalog()
+    assert await catalog.refresh_if_changed() is False
+    await catalog_queries.set_outcome_ratio(3, 0, 1.95)
+    assert catalog.get_catalog().games[3].ratios[0] == 1.8
+    assert await catalog.refresh_if_changed() is True
+    assert catalog.get_catalog().games[3].ratios[0] == 1.95
+
+
+@pytest.mark.asyncio
+async def test_inactive_game_is_hidden(db, restore_snapshot) -> None:
+    """is_active = 0 removes the game from the compiled snapshot."""
+    await catalog.load_catalog()
+    await db.execute("UPDATE games_catalog SET is_active = 0 WHERE game_id = 8")
+    await db.execute("UPDATE games_catalog_version SET version = version + 1 WHERE id = 1")
+    await db.commit()
+    await catalog.refresh_if_changed()
+    assert 8 not in catalog.get_catalog().games
+    with pytest.raises(KeyError):
+        get_game_info(8)
+
+
+def test_builtin_snapshot_has_all_games() -> None:
+    """Every GAME_LIST entry (including paired-dice game 1 with win_outcome_value=[None]) survives compilation."""
+    from bot.core.games import GAME_LIST
+
+    snapshot = catalog.compile_snapshot(catalog.default_entries(), version=0)
+    assert sorted(snapshot.games) == sorted(GAME_LIST)
+    assert snapshot.games[1].win_outcome_value == (None,)
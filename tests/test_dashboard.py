@@ -0,0 +1,50 @@
+"""Tests for the admin dashboard snapshot: memory reads between refreshes, invalidation wakes the refresh loop."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from bot.database.queries import games as games_queries
+from bot.database.queries import users as users_queries
+from bot.handlers.admin.dashboard import build_admin_stats_caption
+from bot.services.dashboard import Dashboard
+
+
+@pytest.mark.asyncio
+async def test_snapshot_is_served_from_memory_until_refresh(db, test_user: int) -> None:
+    dashboard = Dashboard()
+    await games_queries.save_game(test_user, "dice", 2, 100, "More", True, 180, False, "2026-03-01T10:05:00Z")
+    snap = await dashboard.get()
+    assert snap.users_count == 1 and snap.games_count == 1
+
+    await users_queries.create_user(user_id=2000, username="u2", first_name="U", last_name=None, full_name="U")
+    assert await dashboard.get() is snap
+    snap = await dashboard.refresh()
+    assert snap.users_count == 2
+    caption = build_admin_stats_caption(snap, "en")
+    assert "Users: 2" in caption and snap.computed_at in caption
+
+
+@pytest.mark.asyncio
+async def test_invalidate_wakes_refresh_loop(db, test_user: int) -> None:
+    dashboard = Dashboard()
+    task = asyncio.create_task(dashboard.refresh_loop(interval=3600, min_interval=0))
+    try:
+        for _ in range(100):
+            if dashboard.snapshot is not None:
+                break
+            await asyncio.sleep(0.01)
+        assert dashboard.snapshot.users_count == 1
+        await users_queries.create_user(user_id=2000, username="u2", first_name="U", last_name=None, full_name="U")
+        dashboard.invalidate()
+        for _ in range(100):
+            if dashboard.snapshot.users_count == 2:
+                break
+            await asyncio.sleep(0.01)
+        assert dashboard.snapshot.users_count == 2
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
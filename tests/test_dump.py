@@ -0,0 +1,85 @@
+"""Tests for the parallel chunked dump: rowid-range chunking, manifest, parallel load through the restore tool."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import sqlite3
+
+import pytest
+
+from bot.utils.dump import create_dump, plan_chunks
+from bot.utils.restore import RestoreError, main, restore_backup
+
+
+def _fill(conn: sqlite3.Connection) -> None:
+    conn.execute("CREATE TABLE games (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, outcome TEXT, payout REAL)")
+    conn.execute("CREATE INDEX idx_games_user ON games(user_id)")
+    conn.execute("CREATE TABLE balance_ledger (user_id INTEGER, reason TEXT, amount INTEGER, PRIMARY KEY (user_id, reason)) WITHOUT ROWID")
+    conn.execute("CREATE TABLE active_users_hll (day TEXT PRIMARY KEY, sketch BLOB NOT NULL)")
+    conn.execute("CREATE VIEW big_wins AS SELECT * FROM games WHERE payout > 10")
+    conn.executemany("INSERT INTO games (user_id, outcome, payout) VALUES (?, ?, ?)", [(i % 7, f"multi\nline;{i}", i / 4) for i in range(1000)])
+    conn.execute("DELETE FROM games WHERE id % 10 = 0")  # rowid gaps
+    conn.executemany("INSERT INTO balance_ledger VALUES (?, ?, ?)", [(i, r, i * 3) for i in range(20) for r in ("bet", "win")])
+    conn.execute("INSERT INTO active_users_hll VALUES ('2026-03-20', ?)", (bytes(range(256)) * 16,))
+
+
+@pytest.fixture
+def live_db(sqlite_file):
+    return sqlite_file(_fill, wal=True)
+
+
+def _snapshot(path) -> tuple:
+    conn = sqlite3.connect(path)
+    try:
+        return (
+            conn.execute("SELECT * FROM games ORDER BY id").fetchall(),
+            conn.execute("SELECT * FROM balance_ledger ORDER BY user_id, reason").fetchall(),
+            conn.execute("SELECT sketch FROM active_users_hll").fetchone()[0],
+            conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'games'").fetchone()[0],
+            conn.execute("SELECT COUNT(*) FROM big_wins").fetchone()[0],
+            conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name = 'idx_games_user'").fetchone(),
+        )
+    finally:
+        conn.close()
+
+
+def test_plan_chunks_splits_rowid_tables_only(live_db) -> None:
+    conn = sqlite3.connect(live_db)
+    try:
+        ranges = plan_chunks(conn, "games", 400)
+        assert len(ranges) == 3 and ranges[0][0] == 1 and ranges[-1][1] == 999
+        assert all(conn.execute("SELECT COUNT(*) FROM games WHERE id BETWEEN ? AND ?", r).fetchone()[0] <= 400 for r in ranges)
+        assert sum(conn.execute("SELECT COUNT(*) FROM games WHERE id BETWEEN ? AND ?", r).fetchone()[0] for r in ranges) == 900
+        assert plan_chunks(conn, "games", 5000) == [(None, None)]
+        assert plan_chunks(conn, "balance_ledger", 5) == [(None, None)]
+    finally:
+        conn.close()
+
+
+def test_dump_round_trips_through_restore(live_db, tmp_path) -> None:
+    out = tmp_path / "backups" / "dump_1"
+    manifest = json.loads(create_dump(str(live_db), out, workers=2, chunk_rows=250).read_text(encoding="utf-8"))
+    assert manifest["tables"] == {"games": 900, "balance_ledger": 40, "active_users_hll": 1}
+    assert len([c for c in manifest["chunks"] if c["table"] == "games"]) == 4
+    assert not (out / "snapshot.db").exists()
+
+    target = tmp_path / "data" / "casino.db"
+    report = restore_backup(out, target)
+    assert report.manifest_checked and report.tables == manifest["tables"]
+    assert _snapshot(target) == _snapshot(live_db)
+    assert not list(out.glob("part.*"))
+
+    assert main([str(out), "--target", str(tmp_path / "cli.db"), "--check"]) == 0
+
+
+def test_tampered_chunk_is_rejected(live_db, tmp_path) -> None:
+    out = tmp_path / "dump"
+    manifest = json.loads(create_dump(str(live_db), out, workers=2, chunk_rows=250).read_text(encoding="utf-8"))
+    chunk = out / manifest["chunks"][1]["file"]
+    with gzip.open(chunk, "at", encoding="utf-8") as f:
+        f.write('[1,2,"x",0.5]\n')
+    target = tmp_path / "target.db"
+    with pytest.raises(RestoreError, match="checksum"):
+        restore_backup(out, target)
+    assert not target.exists()
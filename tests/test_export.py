@@ -0,0 +1,66 @@
+"""Tests for the streaming history export (gzip CSV / NDJSON from a read-only connection)."""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+import sqlite3
+
+import pytest
+
+from bot.services import export
+
+
+def _fill(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        "CREATE TABLE games (id INTEGER PRIMARY KEY, user_id INTEGER, game_type TEXT, game_id INTEGER, bet_amount INTEGER, "
+        "outcome TEXT, is_win INTEGER, win_amount INTEGER, is_demo INTEGER, played_at TEXT)"
+    )
+    conn.execute(
+        "CREATE TABLE payment_requests (id INTEGER PRIMARY KEY, user_id INTEGER, request_type TEXT, amount INTEGER, status TEXT, "
+        "payment_method TEXT, payment_details TEXT, created_at TEXT, processed_at TEXT, processed_by INTEGER)"
+    )
+    rows = [(u, "dice", 2, 100, "More", i % 2, 180 * (i % 2), 0, f"2026-03-{1 + i % 28:02d}T12:00:00Z") for i in range(5000) for u in (1, 2)]
+    conn.executemany(
+        "INSERT INTO games (user_id, game_type, game_id, bet_amount, outcome, is_win, win_amount, is_demo, played_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    conn.execute("INSERT INTO payment_requests (user_id, request_type, amount, status, created_at) VALUES (1, 'deposit', 500, 'approved', '2026-03-02T10:00:00Z')")
+
+
+@pytest.fixture
+def history_db(sqlite_file):
+    """File DB with a games and a payment_requests table (the export opens its own read-only connection)."""
+    return str(sqlite_file(_fill))
+
+
+def test_csv_user_export_streams_all_rows(history_db, tmp_path, monkeypatch) -> None:
+    """Batches are smaller than the result, every row of the user ends up in the CSV."""
+    monkeypatch.setattr(export, "EXPORT_FETCH_ROWS", 7)
+    out = tmp_path / "games.csv.gz"
+    assert export.write_export(history_db, "games", "csv", out, export.ExportFilter(user_id=1)) == 5000
+    with gzip.open(out, "rt", encoding="utf-8") as f:
+        rows = list(csv.reader(io.StringIO(f.read())))
+    assert rows[0][:2] == ["id", "user_id"]
+    assert len(rows) == 5001
+    assert {r[1] for r in rows[1:]} == {"1"}
+
+
+def test_ndjson_date_range_is_inclusive(history_db, tmp_path) -> None:
+    """date_to includes the whole last day; payments export uses created_at."""
+    out = tmp_path / "games.ndjson.gz"
+    count = export.write_export(history_db, "games", "ndjson", out, export.ExportFilter(date_from="2026-03-01", date_to="2026-03-02"))
+    with gzip.open(out, "rt", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert count == len(records) > 0
+    assert {r["played_at"][:10] for r in records} == {"2026-03-01", "2026-03-02"}
+    assert export.write_export(history_db, "payments", "ndjson", tmp_path / "p.gz", export.ExportFilter(date_from="2026-03-02", date_to="2026-03-02")) == 1
+
+
+def test_export_connection_is_read_only(history_db) -> None:
+    """The export connection cannot write to the bot's database."""
+    rows = export.iter_rows(history_db, "DELETE FROM games", [])
+    with pytest.raises(sqlite3.OperationalError):
+        next(rows)
@@ -91,3 +91,25 @@ def test_get_probability() -> None:
     assert get_probability(3, 1) == 0.5
     # Game 1: special case → 1/3
     assert get_probability(1, 0) == 1 / 3
+
+
+@pytest.mark.asyncio
+async def test_games_page_keyset_both_directions(db, test_user: int) -> None:
+    """Pages follow id order even when played_at collides; older/newer cursors walk the whole history without gaps."""
+    from bot.database.queries import games as games_queries
+
+    rows = [(test_user, "dice", 2, 100 + i, "More", False, 0, False, "2026-03-01T10:00:00Z") for i in range(25)]
+    await games_queries.save_games(rows)
+
+    page1, more = await games_queries.get_games_page(test_user, limit=10)
+    assert more is True
+    page2, more = await games_queries.get_games_page(test_user, limit=10, before_id=page1[-1].id)
+    page3, more = await games_queries.get_games_page(test_user, limit=10, before_id=page2[-1].id)
+    assert more is False
+    ids = [g.id for g in page1 + page2 + page3]
+    assert ids == sorted(ids, reverse=True) and len(set(ids)) == 25
+
+    back, more = await games_queries.get_games_page(test_user, limit=10, after_id=page3[0].id)
+    assert [g.id for g in back] == [g.id for g in page2]
+    assert more is True
+    assert [g.id for g in await games_queries.get_last_games_by_user(test_user, 3)] == ids[:3]
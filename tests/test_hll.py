@@ -0,0 +1,82 @@
+"""Tests for HyperLogLog and the daily active-users sketches (DAU / WAU / MAU)."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+
+import pytest
+
+from bot.services.active_users import ActiveUsers
+from bot.utils.hll import HyperLogLog
+
+
+def test_hll_accuracy_merge_and_roundtrip() -> None:
+    """Counts stay within a few percent; merging overlapping sets counts the union; bytes round-trip."""
+    a, b = HyperLogLog(), HyperLogLog()
+    for uid in range(50_000):
+        a.add(uid)
+    for uid in range(25_000, 75_000):
+        b.add(uid)
+    assert abs(a.count() - 50_000) / 50_000 < 0.05
+    a.merge(b)
+    assert abs(a.count() - 75_000) / 75_000 < 0.05
+    assert HyperLogLog.from_bytes(a.to_bytes()).count() == a.count()
+    small = HyperLogLog()
+    for uid in (1, 2, 3, 3, 3):
+        small.add(uid)
+    assert small.count() == 3
+    assert len(a.to_bytes()) == 4097
+
+
+@pytest.mark.asyncio
+async def test_active_users_flush_and_windows(db) -> None:
+    """Workers flushing the same day merge; WAU/MAU union days, repeated users are counted once."""
+    today = date(2026, 3, 31)
+    first, second = ActiveUsers(), ActiveUsers()
+    for uid in range(100):
+        first.observe(uid, today)
+    for uid in range(50, 150):
+        second.observe(uid, today)
+    for uid in range(1000, 1010):
+        first.observe(uid, date(2026, 3, 26))
+        first.observe(uid, date(2026, 3, 10))
+    await first.flush()
+    await second.flush()
+
+    counts = await ActiveUsers().counts(today)
+    assert counts["dau"] == pytest.approx(150, rel=0.03)
+    assert counts["wau"] == pytest.approx(160, rel=0.03)
+    assert counts["mau"] == counts["wau"]
+    assert await first.flush() == 0
+
+
+@pytest.mark.asyncio
+async def test_active_users_flush_keeps_days_observed_or_failed_meanwhile(db, monkeypatch) -> None:
+    """A day observed while the flush awaits stays dirty; a failed write keeps its day (and its sketch) for the next flush."""
+    from bot.database.queries import active_users as active_users_queries
+
+    tracker = ActiveUsers()
+    today, past_day = datetime.now(timezone.utc).date(), date(2026, 3, 30)
+    tracker.observe(1, past_day)
+    tracker.observe(1, today)
+    save_sketch = active_users_queries.save_sketch
+
+    async def save_then_observe(day: str, sketch: bytes) -> None:
+        await save_sketch(day, sketch)
+        tracker.observe(2, today)
+
+    monkeypatch.setattr(active_users_queries, "save_sketch", save_then_observe)
+    assert await tracker.flush() == 2
+    assert tracker._dirty == {today.isoformat()}
+
+    async def fail(day: str, sketch: bytes) -> None:
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(active_users_queries, "save_sketch", fail)
+    tracker.observe(3, past_day)
+    with pytest.raises(RuntimeError):
+        await tracker.flush()
+    assert tracker._dirty == {today.isoformat(), past_day.isoformat()}
+    monkeypatch.setattr(active_users_queries, "save_sketch", save_sketch)
+    assert await tracker.flush() == 2
+    assert (await ActiveUsers().counts(past_day))["dau"] == 2
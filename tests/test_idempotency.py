@@ -0,0 +1,54 @@
+"""Tests for the idempotency store (memory and sqlite backends)."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from bot.services.idempotency import IdempotencyStore
+
+
+@pytest.mark.asyncio
+async def test_memory_store_claim_once_and_release() -> None:
+    """Memory backend: second claim is rejected until the key is released."""
+    store = IdempotencyStore("memory", ttl=60, maxsize=100)
+    assert await store.claim(1, 10) is True
+    assert await store.claim(1, 10) is False
+    await store.release(1, 10)
+    assert await store.claim(1, 10) is True
+    assert store.stats()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store_shared_between_instances(db) -> None:
+    """SQLite backend: a claim made by one store (another worker / before restart) is seen by a fresh store."""
+    first = IdempotencyStore("sqlite", ttl=60)
+    second = IdempotencyStore("sqlite", ttl=60)
+    assert await first.claim(5, 50) is True
+    assert await second.claim(5, 50) is False
+    await first.release(5, 50)
+    assert await IdempotencyStore("sqlite", ttl=60).claim(5, 50) is True
+
+
+@pytest.mark.asyncio
+async def test_sqlite_expired_claim_can_be_reclaimed(db) -> None:
+    """An expired row is taken over by the next claim instead of blocking forever."""
+    from bot.database.queries import idempotency as idempotency_queries
+
+    assert await idempotency_queries.claim_key(7, 70, now=100, expires_at=160) is True
+    assert await idempotency_queries.claim_key(7, 70, now=150, expires_at=210) is False
+    assert await idempotency_queries.claim_key(7, 70, now=170, expires_at=230) is True
+    assert await idempotency_queries.purge_expired_keys(now=300) == 1
+
+
+def test_unknown_backend_is_not_silently_replaced(monkeypatch) -> None:
+    """A typo in IDEMPOTENCY_BACKEND raises instead of falling back to the per-process store."""
+    import bot.config
+    from bot.services import idempotency
+
+    cfg = SimpleNamespace(idempotency_backend="sqllite", idempotency_ttl_seconds=60, idempotency_max_keys=10)
+    monkeypatch.setattr(bot.config, "get_config", lambda: cfg)
+    monkeypatch.setattr(idempotency, "_store", None)
+    with pytest.raises(ValueError):
+        idempotency.get_idempotency_store()
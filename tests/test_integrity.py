@@ -0,0 +1,66 @@
+"""Tests for the background integrity checks: per-table quick_check and the balance ledger invariant."""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from bot.core.constants import BOT_DIR
+from bot.utils import integrity
+
+
+def _fill(conn: sqlite3.Connection) -> None:
+    conn.executescript((BOT_DIR / "database" / "migrations" / "001_initial.sql").read_text(encoding="utf-8"))
+    now = "2026-03-01T00:00:00Z"
+    conn.executemany("INSERT INTO users (user_id, created_at) VALUES (?, ?)", [(i, now) for i in range(1, 301)])
+    conn.executemany("INSERT INTO user_balances (user_id, real_balance, demo_balance) VALUES (?, ?, ?)", [(i, i * 10, 500) for i in range(1, 301)])
+    # 012 records the balances above as opening movements
+    conn.executescript((BOT_DIR / "database" / "migrations" / "012_balance_ledger.sql").read_text(encoding="utf-8"))
+
+
+@pytest.fixture
+def live_db(sqlite_file, monkeypatch):
+    monkeypatch.setattr(integrity, "INTEGRITY_SLICE_PAUSE", 0)
+    return sqlite_file(_fill, wal=True)
+
+
+def test_healthy_db_passes_in_slices(live_db, monkeypatch) -> None:
+    monkeypatch.setattr(integrity, "INTEGRITY_USERS_PER_SLICE", 64)
+    report = integrity.check_integrity(str(live_db))
+    assert report.ok
+    assert report.users == 300
+    assert report.tables > 5
+
+
+def test_balance_changed_outside_ledger_is_reported(live_db, monkeypatch) -> None:
+    monkeypatch.setattr(integrity, "INTEGRITY_USERS_PER_SLICE", 64)
+    conn = sqlite3.connect(live_db)
+    conn.execute("UPDATE user_balances SET real_balance = real_balance + 5 WHERE user_id IN (3, 250)")
+    conn.execute("UPDATE user_balances SET demo_balance = 0 WHERE user_id = 65")
+    # Writer still open: the check runs next to it on its own read-only connection
+    conn.commit()
+    report = integrity.check_integrity(str(live_db))
+    conn.close()
+    assert not report.problems
+    assert [(m.user_id, m.account, m.balance, m.ledger) for m in report.mismatches] == [(3, "real", 35, 30), (65, "demo", 0, 500), (250, "real", 2505, 2500)]
+
+
+def test_corrupted_pages_are_reported(live_db) -> None:
+    conn = sqlite3.connect(live_db)
+    conn.execute("CREATE TABLE filler (id INTEGER PRIMARY KEY, payload TEXT)")
+    conn.execute("CREATE INDEX idx_filler_payload ON filler(payload)")
+    conn.executemany("INSERT INTO filler (payload) VALUES (?)", [(f"{i:06d}" * 40,) for i in range(3000)])
+    conn.commit()
+    conn.execute("PRAGMA journal_mode = DELETE")
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    pages = conn.execute("PRAGMA page_count").fetchone()[0]
+    conn.close()
+    with open(live_db, "r+b") as f:
+        for page in range(pages - 40, pages - 20):
+            f.seek(page * page_size + 100)
+            f.write(b"\xff" * 200)
+
+    report = integrity.check_integrity(str(live_db))
+    assert not report.ok
+    assert any(problem.startswith("filler") for problem in report.problems)
@@ -0,0 +1,60 @@
+"""Tests for the leaderboard service: bounded top-K, period rollover, rebuild from rollups."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+
+from bot.services.leaderboard import Leaderboards, TopK, period_id
+
+
+def test_topk_keeps_best_per_user_and_evicts_min() -> None:
+    """One entry per user, only raises count, the lowest score leaves when a better one arrives."""
+    top = TopK(3)
+    for user_id, score in [(1, 100), (2, 300), (3, 200), (1, 50), (4, 150), (1, 400), (5, 120)]:
+        top.offer(user_id, score)
+    assert top.items() == [(1, 400), (2, 300), (3, 200)]
+    for i in range(100):
+        top.offer(1, 401 + i)
+    assert len(top._heap) <= 4 * top.k
+    assert top.min_score() == 200
+
+
+def test_record_splits_modes_and_rolls_over_periods() -> None:
+    """Rounds land in day and week boards per mode; a new day starts an empty day board, the week keeps going."""
+    boards = Leaderboards(k=5)
+    boards.record(1, False, 100, 180, "2026-03-02T10:00:00Z")
+    boards.record(2, True, 100, 500, "2026-03-02T11:00:00Z")
+    boards.record(3, False, 100, 0, "2026-03-02T11:00:00Z")
+    monday, tuesday = date(2026, 3, 2), date(2026, 3, 3)
+    assert boards.top("day", "wins", False, monday) == [(1, 180.0)]
+    assert boards.top("day", "multiplier", True, monday) == [(2, 5.0)]
+
+    boards.record(4, False, 10, 100, "2026-03-03T09:00:00Z")
+    assert boards.top("day", "wins", False, tuesday) == [(4, 100.0)]
+    assert boards.top("week", "wins", False, tuesday) == [(1, 180.0), (4, 100.0)]
+    assert boards.top("week", "multiplier", False, tuesday) == [(4, 10.0), (1, 1.8)]
+    assert period_id("week", tuesday) == "2026-W10"
+
+
+@pytest.mark.asyncio
+async def test_rebuild_from_rollups_matches_live(db, test_user_and_referrer) -> None:
+    """A fresh service rebuilt from games_rollup_players shows the same standings as the live one."""
+    from bot.database.queries import games as games_queries
+
+    user_id, other_id = test_user_and_referrer
+    live = Leaderboards()
+    rows = [
+        (user_id, "dice", 2, 100, "More", True, 180, False, "2026-03-02T10:00:00Z"),
+        (user_id, "dice", 3, 50, "More", True, 250, False, "2026-03-03T10:00:00Z"),
+        (other_id, "dice", 2, 100, "More", True, 300, False, "2026-03-03T12:00:00Z"),
+    ]
+    await games_queries.save_games(rows)
+    live.record_rows(rows)
+
+    rebuilt = Leaderboards()
+    await rebuilt.rebuild(today=date(2026, 3, 3))
+    for period in ("day", "week"):
+        for metric in ("wins", "multiplier"):
+            assert rebuilt.top(period, metric, False, date(2026, 3, 3)) == live.top(period, metric, False, date(2026, 3, 3))
@@ -0,0 +1,74 @@
+"""Tests for per-key lanes: same key serialized, different keys parallel, locks released from memory."""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+from types import SimpleNamespace
+
+import pytest
+
+from bot.utils.locks import KeyedLocks, user_lane, user_lanes
+
+
+@pytest.mark.asyncio
+async def test_same_key_is_serialized() -> None:
+    """Two holders of one key never overlap; the second one is counted as contended."""
+    locks = KeyedLocks()
+    events: list[str] = []
+
+    async def work(name: str) -> None:
+        async with locks.hold(1):
+            events.append(f"{name}:start")
+            await asyncio.sleep(0.01)
+            events.append(f"{name}:end")
+
+    await asyncio.gather(work("a"), work("b"))
+    assert events == ["a:start", "a:end", "b:start", "b:end"]
+    assert locks.stats()["contended"] == 1
+
+
+@pytest.mark.asyncio
+async def test_different_keys_run_in_parallel() -> None:
+    """Holders of different keys overlap."""
+    locks = KeyedLocks()
+    running = 0
+    peak = 0
+
+    async def work(key: int) -> None:
+        nonlocal running, peak
+        async with locks.hold(key):
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(work(1), work(2), work(3))
+    assert peak == 3
+    assert locks.stats()["contended"] == 0
+
+
+@pytest.mark.asyncio
+async def test_idle_locks_are_dropped() -> None:
+    """After all holders finish, the per-key lock is garbage collected."""
+    locks = KeyedLocks()
+    async with locks.hold(42):
+        assert locks.stats()["keys"] == 1
+    gc.collect()
+    assert locks.stats()["keys"] == 0
+
+
+@pytest.mark.asyncio
+async def test_user_lane_decorator_passes_kwargs() -> None:
+    """Decorated handler keeps its kwargs and runs inside the sender's lane."""
+    seen = {}
+
+    @user_lane()
+    async def handler(event, usd_rate=None) -> str:
+        seen["rate"] = usd_rate
+        seen["held"] = user_lanes._locks.get(event.from_user.id) is not None
+        return "ok"
+
+    event = SimpleNamespace(from_user=SimpleNamespace(id=777))
+    assert await handler(event, usd_rate=90.0) == "ok"
+    assert seen == {"rate": 90.0, "held": True}
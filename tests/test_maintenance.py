@@ -0,0 +1,45 @@
+"""Tests for SQLite maintenance: bounded incremental vacuum."""
+
+from __future__ import annotations
+
+import sqlite3
+
+from bot.utils import maintenance
+
+
+def _fill(path, rows: int) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE IF NOT EXISTS games (id INTEGER PRIMARY KEY, payload TEXT)")
+    conn.executemany("INSERT INTO games (payload) VALUES (?)", [("x" * 500,) for _ in range(rows)])
+    conn.commit()
+    return conn
+
+
+def test_incremental_vacuum_skips_legacy_db_then_reclaims_in_steps(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(maintenance, "VACUUM_STEP_PAGES", 10)
+    monkeypatch.setattr(maintenance, "VACUUM_STEP_PAUSE", 0)
+    path = tmp_path / "casino.db"
+    conn = _fill(path, 3000)
+    conn.execute("DELETE FROM games WHERE id <= 1500")
+    conn.commit()
+    conn.close()
+    # Legacy DB (auto_vacuum=NONE): the scheduled job leaves it alone, the conversion is the offline CLI step
+    conn = sqlite3.connect(path)
+    pages = conn.execute("PRAGMA page_count").fetchone()[0]
+    assert maintenance.incremental_vacuum(str(path)) == 0
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 0 and conn.execute("PRAGMA page_count").fetchone()[0] == pages
+    conn.close()
+    assert maintenance.main(["--db", str(path), "--convert-auto-vacuum"]) == 0
+    assert maintenance.convert_auto_vacuum(str(path)) == 0
+    conn = sqlite3.connect(path)
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    conn.execute("DELETE FROM games WHERE id <= 2500")
+    conn.commit()
+    free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    conn.close()
+    assert free > 25
+    assert maintenance.incremental_vacuum(str(path), max_pages=25) == 25
+    assert maintenance.incremental_vacuum(str(path)) == free - 25
+    conn = sqlite3.connect(path)
+    assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    conn.close()
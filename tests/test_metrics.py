@@ -0,0 +1,33 @@
+"""Tests for live house metrics: ring slots, windows, slot reuse after wrap-around."""
+
+from __future__ import annotations
+
+from bot.services.metrics import HouseMetrics, Ring
+
+
+def test_ring_window_and_slot_reuse() -> None:
+    """Only slots inside the window count; a wrapped slot starts from zero instead of adding to old data."""
+    ring = Ring(slots=10, slot_seconds=1)
+    ring.record(100.2, 100, 0)
+    ring.record(100.9, 100, 180)
+    ring.record(105.0, 50, 0)
+    assert ring.window(105.5, 3) == (1, 50, 0)
+    assert ring.window(105.5, 10) == (3, 250, 180)
+    ring.record(110.0, 10, 0)  # same slot index as 100, new period
+    assert ring.window(110.0, 1) == (1, 10, 0)
+    assert ring.window(200.0, 10) == (0, 0, 0)
+
+
+def test_house_metrics_snapshot() -> None:
+    """1m / 5m / 1h windows per game and in total; demo rounds are not house P&L."""
+    metrics = HouseMetrics()
+    now = 1_000_000.0
+    metrics.record(2, 100, 180, now=now - 30)
+    metrics.record(2, 100, 0, now=now - 200)
+    metrics.record(3, 500, 0, now=now - 1800)
+    metrics.record(3, 999, 0, is_demo=True, now=now)
+    snap = metrics.snapshot(now)
+    assert snap["1m"]["total"] == {"rounds": 1, "turnover": 100, "payouts": 180, "ggr": -80}
+    assert snap["5m"]["games"][2] == {"rounds": 2, "turnover": 200, "payouts": 180, "ggr": 20}
+    assert snap["1h"]["total"]["ggr"] == 520
+    assert 3 not in snap["5m"]["games"]
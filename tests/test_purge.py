@@ -0,0 +1,59 @@
+"""Tests for the batched retention purge: oldest-first rowid ranges, newer rows untouched, adaptive batch size."""
+
+from __future__ import annotations
+
+import pytest
+
+from bot.database.connection import get_connection
+from bot.database.queries import users as users_queries
+from bot.utils import purge
+
+
+def test_next_batch_size_follows_latency() -> None:
+    target = purge.PURGE_TARGET_BATCH_SECONDS
+    assert purge.next_batch_size(1000, target * 2) == 500
+    assert purge.next_batch_size(1000, target / 4) == 2000
+    assert purge.next_batch_size(1000, target * 0.75) == 1000
+    assert purge.next_batch_size(purge.PURGE_MIN_BATCH_ROWS, target * 10) == purge.PURGE_MIN_BATCH_ROWS
+    assert purge.next_batch_size(purge.PURGE_MAX_BATCH_ROWS, 0) == purge.PURGE_MAX_BATCH_ROWS
+
+
+@pytest.mark.asyncio
+async def test_purge_batches_are_bounded_by_limit(db, test_user: int, monkeypatch) -> None:
+    """Ids do not follow played_at: each batch still takes at most batch_rows of the oldest rows, newer ones stay."""
+    monkeypatch.setattr(purge, "PURGE_BATCH_ROWS", 50)
+    monkeypatch.setattr(purge, "PURGE_MIN_BATCH_ROWS", 50)
+    monkeypatch.setattr(purge, "PURGE_MAX_BATCH_ROWS", 50)
+    monkeypatch.setattr(purge, "PURGE_PAUSE_SECONDS", 0)
+    rows = [(test_user, "dice", 2, 100, "More", 0, 0, 0, f"2026-01-{1 + (599 - i) // 25:02d}T00:00:00Z" if i % 3 else "2026-03-10T00:00:00Z") for i in range(600)]
+    await db.executemany(
+        "INSERT INTO games (user_id, game_type, game_id, bet_amount, outcome, is_win, win_amount, is_demo, played_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    await db.commit()
+    reports = []
+
+    async def on_progress(progress: purge.PurgeProgress) -> None:
+        reports.append((progress.deleted, progress.done))
+
+    progress = await purge.purge_batches(db, "games", "played_at", "played_at < ?", ("2026-02-01T00:00:00Z",), on_progress)
+    assert progress.deleted == 400
+    assert len(reports) == 9 and reports[-1] == (400, True)
+    assert all(b - a <= 50 for (a, _), (b, _) in zip([(0, False)] + reports, reports))
+    cursor = await db.execute("SELECT COUNT(*), MIN(played_at) FROM games")
+    assert tuple(await cursor.fetchone()) == (200, "2026-03-10T00:00:00Z")
+
+
+@pytest.mark.asyncio
+async def test_purge_payment_requests_uses_own_connection(file_db) -> None:
+    await users_queries.create_user(user_id=1, username="u", first_name="U", last_name="", full_name="U")
+    conn = await get_connection()
+    requests = [(1, "deposit", 100, status, f"2026-0{month}-01T00:00:00Z") for status in ("approved", "rejected", "pending") for month in (1, 3)]
+    await conn.executemany("INSERT INTO payment_requests (user_id, request_type, amount, status, created_at) VALUES (?, ?, ?, ?, ?)", requests)
+    await conn.commit()
+
+    assert await purge.purge_payment_requests(file_db, "2026-02-01T00:00:00Z") == 2
+    # The shared connection took no part in the purge's transactions
+    assert not conn.in_transaction
+    cursor = await conn.execute("SELECT status FROM payment_requests ORDER BY id")
+    assert [row[0] for row in await cursor.fetchall()] == ["approved", "rejected", "pending", "pending"]
@@ -79,3 +79,21 @@ async def test_process_referral_referrer_blocked(db) -> None:
     # Try to process referral
     ok = await process_referral_bonuses(1000, 2000)
     assert ok is False
+
+
+@pytest.mark.asyncio
+async def test_referral_bonus_waits_for_referrer_lane(test_user_and_referrer) -> None:
+    """Referrer credit is applied in the referrer's lane: it waits until a running bet of the referrer finishes."""
+    import asyncio
+
+    from bot.database.queries import users as users_queries
+    from bot.utils.locks import user_lanes
+
+    referred_id, referrer_id = test_user_and_referrer
+    async with user_lanes.hold(referrer_id):
+        task = asyncio.create_task(process_referral_bonuses(referred_id, referrer_id))
+        await asyncio.sleep(0.05)
+        assert not task.done()
+    assert await task is True
+    row = await users_queries.get_user_balance(referrer_id)
+    assert row is not None and row.real_balance > 0
@@ -0,0 +1,98 @@
+"""Tests for the read replica: full and WAL-archive refreshes, pinned copies, routing and fallback to the primary."""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from bot.database.connection import get_connection
+from bot.services.replica import Replica
+from bot.utils import wal_archive
+
+
+def _writer(path) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA wal_autocheckpoint = 0")
+    conn.execute("CREATE TABLE IF NOT EXISTS games (id INTEGER PRIMARY KEY, payload TEXT)")
+    conn.commit()
+    return conn
+
+
+def _insert(conn: sqlite3.Connection, rows: int) -> None:
+    conn.executemany("INSERT INTO games (payload) VALUES (?)", [("x" * 300,) for _ in range(rows)])
+    conn.commit()
+
+
+def _count(path) -> int:
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.mark.asyncio
+async def test_refresh_replays_wal_archive_and_routes_reads(tmp_path) -> None:
+    live = tmp_path / "casino.db"
+    archive_dir = wal_archive.wal_archive_dir_for(str(live))
+    conn = _writer(live)
+    _insert(conn, 100)
+    wal_archive.archive_wal(str(live), archive_dir)
+    replica = Replica()
+    replica.configure(str(live), tmp_path / "replica")
+    assert await replica.refresh()
+    assert replica.current["mode"] == "full"
+    _insert(conn, 50)
+    wal_archive.archive_wal(str(live), archive_dir)
+    assert await replica.refresh()
+    _insert(conn, 25)
+    wal_archive.archive_wal(str(live), archive_dir)
+    # Copy "a" is two archiver steps behind: it only replays the segments it has not seen
+    assert await replica.refresh()
+    assert replica.current["mode"] == "incremental"
+    assert replica.lag_seconds() < 60
+    _insert(conn, 5)  # not archived yet
+
+    async with replica.reading() as as_of:
+        assert as_of == replica.current["as_of"]
+        cursor = await (await get_connection()).execute("SELECT COUNT(*) FROM games")
+        assert (await cursor.fetchone())[0] == 175
+        with pytest.raises(sqlite3.OperationalError):
+            await (await get_connection()).execute("DELETE FROM games")
+
+    async with replica.read_path() as path:
+        assert _count(path) == 175
+        assert await replica.refresh()
+        # The copy being read is not rewritten: that refresh round is skipped
+        assert not await replica.refresh()
+        assert _count(path) == 175
+    assert await replica.refresh()
+    conn.close()
+
+    # A restarted process picks the copies and their positions up from replica/state.json
+    reloaded = Replica()
+    reloaded.configure(str(live), tmp_path / "replica")
+    assert reloaded.current == replica.current
+    async with reloaded.read_path() as path:
+        assert _count(path) == 175
+    await replica.close()
+
+
+@pytest.mark.asyncio
+async def test_stale_or_unconfigured_replica_reads_primary(db, tmp_path) -> None:
+    unconfigured = Replica()
+    assert not await unconfigured.refresh()
+    async with unconfigured.reading() as as_of:
+        assert as_of is None
+        assert await get_connection() is db
+
+    live = tmp_path / "casino.db"
+    _writer(live).close()
+    stale = Replica(max_lag=-1)
+    stale.configure(str(live), tmp_path / "replica")
+    assert await stale.refresh()
+    async with stale.reading() as as_of, stale.read_path() as path:
+        assert as_of is None and path is None
+        assert await get_connection() is db
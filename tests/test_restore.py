@@ -0,0 +1,105 @@
+"""Tests for the restore tool: page-level and legacy SQL backups, manifest verification, atomic swap."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import shutil
+import sqlite3
+
+import pytest
+
+from bot.utils import backup
+from bot.utils.restore import RestoreError, main, restore_backup
+
+
+def _fill(conn: sqlite3.Connection) -> None:
+    conn.execute("CREATE TABLE users (user_id INTEGER PRIMARY KEY, name TEXT)")
+    conn.execute("CREATE TABLE games (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, outcome TEXT)")
+    conn.execute("CREATE INDEX idx_games_user ON games(user_id)")
+    conn.executemany("INSERT INTO users VALUES (?, ?)", [(i, f"multi\nline;{i}") for i in range(5)])
+    conn.executemany("INSERT INTO games (user_id, outcome) VALUES (?, ?)", [(i % 5, "More") for i in range(3000)])
+
+
+@pytest.fixture
+def live_db(sqlite_file):
+    return sqlite_file(_fill)
+
+
+def _rows(path) -> tuple:
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM games").fetchone()[0], conn.execute("SELECT name FROM users WHERE user_id = 3").fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.mark.asyncio
+async def test_restore_page_backup_swaps_and_keeps_previous(live_db, tmp_path) -> None:
+    gz_path = await backup.create_backup(str(live_db), tmp_path / "backups", "casino_2026-03-01")
+    target = tmp_path / "data" / "casino.db"
+    target.parent.mkdir()
+    sqlite3.connect(target).close()
+
+    report = restore_backup(gz_path, target)
+    assert report.manifest_checked and report.tables == {"games": 3000, "users": 5}
+    assert _rows(target) == (3000, "multi\nline;3")
+    assert report.previous and (tmp_path / "data" / "casino.db.pre-restore").exists()
+    assert not (tmp_path / "data" / "casino.db.restoring").exists()
+
+
+@pytest.mark.asyncio
+async def test_restore_rejects_manifest_mismatch(live_db, tmp_path) -> None:
+    gz_path = await backup.create_backup(str(live_db), tmp_path / "backups", "casino_2026-03-01")
+    manifest = json.loads(backup.manifest_path(gz_path).read_text(encoding="utf-8"))
+    manifest["tables"]["games"] = 2999
+    backup.manifest_path(gz_path).write_text(json.dumps(manifest), encoding="utf-8")
+    target = tmp_path / "target.db"
+    with pytest.raises(RestoreError, match="games"):
+        restore_backup(gz_path, target)
+    assert not target.exists()
+    assert main([str(gz_path), "--target", str(target), "--check"]) == 1
+
+
+def test_restore_legacy_sql_dump(live_db, tmp_path) -> None:
+    dump = tmp_path / "casino_2026-02-01.gz"
+    conn = sqlite3.connect(live_db)
+    with gzip.open(dump, "wt", encoding="utf-8") as f:
+        for line in conn.iterdump():
+            f.write(line + "\n")
+    conn.close()
+    target = tmp_path / "restored.db"
+    report = restore_backup(dump, target)
+    assert not report.manifest_checked and report.tables["games"] == 3000
+    assert _rows(target) == (3000, "multi\nline;3")
+    conn = sqlite3.connect(target)
+    assert conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name = 'idx_games_user'").fetchone()
+    conn.close()
+
+
+@pytest.mark.asyncio
+async def test_restore_keeps_wal_of_previous_db(live_db, tmp_path) -> None:
+    gz_path = await backup.create_backup(str(live_db), tmp_path / "backups", "casino_2026-03-01")
+    crashed = tmp_path / "crashed.db"
+    writer = sqlite3.connect(crashed)
+    writer.execute("PRAGMA journal_mode = WAL")
+    writer.execute("PRAGMA wal_autocheckpoint = 0")
+    writer.execute("CREATE TABLE games (id INTEGER PRIMARY KEY, user_id INTEGER, outcome TEXT)")
+    writer.executemany("INSERT INTO games (user_id, outcome) VALUES (?, ?)", [(1, "Less") for _ in range(42)])
+    writer.commit()
+    # Files as an unclean stop leaves them: the commits are only in the WAL
+    target = tmp_path / "data" / "casino.db"
+    target.parent.mkdir()
+    shutil.copy(crashed, target)
+    shutil.copy(f"{crashed}-wal", f"{target}-wal")
+    writer.close()
+    assert (tmp_path / "data" / "casino.db-wal").stat().st_size > 0
+
+    restore_backup(gz_path, target)
+
+    assert not (tmp_path / "data" / "casino.db-wal").exists()
+    assert (tmp_path / "data" / "casino.db.pre-restore-wal").exists()
+    conn = sqlite3.connect(tmp_path / "data" / "casino.db.pre-restore")
+    assert conn.execute("SELECT COUNT(*) FROM games").fetchone()[0] == 42
+    conn.close()
+    assert _rows(target) == (3000, "multi\nline;3")
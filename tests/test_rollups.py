@@ -0,0 +1,41 @@
+"""Tests for game rollups: maintained on settle, unique players, independent of the games purge."""
+
+from __future__ import annotations
+
+import pytest
+
+from bot.database.queries import games as games_queries
+from bot.database.queries import rollups as rollups_queries
+
+
+@pytest.mark.asyncio
+async def test_save_game_updates_rollups(db, test_user: int) -> None:
+    """Single rounds land in hourly and daily buckets; the same player is counted once per bucket."""
+    await games_queries.save_game(test_user, "dice", 2, 100, "More", True, 180, False, "2026-03-01T10:05:00Z")
+    await games_queries.save_game(test_user, "dice", 2, 200, "Less", False, 0, False, "2026-03-01T11:15:00Z")
+    await games_queries.save_game(test_user, "dice", 2, 100, "Less", False, 0, True, "2026-03-01T11:20:00Z")
+
+    assert await rollups_queries.get_rollup_totals("games_rollup_daily", "2026-03-01", is_demo=0) == (2, 1, 300, 180)
+    assert await rollups_queries.get_rollup_totals("games_rollup_hourly", "2026-03-01T11", is_demo=0) == (1, 0, 200, 0)
+    cursor = await db.execute("SELECT players FROM games_rollup_daily WHERE bucket = '2026-03-01' AND is_demo = 0")
+    assert (await cursor.fetchone())[0] == 1
+    cursor = await db.execute("SELECT best_multiplier FROM games_rollup_players WHERE day = '2026-03-01' AND is_demo = 0")
+    assert (await cursor.fetchone())[0] == pytest.approx(1.8)
+    assert await rollups_queries.get_unique_players("2026-03-01") == 1
+
+
+@pytest.mark.asyncio
+async def test_series_and_purge(db, test_user_and_referrer) -> None:
+    """A batched series counts every round and two players; rollups stay after the games rows are deleted."""
+    user_id, other_id = test_user_and_referrer
+    at = "2026-03-02T09:00:00Z"
+    rows = [(user_id, "dice", 2, 100, "More", i % 2 == 0, 180 if i % 2 == 0 else 0, False, at) for i in range(10)]
+    await games_queries.save_games(rows)
+    await games_queries.save_game(other_id, "dice", 2, 50, "More", False, 0, False, at)
+
+    await db.execute("DELETE FROM games")
+    await db.commit()
+    assert await games_queries.get_games_count() == 0
+    assert await rollups_queries.get_total_rounds() == 11
+    cursor = await db.execute("SELECT rounds, wins, turnover, payouts, players FROM games_rollup_hourly WHERE bucket = '2026-03-02T09'")
+    assert tuple(await cursor.fetchone()) == (11, 5, 1050, 900, 2)
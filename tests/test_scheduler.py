@@ -0,0 +1,101 @@
+"""Tests for cron specs and the persisted maintenance scheduler (catch-up after restart, single runner, bookkeeping)."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from bot.database.queries import scheduler as scheduler_queries
+from bot.services.scheduler import Job, Scheduler
+from bot.utils.cron import CronSpec
+
+
+def _utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_cron_next_after() -> None:
+    monthly = CronSpec("0 3 1 * *")
+    assert monthly.next_after(_utc(2026, 2, 28, 23, 0)) == _utc(2026, 3, 1, 3, 0)
+    assert monthly.next_after(_utc(2026, 3, 1, 3, 0, 20)) == _utc(2026, 4, 1, 3, 0)
+    assert CronSpec("*/15 * * * *").next_after(_utc(2026, 3, 1, 3, 7)) == _utc(2026, 3, 1, 3, 15)
+    # 2026-03-02 is a Monday; 0 = Sunday
+    assert CronSpec("0 4 * * 0").next_after(_utc(2026, 3, 2)) == _utc(2026, 3, 8, 4, 0)
+    assert CronSpec("0 9 1-5 * 1-5").matches(_utc(2026, 3, 20, 9, 0))
+    with pytest.raises(ValueError):
+        CronSpec("61 * * * *")
+
+
+@pytest.mark.asyncio
+async def test_missed_slot_runs_after_restart_once_across_workers(db) -> None:
+    runs = []
+
+    async def job_run() -> None:
+        runs.append(1)
+
+    def make(owner: str) -> Scheduler:
+        return Scheduler([Job("backup", CronSpec("0 3 1 * *"), job_run, jitter=0)], owner=owner)
+
+    first, second = make("a:1"), make("b:2")
+    # First sighting only registers the job
+    assert await first.tick(_utc(2026, 2, 27, 12, 0)) == []
+    assert await first.tick(_utc(2026, 2, 28, 12, 0)) == []
+    # Both workers restart at noon on the 1st: the 03:00 slot was missed, exactly one of them runs it now
+    now = _utc(2026, 3, 1, 12, 0)
+    assert await first.tick(now) == ["backup"]
+    assert await second.tick(now) == []
+    await asyncio.gather(*first._tasks.values())
+    assert runs == [1]
+    # A worker that read the record before the run finished cannot repeat it
+    assert await second.tick(now) == []
+    record = (await scheduler_queries.get_jobs())["backup"]
+    assert record["last_run_at"] == "2026-03-01T12:00:00Z" and record["last_status"] == "ok" and record["lease_owner"] is None
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_recorded_and_retried_with_backoff(db, monkeypatch) -> None:
+    from bot.services import scheduler as scheduler_module
+
+    alerts = []
+
+    async def fake_notify(bot, key, **kwargs):
+        alerts.append((key, kwargs["name"], kwargs["retry_at"]))
+
+    monkeypatch.setattr(scheduler_module, "notify_admins_text", fake_notify)
+    failures = ["disk full", "disk full"]
+
+    async def flaky() -> None:
+        if failures:
+            raise RuntimeError(failures.pop())
+
+    scheduler = Scheduler([Job("cleanup", CronSpec("30 3 * * *"), flaky, jitter=0)], owner="a:1", bot=object())
+
+    async def run(now: datetime) -> list:
+        started = await scheduler.tick(now)
+        await asyncio.gather(*scheduler._tasks.values())
+        return started
+
+    await scheduler.tick(_utc(2026, 3, 1, 0, 0))
+    assert await run(_utc(2026, 3, 1, 3, 30)) == ["cleanup"]
+    record = (await scheduler_queries.get_jobs())["cleanup"]
+    # A failure is not a run: the slot stays due, the retry waits JOB_RETRY_BASE_SECONDS
+    assert record["last_status"] == "error" and record["last_error"] == "disk full"
+    assert record["last_run_at"] == "2026-03-01T00:00:00Z" and record["failures"] == 1 and record["retry_at"] == "2026-03-01T03:31:00Z"
+    assert await run(_utc(2026, 3, 1, 3, 30, 30)) == []
+    assert await run(_utc(2026, 3, 1, 3, 31)) == ["cleanup"]
+    record = (await scheduler_queries.get_jobs())["cleanup"]
+    assert record["failures"] == 2 and record["retry_at"] == "2026-03-01T03:33:00Z"
+    assert await run(_utc(2026, 3, 1, 3, 33)) == ["cleanup"]
+    record = (await scheduler_queries.get_jobs())["cleanup"]
+    assert record["last_status"] == "ok" and record["last_run_at"] == "2026-03-01T03:33:00Z" and record["failures"] == 0 and record["retry_at"] is None
+    # One alert per failure streak
+    assert alerts == [("admin_job_failed_alert", "cleanup", "2026-03-01T03:31:00Z")]
+
+
+def test_retry_never_waits_past_the_next_slot() -> None:
+    job = Job("wal_archive", CronSpec("*/5 * * * *"), None, jitter=0)
+    scheduler = Scheduler([job])
+    assert scheduler.retry_at(job, _utc(2026, 3, 1, 3, 0), 1) == _utc(2026, 3, 1, 3, 1)
+    assert scheduler.retry_at(job, _utc(2026, 3, 1, 3, 0), 4) == _utc(2026, 3, 1, 3, 5)
@@ -0,0 +1,53 @@
+"""Tests for incremental user_stats counters (total_bet, biggest win, streaks, splits) and their chunked backfill."""
+
+from __future__ import annotations
+
+import pytest
+
+from bot.database.queries import games as games_queries
+from bot.database.queries import user_stats as stats_queries
+
+
+def _row(user_id: int, is_win: bool, bet: int = 100, is_demo: bool = False, game_id: int = 2, at: str = "2026-03-01T10:00:00Z") -> tuple:
+    return (user_id, "dice", game_id, bet, "More", is_win, bet * 2 if is_win else 0, is_demo, at)
+
+
+@pytest.mark.asyncio
+async def test_counters_single_rounds_and_series(db, test_user: int) -> None:
+    """Streaks continue across single rounds and a batched series; splits and per-game rows add up."""
+    for is_win in (True, True, False):
+        await games_queries.save_game(*_row(test_user, is_win))
+    # Series: L L L W W W W L  -> losing run continues the stored -1 streak, best win run is 4 inside the series
+    series = [_row(test_user, w, is_demo=True, game_id=3) for w in (False, False, False, True, True, True, True, False)]
+    await games_queries.save_games(series)
+
+    stats = await stats_queries.get_user_stats(test_user)
+    assert stats is not None
+    assert stats.total_bet == 1100
+    assert stats.biggest_win == 200
+    assert stats.current_streak == -1
+    assert stats.longest_win_streak == 4
+    assert stats.longest_loss_streak == 4
+    assert (stats.real_games, stats.real_bet, stats.real_won) == (3, 300, 400)
+    assert (stats.demo_games, stats.demo_bet, stats.demo_won) == (8, 800, 800)
+    per_game = {(g.game_id, g.is_demo): (g.games, g.wins) for g in await stats_queries.get_user_game_stats(test_user)}
+    assert per_game == {(2, False): (3, 2), (3, True): (8, 4)}
+
+
+@pytest.mark.asyncio
+async def test_backfill_in_chunks_matches_incremental(db, test_user_and_referrer) -> None:
+    """Backfill rebuilds the counters from games chunk by chunk and removes its cursor row when done."""
+    user_id, other_id = test_user_and_referrer
+    await games_queries.save_games([_row(user_id, w, at=f"2026-03-01T10:00:0{i}Z") for i, w in enumerate((True, False, False, True, True))])
+    await games_queries.save_game(*_row(other_id, True, bet=500))
+    expected = {uid: await stats_queries.get_user_stats(uid) for uid in (user_id, other_id)}
+
+    await db.execute("UPDATE user_stats SET total_bet = 0, biggest_win = 0, current_streak = 0, longest_win_streak = 0, real_games = 0")
+    await db.execute("DELETE FROM user_game_stats")
+    await db.commit()
+
+    assert await stats_queries.backfill_user_counters(chunk_users=1) == 2
+    for uid, before in expected.items():
+        assert await stats_queries.get_user_stats(uid) == before
+    assert len(await stats_queries.get_user_game_stats(user_id)) == 1
+    assert await stats_queries.backfill_user_counters() == 0
@@ -0,0 +1,167 @@
+"""Tests for continuous WAL archiving: segment copy across WAL restarts, base backups, point-in-time replay."""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from bot.utils import wal_archive
+from bot.utils.restore import RestoreError, main, restore_point_in_time
+
+T0 = datetime(2026, 3, 20, 14, 0, tzinfo=timezone.utc)
+
+
+def _writer(path) -> sqlite3.Connection:
+    # Same setup as the bot connection: WAL, no automatic checkpoints
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA wal_autocheckpoint = 0")
+    conn.execute("CREATE TABLE IF NOT EXISTS games (id INTEGER PRIMARY KEY, user_id INTEGER, payload TEXT)")
+    conn.commit()
+    return conn
+
+
+def _insert(conn: sqlite3.Connection, rows: int, user_id: int = 1) -> None:
+    conn.executemany("INSERT INTO games (user_id, payload) VALUES (?, ?)", [(user_id, "x" * 300) for _ in range(rows)])
+    conn.commit()
+
+
+def _state(path) -> tuple:
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*), COALESCE(SUM(user_id), 0) FROM games").fetchone()
+    finally:
+        conn.close()
+
+
+@pytest.mark.asyncio
+async def test_replay_reaches_each_archived_minute(tmp_path) -> None:
+    live = tmp_path / "casino.db"
+    archive_dir = wal_archive.wal_archive_dir_for(str(live))
+    conn = _writer(live)
+    _insert(conn, 100)
+    first = wal_archive.archive_wal(str(live), archive_dir, now=T0)
+    assert first.segment is not None and first.frames > 0
+    await wal_archive.take_base_backup(str(live), archive_dir, now=T0 + timedelta(seconds=30))
+
+    # The archiver's checkpoint was complete, so this write restarts the WAL (new salt, frames from the start)
+    _insert(conn, 200, user_id=2)
+    wal_archive.archive_wal(str(live), archive_dir, now=T0 + timedelta(minutes=1))
+    conn.execute("DELETE FROM games WHERE id <= 50")
+    conn.execute("UPDATE games SET user_id = 3 WHERE user_id = 2")
+    conn.commit()
+    wal_archive.archive_wal(str(live), archive_dir, now=T0 + timedelta(minutes=2))
+    expected_latest = _state(live)
+    assert wal_archive.archive_wal(str(live), archive_dir, now=T0 + timedelta(minutes=3)).segment is None
+    _insert(conn, 10, user_id=9)  # never archived
+
+    assert [p.name.split("_")[1] for p in wal_archive.list_segments(archive_dir)] == ["0000000001", "0000000002", "0000000003"]
+    restored = tmp_path / "restored" / "casino.db"
+    report = restore_point_in_time(archive_dir, restored, until=T0 + timedelta(minutes=1, seconds=30))
+    assert report.segments == 1
+    assert _state(restored) == (300, 100 + 400)
+    report = restore_point_in_time(archive_dir, restored)
+    assert report.segments == 2
+    assert _state(restored) == expected_latest
+    conn.close()
+
+    assert main(["--pitr", "--target", str(live)]) == 0
+    assert _state(live) == expected_latest
+    assert (tmp_path / "casino.db.pre-restore").exists()
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_outside_archiver_breaks_chain(tmp_path) -> None:
+    live = tmp_path / "casino.db"
+    archive_dir = wal_archive.wal_archive_dir_for(str(live))
+    conn = _writer(live)
+    _insert(conn, 50)
+    reader = sqlite3.connect(live)
+    reader.execute("BEGIN")
+    reader.execute("SELECT COUNT(*) FROM games").fetchone()
+    _insert(conn, 50)
+    # An open reader keeps the archiver's checkpoint incomplete ...
+    assert wal_archive.archive_wal(str(live), archive_dir, now=T0).segment is not None
+    await wal_archive.take_base_backup(str(live), archive_dir, now=T0 + timedelta(seconds=10))
+    reader.rollback()
+    reader.close()
+    _insert(conn, 50)
+    # ... so a foreign checkpoint that restarts the WAL drops frames the archive never saw
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    _insert(conn, 5)
+    step = wal_archive.archive_wal(str(live), archive_dir, now=T0 + timedelta(minutes=1))
+    assert step.gap
+    conn.close()
+
+    with pytest.raises(RestoreError, match="broken before segment 2"):
+        restore_point_in_time(archive_dir, tmp_path / "restored.db")
+    # A base taken after the gap restores again
+    await wal_archive.take_base_backup(str(live), archive_dir, now=T0 + timedelta(minutes=2))
+    restore_point_in_time(archive_dir, tmp_path / "restored.db")
+    assert _state(tmp_path / "restored.db") == (155, 155)
+
+
+def test_prune_keeps_segments_needed_by_kept_bases(tmp_path) -> None:
+    for name in ("base_0000000000_20260318T022000Z", "base_0000000004_20260319T022000Z", "base_0000000009_20260320T022000Z"):
+        (tmp_path / f"{name}.db.gz").write_bytes(b"")
+        (tmp_path / f"{name}.manifest.json").write_text("{}")
+    for seq in range(1, 12):
+        (tmp_path / f"seg_{seq:010d}_20260319T{seq:02d}0000Z.wal.gz").write_bytes(b"")
+
+    assert wal_archive.prune_archive(tmp_path, keep_bases=2) == 1 + 4
+    assert [p.name[:15] for p in wal_archive.list_bases(tmp_path)] == ["base_0000000004", "base_0000000009"]
+    assert [int(p.name.split("_")[1]) for p in wal_archive.list_segments(tmp_path)] == list(range(5, 12))
+
+
+def test_unlocked_passes_and_concurrent_writes(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(wal_archive, "WAL_ARCHIVE_LOCKED_FRAMES", 1)
+    live = tmp_path / "casino.db"
+    archive_dir = wal_archive.wal_archive_dir_for(str(live))
+    conn = _writer(live)
+    _insert(conn, 500)
+    copy = wal_archive._copy_committed_frames
+
+    def copy_then_write(*args):
+        # A commit lands between the unlocked passes and the locked one
+        result = copy(*args)
+        if not hasattr(copy_then_write, "done"):
+            copy_then_write.done = True
+            _insert(conn, 7, user_id=5)
+        return result
+
+    monkeypatch.setattr(wal_archive, "_copy_committed_frames", copy_then_write)
+    step = wal_archive.archive_wal(str(live), archive_dir, now=T0)
+    assert step.segment is not None
+    conn.close()
+    # The table was created in WAL mode, so the segment holds every page: replay it into an empty file
+    restored = tmp_path / "restored.db"
+    restored.touch()
+    wal_archive.replay_segments(restored, [step.segment], 4096)
+    assert _state(restored) == (507, 500 + 35)
+
+
+@pytest.mark.asyncio
+async def test_wal_guard_forces_archive_and_alerts_once(tmp_path, monkeypatch) -> None:
+    from bot.services import wal_guard
+
+    sent = []
+
+    async def fake_notify(bot, key, **kwargs):
+        sent.append((key, kwargs))
+
+    monkeypatch.setattr(wal_guard, "notify_admins_text", fake_notify)
+    monkeypatch.setattr(wal_guard, "_alerted", False)
+    live = tmp_path / "casino.db"
+    conn = _writer(live)
+    _insert(conn, 100)
+    assert not await wal_guard.check_wal_size(str(live), bot=object())
+    monkeypatch.setattr(wal_guard, "WAL_GUARD_BYTES", 1)
+    assert await wal_guard.check_wal_size(str(live), bot=object())
+    assert wal_archive.list_segments(wal_archive.wal_archive_dir_for(str(live)))
+    _insert(conn, 10)
+    assert await wal_guard.check_wal_size(str(live), bot=object())
+    conn.close()
+    # The archiver never ran before the first round: one alert for the episode
+    assert [key for key, _ in sent] == ["admin_wal_guard_alert"]
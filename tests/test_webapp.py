@@ -0,0 +1,81 @@
+"""Tests for the embedded WebApp API: initData auth, stats payload, ETag revalidation."""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import time
+from urllib.parse import urlencode
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from bot.webapp import create_app
+from bot.webapp.app import INIT_DATA_MAX_AGE_SECONDS
+
+TOKEN = "123456:TEST-TOKEN"
+
+
+def _init_data(user_id: int, token: str = TOKEN, age: int = 60) -> str:
+    """Sign initData the way Telegram does (HMAC-SHA256 with the 'WebAppData' derived key), issued age seconds ago."""
+    fields = {"auth_date": str(int(time.time()) - age), "query_id": "q", "user": json.dumps({"id": user_id, "first_name": "T"})}
+    check = "\n".join(f"{k}={v}" for k, v in sorted(fields.items()))
+    secret = hmac.new(b"WebAppData", token.encode(), hashlib.sha256).digest()
+    fields["hash"] = hmac.new(secret, check.encode(), hashlib.sha256).hexdigest()
+    return urlencode(fields)
+
+
+@pytest.mark.asyncio
+async def test_stats_requires_valid_init_data(db) -> None:
+    """No initData or a signature from another bot token is rejected."""
+    async with TestClient(TestServer(create_app(TOKEN))) as client:
+        assert (await client.get("/api/stats")).status == 401
+        resp = await client.get("/api/stats", headers={"Authorization": "tma " + _init_data(1000, token="999:OTHER")})
+        assert resp.status == 401
+
+
+@pytest.mark.asyncio
+async def test_stats_rejects_expired_or_query_string_init_data(db, test_user: int) -> None:
+    """initData older than INIT_DATA_MAX_AGE_SECONDS, or sent in the query string instead of the header, is rejected."""
+    async with TestClient(TestServer(create_app(TOKEN))) as client:
+        expired = _init_data(test_user, age=INIT_DATA_MAX_AGE_SECONDS + 60)
+        resp = await client.get("/api/stats", headers={"Authorization": "tma " + expired})
+        assert resp.status == 401 and await resp.text() == "initData expired"
+        assert (await client.get("/api/stats", params={"initData": _init_data(test_user)})).status == 401
+        assert (await client.get("/api/stats", headers={"Authorization": "tma " + _init_data(test_user)})).status == 200
+
+
+@pytest.mark.asyncio
+async def test_stats_payload_and_etag(db, test_user: int) -> None:
+    """Signed request gets the caller's counters; the same ETag revalidates to 304 until stats change."""
+    from bot.database.queries import games as games_queries
+
+    await games_queries.save_game(test_user, "dice", 2, 100, "More", True, 180, False, "2026-03-01T10:00:00Z")
+    headers = {"Authorization": "tma " + _init_data(test_user)}
+    async with TestClient(TestServer(create_app(TOKEN, "https://example.com"))) as client:
+        resp = await client.get("/api/stats", headers=headers)
+        assert resp.status == 200
+        body = await resp.json()
+        assert body["user_id"] == test_user and body["total_bet"] == 100
+        assert body["per_game"] == [{"game_id": 2, "is_demo": False, "games": 1, "wins": 1, "bet": 100, "won": 180}]
+        assert resp.headers["Cache-Control"].startswith("private")
+        assert resp.headers["Access-Control-Allow-Origin"] == "https://example.com"
+        etag = resp.headers["ETag"]
+
+        assert (await client.get("/api/stats", headers={**headers, "If-None-Match": etag})).status == 304
+        await games_queries.save_game(test_user, "dice", 2, 100, "Less", False, 0, False, "2026-03-01T10:01:00Z")
+        assert (await client.get("/api/stats", headers={**headers, "If-None-Match": etag})).status == 200
+        assert (await client.options("/api/stats")).status == 204
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_requires_bearer_token() -> None:
+    """/api/metrics is off without METRICS_TOKEN and only answers the right bearer token."""
+    async with TestClient(TestServer(create_app(TOKEN))) as client:
+        assert (await client.get("/api/metrics")).status == 404
+    async with TestClient(TestServer(create_app(TOKEN, metrics_token="s3cret"))) as client:
+        assert (await client.get("/api/metrics", headers={"Authorization": "Bearer nope"})).status == 401
+        resp = await client.get("/api/metrics", headers={"Authorization": "Bearer s3cret"})
+        assert resp.status == 200
+        assert set(await resp.json()) == {"1m", "5m", "1h"}